@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+"""
+Headless benchmark of the system information providers, checks and content
+loading against a synthetic machine. Needs no display.
+
+Usage: bench_providers.py [--root DIR] [--iterations N] [--json FILE]
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCHMARK_DIR.parent))
+sys.path.insert(0, str(BENCHMARK_DIR))
+
+import fixtures  # noqa: E402
+from infocenter import content, cpuinfo, edid, keyvalue, markup, pci  # noqa: E402
+from infocenter import sysroot  # noqa: E402
+from infocenter import system_information_provider as provider  # noqa: E402
+
+THRESHOLDS_FILE = BENCHMARK_DIR / "thresholds.json"
+
+
+def get_benchmarks() -> dict:
+    benchmarks = {
+        "os": provider.get_os,
+        "hardware_model": provider.get_hardware_model,
+        "chassis_asset": provider.get_chassis_asset,
+        "bios_version": provider.get_bios_version,
+        "cpu_model": provider.get_cpu_model,
+        "cpu_topology": provider.get_cpu_topology,
+        "kernel_version": provider.get_kernel_version,
+        "monitors": provider.get_monitor_list,
+        # Includes building the pci.ids index
+        "graphic_cards": provider.get_graphic_card_list,
+        # Re-read of a single connector after a hotplug event
+        "monitor_hotplug": lambda: provider.read_monitors({"card0-DP-1"}),
+        "content_yaml": lambda: content.load_yaml_dir(["en"]),
+    }
+
+    legal_text = fixtures.make_legal_text()
+    benchmarks["disclaimer_markup"] = lambda: markup.render(legal_text)
+
+    bundle = content.compile_bundle(sorted((content.YAML_DIR / "en").glob("*.yaml")))
+    benchmarks["content_bundle"] = lambda: content.load_bundle(bundle)
+
+    try:
+        from infocenter import system_check
+    except ImportError:
+        print("gi not available, skipping system checks", file=sys.stderr)
+    else:
+        benchmarks["vpn"] = system_check.check_vpn
+        # Nothing listens on port 1, this measures the refused connect path
+        benchmarks["proxy_port"] = lambda: system_check.check_local_proxy_port(
+            1, timeout=1
+        )
+
+    return benchmarks
+
+
+def clear_caches():
+    for module in (provider, cpuinfo, edid, content, keyvalue, markup, pci):
+        if hasattr(module, "clear_caches"):
+            module.clear_caches()
+
+
+def measure(func, iterations: int) -> dict:
+    samples = []
+    errors = []
+    for _ in range(iterations):
+        clear_caches()
+        start = time.perf_counter()
+        try:
+            func()
+        except Exception as error:
+            errors.append(type(error).__name__)
+        samples.append((time.perf_counter() - start) * 1000)
+
+    return {
+        "min_ms": min(samples),
+        "median_ms": statistics.median(samples),
+        "errors": sorted(set(errors)),
+    }
+
+
+def measure_total(benchmarks: dict, parallel: bool) -> float:
+    clear_caches()
+    start = time.perf_counter()
+
+    def call(func):
+        try:
+            func()
+        except Exception:
+            pass
+
+    if parallel:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(call, benchmarks.values()))
+    else:
+        for func in benchmarks.values():
+            call(func)
+
+    return (time.perf_counter() - start) * 1000
+
+
+def run(root: str, iterations: int) -> dict:
+    sysroot.set_root(root)
+    benchmarks = get_benchmarks()
+
+    results = {name: measure(func, iterations) for name, func in benchmarks.items()}
+    results["total_sequential"] = {"median_ms": measure_total(benchmarks, False)}
+    results["total_parallel"] = {"median_ms": measure_total(benchmarks, True)}
+    return results
+
+
+def check_thresholds(results: dict, thresholds: dict) -> list:
+    regressions = []
+    for name, limit in thresholds.items():
+        if name in results and results[name]["median_ms"] > limit:
+            regressions.append(
+                "{0}: {1:.2f} ms > {2:.2f} ms".format(
+                    name, results[name]["median_ms"], limit
+                )
+            )
+    return regressions
+
+
+def print_table(results: dict, thresholds: dict):
+    print(
+        "{0:<20} {1:>10} {2:>10} {3:>10}  {4}".format(
+            "benchmark", "min ms", "median ms", "limit ms", "errors"
+        )
+    )
+    for name, result in results.items():
+        print(
+            "{0:<20} {1:>10} {2:>10.2f} {3:>10}  {4}".format(
+                name,
+                "{0:.2f}".format(result["min_ms"]) if "min_ms" in result else "",
+                result["median_ms"],
+                "{0:.1f}".format(thresholds[name]) if name in thresholds else "",
+                ", ".join(result.get("errors", [])),
+            )
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--root", help="existing fixture tree, generated if unset")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--cpus", type=int, default=512)
+    parser.add_argument("--connectors", type=int, default=48)
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--thresholds", default=str(THRESHOLDS_FILE))
+    args = parser.parse_args()
+
+    thresholds = json.loads(Path(args.thresholds).read_text())
+
+    with tempfile.TemporaryDirectory(prefix="infocenter-bench-") as tmp:
+        root = args.root or fixtures.generate(
+            tmp, cpus=args.cpus, connectors=args.connectors
+        )
+        results = run(str(root), args.iterations)
+
+    print_table(results, thresholds)
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+
+    regressions = check_thresholds(results, thresholds)
+    for regression in regressions:
+        print("REGRESSION " + regression, file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+"""
+Generates synthetic machines as fixture trees for INFOCENTER_SYSROOT.
+
+Usage: fixtures.py ROOT [--cpus N] [--sockets N] [--connectors N] [--hybrid]
+"""
+
+import argparse
+import os
+import random
+import struct
+from pathlib import Path
+
+_EDID_HEADER = b"\x00\xff\xff\xff\xff\xff\xff\x00"
+
+_FLAGS = (
+    "fpu vme de pse tsc msr pae mce cx8 apic sep mtrr pge mca cmov pat pse36 "
+    "clflush mmx fxsr sse sse2 ss ht syscall nx pdpe1gb rdtscp lm constant_tsc "
+    "rep_good nopl xtopology nonstop_tsc cpuid aperfmperf pni pclmulqdq ssse3 fma "
+    "cx16 pcid sse4_1 sse4_2 x2apic movbe popcnt aes xsave avx f16c rdrand "
+    "lahf_lm abm 3dnowprefetch fsgsbase bmi1 avx2 smep bmi2 erms invpcid "
+    "avx512f avx512dq rdseed adx smap clflushopt clwb avx512cd sha_ni avx512bw "
+    "avx512vl xsaveopt xsavec xgetbv1 xsaves arat umip pku ospke gfni vaes"
+)
+
+_MODELS = (
+    "Intel(R) Xeon(R) Platinum 8480+",
+    "AMD EPYC 9654 96-Core Processor",
+)
+_HYBRID_MODELS = (
+    "13th Gen Intel(R) Core(TM) i7-1365U (P-core)",
+    "13th Gen Intel(R) Core(TM) i7-1365U (E-core)",
+)
+
+# (slot, class, vendor, device, driver, vram or None, prefetchable BAR size)
+_PCI_DEVICES = (
+    ("0000:00:00.0", 0x060000, 0x8086, 0xA700, None, None, 0),
+    ("0000:00:02.0", 0x030000, 0x8086, 0xA7A0, "i915", None, 256 << 20),
+    ("0000:00:14.0", 0x0C0330, 0x8086, 0x7A60, "xhci_hcd", None, 0),
+    ("0000:01:00.0", 0x030200, 0x10DE, 0x2684, "nvidia", None, 32 << 30),
+    ("0000:03:00.0", 0x030000, 0x1002, 0x73FF, "amdgpu", 8 << 30, 256 << 20),
+    ("0000:04:00.0", 0x038000, 0x1234, 0x1111, None, None, 0),
+)
+
+_PCI_NAMES = {
+    0x8086: ("Intel Corporation", {0xA7A0: "Raptor Lake-P [Iris Xe Graphics]"}),
+    0x10DE: ("NVIDIA Corporation", {0x2684: "AD102 [GeForce RTX 4090]"}),
+    0x1002: (
+        "Advanced Micro Devices, Inc. [AMD/ATI]",
+        {0x73FF: "Navi 23 [Radeon RX 6600/6600 XT/6600M]"},
+    ),
+}
+
+_DMI = {
+    "product_name": "Synthetic Workstation 9000",
+    "chassis_asset_tag": "ASSET-0000001",
+    "bios_version": "1.23.4",
+    "sys_vendor": "Synthetic Inc.",
+    "board_name": "SYN-BOARD",
+}
+
+
+def _pnp_id(vendor: str) -> bytes:
+    value = 0
+    for char in vendor:
+        value = (value << 5) | (ord(char) - 64)
+    return struct.pack(">H", value)
+
+
+def _descriptor(tag: int, text: str) -> bytes:
+    data = text.encode("ascii")[:13]
+    if len(data) < 13:
+        data += b"\n" + b" " * (12 - len(data))
+    return bytes((0, 0, 0, tag, 0)) + data
+
+
+def _detailed_timing(width: int, height: int, pixel_clock_khz: int) -> bytes:
+    hblank, vblank = 160, 45
+    return (
+        struct.pack(
+            "<HBBBBBBBBBBBBBBB",
+            pixel_clock_khz // 10,
+            width & 0xFF,
+            hblank & 0xFF,
+            ((width >> 8) << 4) | (hblank >> 8),
+            height & 0xFF,
+            vblank & 0xFF,
+            ((height >> 8) << 4) | (vblank >> 8),
+            48,
+            32,
+            (3 << 4) | 5,
+            0,
+            597 & 0xFF,  # width in mm
+            336 & 0xFF,  # height in mm
+            ((597 >> 8) << 4) | (336 >> 8),
+            0,
+            0x1E,
+        )
+        + b"\x00"
+    )
+
+
+def make_edid(model: str, serial: str, vendor: str = "DEL", extensions=0) -> bytes:
+    """
+    Returns a valid EDID 1.4 base block, followed by empty CEA-861 extension
+    blocks if requested.
+    """
+    block = bytearray(
+        _EDID_HEADER
+        + _pnp_id(vendor)
+        + struct.pack("<HIBB", 0xA0B1, 12345678, 12, 33)
+        + bytes((1, 4, 0xA5, 60, 34, 0x78, 0x3A))
+        + bytes(10)
+        + bytes((0x21, 0x08, 0x00))
+        + bytes(16)
+        + _detailed_timing(2560, 1440, 241500)
+        + _descriptor(0xFC, model)
+        + _descriptor(0xFF, serial)
+        + bytes((0, 0, 0, 0xFD, 0, 48, 75, 30, 160, 60, 0, 0x0A))
+        + b" " * 6
+        + bytes((extensions, 0))
+    )
+    block[127] = (256 - sum(block) % 256) % 256
+
+    data = bytes(block)
+    for _ in range(extensions):
+        extension = bytearray(128)
+        extension[0:4] = bytes((0x02, 0x03, 4, 0))
+        extension[127] = (256 - sum(extension) % 256) % 256
+        data += bytes(extension)
+    return data
+
+
+def make_legal_text(pages: int = 20) -> str:
+    """
+    Returns a long disclaimer with paragraphs, lists, bold text and URLs,
+    about 3 KB per page.
+    """
+    page = (
+        "**Section {0}.** Data entered at the command line is logged locally "
+        "& kept for 30 days, see {1}. "
+        "Please refrain from entering <personal> data unless necessary.\n"
+        "The logged data is overwritten regularly (details at "
+        "https://en.example.com/wiki/Logging_(policy)) and can be deleted.\n\n"
+        "- do not enter passwords on the command line\n"
+        "- report incidents to www.example.com/security\n"
+        "1. open a ticket\n"
+        "2. attach the trace from {1}\n\n"
+    )
+    url = "https://intranet.example.com/privacy?lang=en&page={0}"
+    return "".join(
+        page.format(number, url.format(number)) * 5 for number in range(pages)
+    )
+
+
+def write_cpuinfo(root: Path, cpus: int, sockets: int = 2, hybrid: bool = False):
+    models = _HYBRID_MODELS if hybrid else (_MODELS[0],)
+    cores_per_socket = max(1, cpus // sockets // 2)
+    blocks = []
+    for cpu in range(cpus):
+        socket = cpu * sockets // cpus
+        core = (cpu // 2) % cores_per_socket
+        model = models[0] if not hybrid or cpu < cpus // 2 else models[1]
+        blocks.append(
+            "processor\t: {cpu}\n"
+            "vendor_id\t: GenuineIntel\n"
+            "cpu family\t: 6\n"
+            "model\t\t: 143\n"
+            "model name\t: {model}\n"
+            "stepping\t: 8\n"
+            "cpu MHz\t\t: 2000.000\n"
+            "cache size\t: 107520 KB\n"
+            "physical id\t: {socket}\n"
+            "siblings\t: {siblings}\n"
+            "core id\t\t: {core}\n"
+            "cpu cores\t: {cores}\n"
+            "apicid\t\t: {cpu}\n"
+            "flags\t\t: {flags}\n"
+            "bogomips\t: 4000.00\n"
+            "address sizes\t: 46 bits physical, 57 bits virtual\n"
+            "power management:\n".format(
+                cpu=cpu,
+                model=model,
+                socket=socket,
+                siblings=cpus // sockets,
+                core=core,
+                cores=cores_per_socket,
+                flags=_FLAGS,
+            )
+        )
+    (root / "proc/cpuinfo").write_text("\n".join(blocks) + "\n")
+
+
+def write_drm(root: Path, connectors: int, rng: random.Random):
+    drm = root / "sys/class/drm"
+    for index in range(connectors):
+        connector = drm / "card{0}-DP-{1}".format(index // 8, index % 8 + 1)
+        connector.mkdir(parents=True, exist_ok=True)
+
+        kind = rng.random()
+        if kind < 0.4:
+            status, data = "disconnected", b""
+        elif kind < 0.5:
+            edid = bytearray(make_edid("BROKEN", "0"))
+            edid[127] ^= 0xFF
+            status, data = "connected", bytes(edid)
+        elif kind < 0.55:
+            status, data = "connected", make_edid("TRUNC", "0")[:64]
+        else:
+            model = "DELL U{0}".format(2400 + index % 8 * 100)
+            serial = "SN{0:08d}".format(index)
+            status = "connected"
+            data = make_edid(model, serial, extensions=rng.choice((0, 1)))
+
+        (connector / "status").write_text(status + "\n")
+        (connector / "edid").write_bytes(data)
+
+
+def write_pci_ids(path: Path, vendors: int = 2500, devices: int = 12):
+    """
+    Writes a pci.ids of about the size of the real one, with the vendors of
+    _PCI_DEVICES among generated ones.
+    """
+    lines = ["# Synthetic pci.ids", ""]
+    vendor_ids = set(range(0, 0x10000, 0x10000 // vendors)) | set(_PCI_NAMES)
+    for vendor_id in sorted(vendor_ids):
+        default = ("Vendor {0:04x}".format(vendor_id), {})
+        name, names = _PCI_NAMES.get(vendor_id, default)
+        lines.append("{0:04x}  {1}".format(vendor_id, name))
+        ids = set(names) | {vendor_id ^ index for index in range(devices)}
+        for device_id in sorted(ids):
+            lines.append(
+                "\t{0:04x}  {1}".format(
+                    device_id, names.get(device_id, "Device {0:04x}".format(device_id))
+                )
+            )
+            lines.append("\t\t{0:04x} 0001  Subsystem".format(vendor_id))
+    lines += ["", "# List of known device classes", "C 00  Unclassified device", ""]
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("\n".join(lines))
+
+
+def write_pci(root: Path):
+    devices = root / "sys/bus/pci/devices"
+    drivers = root / "sys/bus/pci/drivers"
+    for slot, device_class, vendor, device, driver, vram, bar in _PCI_DEVICES:
+        directory = devices / slot
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / "class").write_text("0x{0:06x}\n".format(device_class))
+        (directory / "vendor").write_text("0x{0:04x}\n".format(vendor))
+        (directory / "device").write_text("0x{0:04x}\n".format(device))
+
+        resources = ["0x00000000a0000000 0x00000000a0ffffff 0x0000000000040200"]
+        if bar:
+            start = 0x4000000000
+            resources.append(
+                "0x{0:016x} 0x{1:016x} 0x000000000014220c".format(
+                    start, start + bar - 1
+                )
+            )
+        (directory / "resource").write_text("\n".join(resources) + "\n")
+
+        if vram is not None:
+            (directory / "mem_info_vram_total").write_text("{0}\n".format(vram))
+        if driver is not None:
+            (drivers / driver).mkdir(parents=True, exist_ok=True)
+            link = directory / "driver"
+            if not link.is_symlink():
+                link.symlink_to(os.path.relpath(drivers / driver, directory))
+
+    write_pci_ids(root / "usr/share/hwdata/pci.ids")
+
+
+def write_dmi(root: Path, missing=("chassis_asset_tag",)):
+    dmi = root / "sys/devices/virtual/dmi/id"
+    dmi.mkdir(parents=True, exist_ok=True)
+    for name, value in _DMI.items():
+        if name not in missing:
+            (dmi / name).write_text(value + "\n")
+
+
+def write_etc(root: Path):
+    (root / "etc/os-release").write_text(
+        'NAME="Synthetic Linux"\n'
+        'PRETTY_NAME="Synthetic Linux 42 (Test=Edition)"\n'
+        "ID=synthetic\n"
+        'HOME_URL="https://example.com/?a=b"\n'
+    )
+    (root / "etc/machine-info").write_text(
+        'PRETTY_HOSTNAME="Synthetic Host"\nLINUX_CLIENT_ENVIRONMENT=bench\n'
+    )
+    (root / "proc/version").write_text(
+        "Linux version 6.8.0-synthetic (gcc version 13.2.0) #1 SMP PREEMPT_DYNAMIC\n"
+    )
+
+
+def generate(
+    root,
+    cpus: int = 512,
+    sockets: int = 2,
+    connectors: int = 48,
+    hybrid: bool = False,
+    missing_dmi=("chassis_asset_tag",),
+    seed: int = 0,
+) -> Path:
+    """
+    Creates a synthetic machine below root and returns root.
+    """
+    root = Path(root)
+    for directory in ("proc", "etc", "sys/class/drm"):
+        (root / directory).mkdir(parents=True, exist_ok=True)
+
+    rng = random.Random(seed)
+    write_cpuinfo(root, cpus, sockets, hybrid)
+    write_drm(root, connectors, rng)
+    write_dmi(root, missing_dmi)
+    write_pci(root)
+    write_etc(root)
+    return root
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("root")
+    parser.add_argument("--cpus", type=int, default=512)
+    parser.add_argument("--sockets", type=int, default=2)
+    parser.add_argument("--connectors", type=int, default=48)
+    parser.add_argument("--hybrid", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    os.makedirs(args.root, exist_ok=True)
+    generate(
+        args.root,
+        cpus=args.cpus,
+        sockets=args.sockets,
+        connectors=args.connectors,
+        hybrid=args.hybrid,
+        seed=args.seed,
+    )
+
+
+if __name__ == "__main__":
+    main()
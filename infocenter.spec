@@ -9,6 +9,7 @@ BuildRequires:  meson
 BuildRequires:  python-rpm-macros
 BuildRequires:  python3-devel >= 3.6
 BuildRequires:  python3-distro
+BuildRequires:  python3-pyyaml
 
 %if 0%{?rhel}
 
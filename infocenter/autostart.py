@@ -0,0 +1,40 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# This module is imported by the launcher before gi, keep its imports cheap.
+
+import os
+
+RELATIVE_CONFIG_DIR = ".config/infocenter"
+DO_NOT_START_FILE_NAME = "do_not_start_file"
+
+AUTOSTART_OPTIONS = ("--autostart", "-a")
+
+
+def get_do_not_start_file() -> str:
+    return os.path.join(
+        os.path.expanduser("~"), RELATIVE_CONFIG_DIR, DO_NOT_START_FILE_NAME
+    )
+
+
+def is_requested(argv) -> bool:
+    """
+    Returns true if the command line asks for an autostart launch.
+    """
+    return any(arg in AUTOSTART_OPTIONS for arg in argv[1:])
+
+
+def is_disabled() -> bool:
+    """
+    Returns true if the user opted out of the autostart.
+    """
+    return os.path.isfile(get_do_not_start_file())
+
+
+def disable():
+    """
+    Persists the autostart opt-out, creating the config directory on demand.
+    """
+    do_not_start_file = get_do_not_start_file()
+    os.makedirs(os.path.dirname(do_not_start_file), exist_ok=True)
+    with open(do_not_start_file, "a"):
+        pass
@@ -0,0 +1,185 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+"""
+Definitions of the system checks in checks.yaml. Free of gi, so the content
+compiler validates checks.yaml at build time.
+"""
+
+from dataclasses import dataclass, field
+from gettext import gettext as _
+
+from infocenter.content import ContentError
+
+DEFAULT_TIMEOUT = 3.0
+DEFAULT_TTL = 60.0
+
+# Kind -> {parameter: (type, default)}, a default of None means required
+KINDS = {
+    "tcp_port": {"host": (str, "127.0.0.1"), "port": (int, None)},
+    "http_fetch": {
+        "host": (str, "127.0.0.1"),
+        "port": (int, None),
+        "path": (str, "/"),
+    },
+    "pac_file": {
+        "host": (str, "127.0.0.1"),
+        "port": (int, None),
+        "path": (str, "/"),
+    },
+    "systemd_unit": {"unit": (str, None)},
+    "interface_present": {"interfaces": (list, None)},
+}
+
+
+@dataclass
+class CheckDefinition:
+    id: str
+    title: str
+    kind: str
+    params: dict
+    subtitle: str = ""
+    timeout: float = DEFAULT_TIMEOUT
+    ttl: float = DEFAULT_TTL
+    depends_on: tuple = ()
+
+
+@dataclass
+class CheckGroup:
+    title: str
+    description: str = ""
+    checks: list = field(default_factory=list)
+
+
+def _parse_number(entry, name: str, default: float, where: str) -> float:
+    value = entry.get(name, default)
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+        raise ContentError("{0}: '{1}' must be a positive number".format(where, name))
+    return float(value)
+
+
+def _translate(text: str) -> str:
+    # The texts of checks.yaml are translated in po/, like the rest of the UI.
+    # gettext("") would return the catalog header.
+    return _(text) if text else ""
+
+
+def _parse_check(entry: dict, where: str) -> CheckDefinition:
+    kind = entry["kind"]
+    if kind not in KINDS:
+        raise ContentError("{0}: unknown kind '{1}'".format(where, kind))
+
+    params = {}
+    for name, (value_type, default) in KINDS[kind].items():
+        value = entry.get(name, default)
+        if value is None:
+            raise ContentError("{0}: missing '{1}'".format(where, name))
+        if not isinstance(value, value_type) or isinstance(value, bool):
+            raise ContentError(
+                "{0}: '{1}' must be a {2}".format(where, name, value_type.__name__)
+            )
+        params[name] = value
+
+    depends_on = entry.get("depends_on") or []
+    if not isinstance(depends_on, list):
+        raise ContentError("{0}: 'depends_on' must be a list".format(where))
+
+    return CheckDefinition(
+        id=entry["id"],
+        title=_translate(entry["title"]),
+        kind=kind,
+        params=params,
+        subtitle=_translate(entry.get("subtitle")),
+        timeout=_parse_number(entry, "timeout", DEFAULT_TIMEOUT, where),
+        ttl=_parse_number(entry, "ttl", DEFAULT_TTL, where),
+        depends_on=tuple(depends_on),
+    )
+
+
+class CheckRegistry:
+    """
+    The check definitions of all groups, in dependency order.
+    """
+
+    def __init__(self, groups):
+        self.groups = groups
+        self._checks = {}
+        for group in groups:
+            for definition in group.checks:
+                if definition.id in self._checks:
+                    raise ContentError("duplicate check '{0}'".format(definition.id))
+                self._checks[definition.id] = definition
+
+        self.ids = self._sort()
+
+    def _sort(self) -> list:
+        order = []
+        visiting = set()
+
+        def visit(check_id, path):
+            if check_id in order:
+                return
+            if check_id in visiting:
+                raise ContentError("cyclic dependency: " + " -> ".join(path))
+            visiting.add(check_id)
+            for dependency in self._checks[check_id].depends_on:
+                if dependency not in self._checks:
+                    raise ContentError(
+                        "check '{0}' depends on unknown check '{1}'".format(
+                            check_id, dependency
+                        )
+                    )
+                visit(dependency, path + [dependency])
+            visiting.discard(check_id)
+            order.append(check_id)
+
+        for check_id in self._checks:
+            visit(check_id, [check_id])
+        return order
+
+    def get(self, check_id: str) -> CheckDefinition:
+        return self._checks[check_id]
+
+    def of_kind(self, *kinds) -> list:
+        return [i for i in self.ids if self._checks[i].kind in kinds]
+
+    def with_dependencies(self, ids) -> list:
+        """
+        Returns ids plus everything they depend on, in dependency order.
+        """
+        selected = set(ids)
+        for check_id in reversed(self.ids):
+            if check_id in selected:
+                selected.update(self._checks[check_id].depends_on)
+        return [i for i in self.ids if i in selected]
+
+    def dependents(self, ids) -> set:
+        """
+        Returns the checks depending directly or indirectly on ids.
+        """
+        found = set()
+        for check_id in self.ids:
+            depends_on = self._checks[check_id].depends_on
+            if any(i in ids or i in found for i in depends_on):
+                found.add(check_id)
+        return found
+
+
+def load_registry(data) -> CheckRegistry:
+    """
+    Creates the registry from the "checks" content section. Titles,
+    subtitles and group texts are translated through gettext.
+
+    Raises:
+        ContentError: on unknown kinds, missing or wrongly typed parameters,
+            duplicate ids and unknown or cyclic dependencies
+    """
+    groups = []
+    for index, entry in enumerate(data or []):
+        group = CheckGroup(
+            _translate(entry["title"]), _translate(entry.get("description"))
+        )
+        for check_index, check in enumerate(entry.get("checks") or []):
+            where = "checks[{0}].checks[{1}]".format(index, check_index)
+            group.checks.append(_parse_check(check, where))
+        groups.append(group)
+    return CheckRegistry(groups)
@@ -0,0 +1,295 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+"""
+Runners and scheduler of the system checks defined in checks.yaml, see
+check_registry for their definitions.
+"""
+
+import time
+from dataclasses import dataclass, field
+from functools import partial
+from gettext import gettext as _
+
+from infocenter import pac, system_check, trace
+from infocenter.check_registry import (  # noqa F401
+    DEFAULT_TIMEOUT,
+    DEFAULT_TTL,
+    KINDS,
+    CheckDefinition,
+    CheckGroup,
+    CheckRegistry,
+    load_registry,
+)
+from infocenter.http_probe import run_probe
+from infocenter.worker import run_async
+
+NETWORK_KINDS = ("tcp_port", "http_fetch", "pac_file")
+
+SUCCESS = "success"
+FAILED = "failed"
+TIMEOUT = "timeout"
+SKIPPED = "skipped"
+
+
+@dataclass
+class CheckResult:
+    """
+    Outcome of a check. The timestamp is taken from time.monotonic().
+    """
+
+    status: str
+    detail: str = None
+    timestamp: float = field(default_factory=time.monotonic)
+
+    @property
+    def ok(self) -> bool:
+        return self.status == SUCCESS
+
+    @property
+    def value(self) -> bool:
+        """
+        The outcome as cached for the info service, None if the check timed
+        out or was skipped.
+        """
+        return self.ok if self.status in (SUCCESS, FAILED) else None
+
+
+def _run_tcp_port(params: dict, timeout: float):
+    start = time.perf_counter()
+    if not system_check.check_local_proxy_port(params["port"], params["host"], timeout):
+        return False, None
+    latency = (time.perf_counter() - start) * 1000
+    return True, _("Connected in {0:.1f} ms").format(latency)
+
+
+def _run_http_fetch(params: dict, timeout: float):
+    result = run_probe(
+        params["host"],
+        params["port"],
+        params["path"],
+        connect_timeout=timeout,
+        read_timeout=timeout,
+    )
+    if result.time_to_first_byte is None:
+        return result.ok, result.error
+    return result.ok, _("First byte after {0:.1f} ms, {1} bytes").format(
+        result.time_to_first_byte * 1000, result.body_size
+    )
+
+
+def _run_pac_file(params: dict, timeout: float):
+    fetcher = pac.get_fetcher(params["host"], params["port"], params["path"])
+    result = fetcher.fetch(timeout)
+    if not result.ok:
+        return False, result.error
+
+    changed_at = time.strftime("%x %X", time.localtime(result.changed_at))
+    if result.changed:
+        detail = _("Changed at {0}, {1} bytes")
+    else:
+        detail = _("Unchanged since {0}, {1} bytes")
+    return True, detail.format(changed_at, result.size)
+
+
+def _run_systemd_unit(params: dict, _timeout: float):
+    return system_check.check_services([params["unit"]])[params["unit"]], None
+
+
+def _run_systemd_units(definitions) -> dict:
+    # All units with a single D-Bus call
+    running = system_check.check_services([d.params["unit"] for d in definitions])
+    return {d.id: (running[d.params["unit"]], None) for d in definitions}
+
+
+def _run_interface_present(params: dict, _timeout: float):
+    found = system_check.find_interfaces(params["interfaces"])
+    return bool(found), ", ".join(found) or None
+
+
+RUNNERS = {
+    "tcp_port": _run_tcp_port,
+    "http_fetch": _run_http_fetch,
+    "pac_file": _run_pac_file,
+    "systemd_unit": _run_systemd_unit,
+    "interface_present": _run_interface_present,
+}
+
+# Kinds whose checks are executed together when they are ready at the same
+# time, as runner(definitions) -> {check id: (ok, detail)}
+BATCH_RUNNERS = {
+    "systemd_unit": _run_systemd_units,
+}
+
+
+def execute(definition: CheckDefinition):
+    """
+    Runs a single check blocking and returns (ok, detail).
+    """
+    return RUNNERS[definition.kind](definition.params, definition.timeout)
+
+
+class CheckScheduler:
+    """
+    Runs the checks of a registry on the worker pool.
+
+    Independent checks run concurrently. A check starts once all of its
+    dependencies have a result, reusing cached results that are still fresh
+    (see CheckDefinition.ttl) instead of executing them again. If a
+    dependency did not succeed, the check is skipped right away.
+    Ready checks of a kind in BATCH_RUNNERS are executed together.
+
+    The callback is invoked as callback(check_id, result) with result None
+    when a check becomes pending.
+    """
+
+    def __init__(self, registry: CheckRegistry, callback):
+        self._registry = registry
+        self._callback = callback
+        self._results = {}
+        self._pending = set()
+        self._running = set()
+        self._rerun = set()
+        # (ids, done callback) of run() calls that are not finished yet
+        self._waiters = []
+
+    @property
+    def ids(self) -> list:
+        return self._registry.ids
+
+    def get_result(self, check_id: str) -> CheckResult:
+        return self._results.get(check_id)
+
+    def is_stale(self, check_id: str) -> bool:
+        result = self._results.get(check_id)
+        if result is None:
+            return True
+        ttl = self._registry.get(check_id).ttl
+        return time.monotonic() - result.timestamp > ttl
+
+    def run(self, ids=None, force=False, dependents=False, done=None):
+        """
+        Runs the given checks (default all) and what they depend on. Without
+        force only stale checks are executed.
+
+        Args:
+            dependents (bool): also re-run the checks depending on ids
+            done (callable): invoked as done(all_ok) once all ids have a result
+        """
+        ids = set(self._registry.ids if ids is None else ids)
+        if dependents:
+            ids |= self._registry.dependents(ids)
+
+        selected = set()
+        for check_id in self._registry.with_dependencies(ids):
+            definition = self._registry.get(check_id)
+            if (
+                (force and check_id in ids)
+                or self.is_stale(check_id)
+                or any(dependency in selected for dependency in definition.depends_on)
+            ):
+                selected.add(check_id)
+
+        for check_id in selected:
+            if check_id in self._running:
+                self._rerun.add(check_id)
+            elif check_id not in self._pending:
+                self._pending.add(check_id)
+                self._callback(check_id, None)
+
+        if done is not None:
+            self._waiters.append((ids, done))
+        self._advance()
+
+    def report(self, check_id: str, ok: bool, detail: str = None):
+        """
+        Stores a result observed by other means (e.g. a D-Bus signal) without
+        executing the check. Dependents re-run if the outcome changed.
+        """
+        previous = self._results.get(check_id)
+        self._store(check_id, CheckResult(SUCCESS if ok else FAILED, detail))
+
+        if previous is not None and previous.ok != ok:
+            self.run(self._registry.dependents({check_id}), force=True)
+
+    def _advance(self):
+        batches = {}
+        for check_id in self._registry.ids:
+            if check_id not in self._pending:
+                continue
+
+            definition = self._registry.get(check_id)
+            if any(
+                dependency in self._pending or dependency in self._running
+                for dependency in definition.depends_on
+            ):
+                continue
+
+            self._pending.discard(check_id)
+            failed = [
+                self._registry.get(dependency).title
+                for dependency in definition.depends_on
+                if not (dependency in self._results and self._results[dependency].ok)
+            ]
+            if failed:
+                self._store(
+                    check_id,
+                    CheckResult(SKIPPED, _("Requires {0}").format(", ".join(failed))),
+                )
+            elif definition.kind in BATCH_RUNNERS:
+                self._running.add(check_id)
+                batches.setdefault(definition.kind, []).append(definition)
+            else:
+                self._running.add(check_id)
+                run_async(
+                    trace.wrap(
+                        partial(execute, definition), "check." + check_id, "check"
+                    ),
+                    partial(self._on_executed, check_id),
+                    timeout=definition.timeout,
+                )
+
+        for kind, definitions in batches.items():
+            run_async(
+                trace.wrap(
+                    partial(BATCH_RUNNERS[kind], definitions), "check." + kind, "check"
+                ),
+                partial(self._on_batch_executed, [d.id for d in definitions]),
+                timeout=max(definition.timeout for definition in definitions),
+            )
+
+        self._notify_waiters()
+
+    def _on_batch_executed(self, ids, results, error):
+        for check_id in ids:
+            self._on_executed(check_id, None if error else results[check_id], error)
+
+    def _on_executed(self, check_id, result, error):
+        self._running.discard(check_id)
+
+        if isinstance(error, TimeoutError):
+            self._store(check_id, CheckResult(TIMEOUT))
+        elif error is not None:
+            self._store(check_id, CheckResult(FAILED, str(error)))
+        else:
+            ok, detail = result
+            self._store(check_id, CheckResult(SUCCESS if ok else FAILED, detail))
+
+        if check_id in self._rerun:
+            # Something changed while the check was running
+            self._rerun.discard(check_id)
+            self.run([check_id], force=True, dependents=True)
+        else:
+            self._advance()
+
+    def _store(self, check_id, result: CheckResult):
+        self._results[check_id] = result
+        self._callback(check_id, result)
+
+    def _notify_waiters(self):
+        busy = self._pending | self._running
+        waiters, self._waiters = self._waiters, []
+        for ids, done in waiters:
+            if ids & busy:
+                self._waiters.append((ids, done))
+            else:
+                done(all(self._results[i].ok for i in ids if i in self._results))
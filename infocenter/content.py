@@ -0,0 +1,205 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+"""
+Content of the Information Center (quicklinks, support, client, disclaimer,
+checks).
+
+The YAML files in yaml/<lang>/ are validated and compiled into a single JSON
+bundle per language at build time, which is embedded in infocenter.gresource.
+Sections a language does not translate are taken from English. At runtime
+the bundle is loaded with one lookup and without PyYAML. Loose YAML files are
+only parsed as a development fallback.
+
+Usage as build helper: content.py --output BUNDLE.json YAML...
+"""
+
+import json
+import sys
+from pathlib import Path
+
+FORMAT_VERSION = 1
+
+YAML_DIR = Path(__file__).parent / "yaml"
+
+# Schema per content file: "list" of entries or a single "map", with the
+# required string fields of the entries and optional nested entry lists.
+# The kind specific parameters of checks are validated by the check registry.
+SCHEMA = {
+    "quicklinks": {
+        "type": "list",
+        "fields": ("title", "icon", "uri"),
+    },
+    "support": {
+        "type": "map",
+        "fields": ("title", "mail", "phone"),
+    },
+    "client": {
+        "type": "map",
+        "fields": ("title",),
+        "lists": {"client": ("label", "value")},
+    },
+    "disclaimer": {
+        "type": "list",
+        "fields": ("title", "body"),
+    },
+    "checks": {
+        "type": "list",
+        "fields": ("title",),
+        "lists": {"checks": ("id", "title", "kind")},
+    },
+}
+
+
+class ContentError(ValueError):
+    pass
+
+
+def _check_fields(entry, fields, where: str):
+    if not isinstance(entry, dict):
+        raise ContentError("{0}: expected a mapping".format(where))
+
+    for field in fields:
+        if field not in entry:
+            raise ContentError("{0}: missing '{1}'".format(where, field))
+        if not isinstance(entry[field], str):
+            raise ContentError("{0}: '{1}' must be a string".format(where, field))
+
+
+def _check_entry(entry, schema, where: str):
+    _check_fields(entry, schema["fields"], where)
+    for key, fields in schema.get("lists", {}).items():
+        entries = entry.get(key) or []
+        if not isinstance(entries, list):
+            raise ContentError("{0}.{1}: expected a list".format(where, key))
+        for index, nested in enumerate(entries):
+            _check_fields(nested, fields, "{0}.{1}[{2}]".format(where, key, index))
+        entry[key] = entries
+
+
+def validate(section: str, data, source: str = None):
+    """
+    Validates the parsed content of one YAML file. Empty files are allowed
+    and result in None.
+
+    Raises:
+        ContentError: if the content does not match SCHEMA
+    """
+    where = source or section
+    schema = SCHEMA.get(section)
+    if schema is None:
+        raise ContentError("{0}: unknown content file".format(where))
+
+    if data is None:
+        return None
+
+    if schema["type"] == "list":
+        if not isinstance(data, list):
+            raise ContentError("{0}: expected a list".format(where))
+        for index, entry in enumerate(data):
+            _check_entry(entry, schema, "{0}[{1}]".format(where, index))
+    else:
+        _check_entry(data, schema, where)
+
+    if section == "checks":
+        # Kinds, their parameters and the dependencies
+        from infocenter.check_registry import load_registry
+
+        try:
+            load_registry(data)
+        except ContentError as error:
+            raise ContentError("{0}: {1}".format(where, error)) from error
+
+    return data
+
+
+def _load_yaml(path: Path):
+    import yaml
+
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    try:
+        with open(path, "rb") as file:
+            return yaml.load(file, Loader=loader)
+    except yaml.YAMLError as error:
+        raise ContentError("{0}: {1}".format(path, error)) from error
+
+
+def load_yaml_files(paths) -> dict:
+    """
+    Parses and validates loose YAML content files.
+
+    Returns:
+        dict: Maps the section name (file stem) to its content
+    """
+    sections = {}
+    for path in map(Path, paths):
+        sections[path.stem] = validate(path.stem, _load_yaml(path), str(path))
+    return sections
+
+
+def get_section_paths(languages, base: Path = YAML_DIR) -> list:
+    """
+    Returns the YAML file of every section from the first of languages that
+    has it (see resources.get_language_chain()), so a translation may cover
+    only some sections, e.g. just checks.yaml.
+    """
+    paths = {}
+    for lang in languages:
+        for path in sorted((base / lang).glob("*.yaml")):
+            paths.setdefault(path.stem, path)
+    return [paths[section] for section in sorted(paths)]
+
+
+def load_yaml_dir(languages, base: Path = YAML_DIR) -> dict:
+    """
+    Development fallback: loads the loose YAML files of languages, see
+    get_section_paths(). Returns an empty dict if no content is available.
+    """
+    return load_yaml_files(get_section_paths(languages, base))
+
+
+def load_bundle(data: bytes) -> dict:
+    """
+    Loads a compiled content bundle.
+
+    Returns:
+        dict: Maps the section name to its content
+
+    Raises:
+        ContentError: if the bundle has an unsupported format
+    """
+    bundle = json.loads(data)
+    if bundle.get("format") != FORMAT_VERSION:
+        raise ContentError("Unsupported content bundle format")
+    return bundle["sections"]
+
+
+def compile_bundle(paths) -> bytes:
+    bundle = {"format": FORMAT_VERSION, "sections": load_yaml_files(paths)}
+    return json.dumps(bundle, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def main(argv) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compile a content bundle")
+    parser.add_argument("--output", required=True)
+    parser.add_argument("inputs", nargs="+")
+    args = parser.parse_args(argv)
+
+    try:
+        data = compile_bundle(args.inputs)
+    except ContentError as error:
+        print("error: {0}".format(error), file=sys.stderr)
+        return 1
+
+    Path(args.output).write_bytes(data)
+    return 0
+
+
+if __name__ == "__main__":
+    # Run as a script by the build. Through the package, so ContentError is
+    # the class raised by check_registry.
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    from infocenter import content
+
+    sys.exit(content.main(sys.argv[1:]))
@@ -0,0 +1,89 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+from collections import namedtuple
+from functools import cache
+
+from infocenter import sysroot
+
+CPUINFO_PATH = "/proc/cpuinfo"
+
+# Architectures without "model name" (e.g. ARM) describe the CPU in these keys
+_FALLBACK_MODEL_KEYS = ("Model", "cpu model", "Hardware", "Processor")
+
+CpuTopology = namedtuple("CpuTopology", ("sockets", "cores", "threads", "models"))
+
+
+def _iter_fields(path: str):
+    """
+    Yields (key, value) for every line of a cpuinfo file. Values keep any
+    colon they contain, processor blocks are separated by ("", "").
+    """
+    with open(path) as file:
+        for line in file:
+            key, separator, value = line.partition(":")
+            if separator:
+                yield key.strip(), value.strip()
+            elif not line.strip():
+                yield "", ""
+
+
+@cache
+def _read_model_name(path: str) -> str:
+    fallback = None
+    for key, value in _iter_fields(path):
+        if key == "model name":
+            # Stop at the first processor, no need to read the other ones
+            return value
+        if fallback is None and key in _FALLBACK_MODEL_KEYS and value:
+            fallback = value
+    return fallback
+
+
+@cache
+def _read_topology(path: str) -> CpuTopology:
+    threads = 0
+    sockets = set()
+    cores = set()
+    models = {}
+    physical_id = None
+
+    for key, value in _iter_fields(path):
+        if key == "processor":
+            threads += 1
+            physical_id = None
+        elif key == "physical id":
+            physical_id = value
+            sockets.add(value)
+        elif key == "core id":
+            cores.add((physical_id, value))
+        elif key == "model name":
+            models[value] = None
+
+    return CpuTopology(
+        sockets=len(sockets) or 1,
+        cores=len(cores) or threads,
+        threads=threads,
+        models=tuple(models),
+    )
+
+
+def get_model_name() -> str:
+    """
+    Returns the model name of the first CPU, or None if cpuinfo has none.
+    Cached for the process lifetime.
+    """
+    return _read_model_name(sysroot.path(CPUINFO_PATH))
+
+
+def get_topology() -> CpuTopology:
+    """
+    Returns sockets, physical cores, logical CPUs and the distinct model names
+    (more than one on hybrid CPUs), collected in a single pass over cpuinfo.
+    Cached for the process lifetime.
+    """
+    return _read_topology(sysroot.path(CPUINFO_PATH))
+
+
+def clear_caches():
+    _read_model_name.cache_clear()
+    _read_topology.cache_clear()
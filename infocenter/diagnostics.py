@@ -0,0 +1,282 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+"""
+Network path latency diagnostics: where the time goes between this machine
+and the configured sites.
+
+Every round measures the stages below. The probes run with a bounded
+concurrency and the durations are recorded in fixed-bucket histograms.
+
+- dns: resolving each site
+- proxy_connect: TCP connect to the local proxy
+- pac_first_byte: time to first byte of the PAC file
+- proxy_tunnel: CONNECT through the proxy to each site, until its answer
+"""
+
+import asyncio
+import bisect
+import socket
+import time
+from dataclasses import dataclass, field
+from urllib.parse import urlsplit
+
+from infocenter.http_probe import HttpError, probe
+
+STAGES = ("dns", "proxy_connect", "pac_first_byte", "proxy_tunnel")
+
+# Upper bounds of the histogram buckets in ms, the last bucket is unbounded
+BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+DEFAULT_ROUNDS = 5
+DEFAULT_CONCURRENCY = 2
+DEFAULT_TIMEOUT = 5.0
+
+# Hard limits, whatever is requested, so the proxy is never flooded
+MAX_ROUNDS = 20
+MAX_CONCURRENCY = 4
+MAX_HOSTS = 8
+
+_MAX_STATUS_LINE = 8 * 1024
+
+
+@dataclass
+class Histogram:
+    """
+    Durations in ms, counted in the fixed BUCKETS. Percentiles are
+    interpolated within their bucket.
+    """
+
+    counts: list = field(default_factory=lambda: [0] * (len(BUCKETS) + 1))
+    failures: int = 0
+    minimum: float = None
+    maximum: float = None
+    total: float = 0.0
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+    def add(self, milliseconds: float):
+        self.counts[bisect.bisect_left(BUCKETS, milliseconds)] += 1
+        self.total += milliseconds
+        if self.minimum is None or milliseconds < self.minimum:
+            self.minimum = milliseconds
+        if self.maximum is None or milliseconds > self.maximum:
+            self.maximum = milliseconds
+
+    def add_failure(self):
+        self.failures += 1
+
+    def percentile(self, percent: float) -> float:
+        """
+        Returns the estimated percentile in ms, None without samples.
+        """
+        count = self.count
+        if not count:
+            return None
+
+        rank = percent / 100 * count
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            if bucket_count and cumulative + bucket_count >= rank:
+                lower = BUCKETS[index - 1] if index else 0.0
+                upper = BUCKETS[index] if index < len(BUCKETS) else self.maximum
+                # The observed extremes are tighter than the bucket bounds
+                lower = max(lower, self.minimum)
+                upper = min(upper, self.maximum)
+                fraction = (rank - cumulative) / bucket_count
+                return lower + (upper - lower) * fraction
+            cumulative += bucket_count
+        return self.maximum
+
+    def to_dict(self) -> dict:
+        def rounded(value):
+            return None if value is None else round(value, 2)
+
+        return {
+            "count": self.count,
+            "failures": self.failures,
+            "min_ms": rounded(self.minimum),
+            "max_ms": rounded(self.maximum),
+            "mean_ms": rounded(self.total / self.count) if self.count else None,
+            "p50_ms": rounded(self.percentile(50)),
+            "p95_ms": rounded(self.percentile(95)),
+            "p99_ms": rounded(self.percentile(99)),
+            "buckets_ms": list(BUCKETS),
+            "bucket_counts": list(self.counts),
+        }
+
+
+@dataclass
+class Report:
+    hosts: list
+    rounds: int
+    histograms: dict = field(
+        default_factory=lambda: {stage: Histogram() for stage in STAGES}
+    )
+    # Last error per stage
+    errors: dict = field(default_factory=dict)
+    duration: float = 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "hosts": list(self.hosts),
+            "rounds": self.rounds,
+            "duration_ms": round(self.duration * 1000, 1),
+            "stages": {
+                stage: histogram.to_dict()
+                for stage, histogram in self.histograms.items()
+            },
+            "errors": dict(self.errors),
+        }
+
+
+def get_hosts(uris) -> list:
+    """
+    Returns the distinct (host, port) of the http(s) URIs, e.g. of the
+    quicklinks, at most MAX_HOSTS.
+    """
+    hosts = []
+    for uri in uris:
+        parts = urlsplit(uri)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            continue
+        try:
+            port = parts.port or (443 if parts.scheme == "https" else 80)
+        except ValueError:
+            continue
+        if (parts.hostname, port) not in hosts:
+            hosts.append((parts.hostname, port))
+    return hosts[:MAX_HOSTS]
+
+
+async def _measure_dns(host: str):
+    loop = asyncio.get_running_loop()
+    await loop.getaddrinfo(host, None, type=socket.SOCK_STREAM)
+
+
+async def _measure_connect(ip: str, port: int):
+    _reader, writer = await asyncio.open_connection(ip, port)
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except OSError:
+        pass
+
+
+async def _measure_pac(ip: str, port: int, path: str, timeout: float):
+    result = await probe(ip, port, path, connect_timeout=timeout, read_timeout=timeout)
+    if result.time_to_first_byte is None:
+        raise HttpError(result.error or "No response")
+    if not result.ok:
+        raise HttpError("HTTP {0}".format(result.status))
+    # Only the time to first byte counts, not the connect
+    return result.time_to_first_byte
+
+
+async def _measure_tunnel(ip: str, port: int, host: str, host_port: int):
+    """
+    Opens a tunnel through the proxy and returns the time from the CONNECT
+    request until the proxy answered it.
+    """
+    reader, writer = await asyncio.open_connection(ip, port)
+    try:
+        target = "{0}:{1}".format(host, host_port)
+        sent = time.monotonic()
+        request = "CONNECT {0} HTTP/1.1\r\nHost: {0}\r\nUser-Agent: infocenter\r\n\r\n"
+        writer.write(request.format(target).encode("latin-1"))
+        await writer.drain()
+        status_line = await reader.readuntil(b"\r\n")
+        elapsed = time.monotonic() - sent
+
+        if len(status_line) > _MAX_STATUS_LINE:
+            raise HttpError("Malformed status line")
+        fields = status_line.decode("latin-1").split(" ", 2)
+        if len(fields) < 2 or fields[1] != "200":
+            raise HttpError(status_line.decode("latin-1").strip())
+        return elapsed
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+
+
+async def _run_probe(report, semaphore, stage, coroutine_factory, timeout):
+    async with semaphore:
+        start = time.monotonic()
+        try:
+            elapsed = await asyncio.wait_for(coroutine_factory(), timeout)
+        except (
+            OSError,
+            asyncio.TimeoutError,
+            asyncio.IncompleteReadError,
+            asyncio.LimitOverrunError,
+            HttpError,
+        ) as error:
+            report.histograms[stage].add_failure()
+            report.errors[stage] = str(error) or type(error).__name__
+            return
+        if elapsed is None:
+            elapsed = time.monotonic() - start
+        report.histograms[stage].add(elapsed * 1000)
+
+
+async def diagnose(
+    hosts,
+    proxy_ip: str = "127.0.0.1",
+    proxy_port: int = 9000,
+    pac_path: str = "/localproxy",
+    rounds: int = DEFAULT_ROUNDS,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    timeout: float = DEFAULT_TIMEOUT,
+) -> Report:
+    """
+    Measures all stages rounds times. Rounds run one after another, the
+    probes of a round with at most concurrency at a time.
+
+    Args:
+        hosts (list): (host, port) of the sites, see get_hosts()
+        rounds (int): capped at MAX_ROUNDS
+        concurrency (int): capped at MAX_CONCURRENCY
+        timeout (float): per probe in seconds
+    """
+    hosts = list(hosts)[:MAX_HOSTS]
+    rounds = max(1, min(rounds, MAX_ROUNDS))
+    semaphore = asyncio.Semaphore(max(1, min(concurrency, MAX_CONCURRENCY)))
+    report = Report(hosts=["{0}:{1}".format(*host) for host in hosts], rounds=rounds)
+
+    def measure(stage, factory):
+        return _run_probe(report, semaphore, stage, factory, timeout)
+
+    start = time.monotonic()
+    for _round in range(rounds):
+        probes = [
+            measure("proxy_connect", lambda: _measure_connect(proxy_ip, proxy_port)),
+            measure(
+                "pac_first_byte",
+                lambda: _measure_pac(proxy_ip, proxy_port, pac_path, timeout),
+            ),
+        ]
+        for host, port in hosts:
+            probes.append(measure("dns", lambda host=host: _measure_dns(host)))
+            probes.append(
+                measure(
+                    "proxy_tunnel",
+                    lambda host=host, port=port: _measure_tunnel(
+                        proxy_ip, proxy_port, host, port
+                    ),
+                )
+            )
+        await asyncio.gather(*probes)
+
+    report.duration = time.monotonic() - start
+    return report
+
+
+def run(*args, **kwargs) -> Report:
+    """
+    Blocking wrapper around diagnose() for use in worker threads.
+    """
+    return asyncio.run(diagnose(*args, **kwargs))
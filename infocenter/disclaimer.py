@@ -1,21 +1,12 @@
 # SPDX-License-Identifier: GPL-2.0-or-later
 
 import gi
-import re
 
 gi.require_version("Gtk", "4.0")
 
 from gi.repository import Gtk  # noqa E402
 
-
-def replace_urls(text):
-    url_pattern = re.compile(r"https?://\S+|www\.\S+")
-    urls = url_pattern.findall(text)
-
-    for url in urls:
-        text = text.replace(url, '<a href="' + url + '">' + url + "</a>")
-
-    return text
+from infocenter import markup  # noqa E402
 
 
 @Gtk.Template(resource_path="/de/volkswagen/infocenter/gtk/disclaimer.ui")
@@ -26,7 +17,37 @@ class Disclaimer(Gtk.Box):
     content_label = Gtk.Template.Child()
 
     def __init__(self, title="", content="", **kwargs):
+        """
+        Args:
+            title (str): plain text
+            content (str): plain text, rendered by markup.render()
+        """
         super().__init__(**kwargs)
-        self.title_label.set_markup("<b>" + title + "</b>")
-        self.content_label.set_markup(replace_urls(content))
         self.content_label.add_css_class("dim-label")
+        self.update(title, content)
+
+    def update(self, title, content):
+        self.title_label.set_markup("<b>" + markup.escape(title) + "</b>")
+        self.content_label.set_markup(markup.render(content))
+
+
+def _on_setup(_factory, list_item):
+    list_item.set_activatable(False)
+    list_item.set_focusable(False)
+    list_item.set_child(Disclaimer(margin_bottom=12))
+
+
+def _on_bind(_factory, list_item):
+    item = list_item.get_item()
+    list_item.get_child().update(item.title, item.body)
+
+
+def create_factory() -> Gtk.ListItemFactory:
+    """
+    Returns a factory rendering models.DisclaimerItem, widgets are only
+    created for the visible items and recycled while scrolling.
+    """
+    factory = Gtk.SignalListItemFactory()
+    factory.connect("setup", _on_setup)
+    factory.connect("bind", _on_bind)
+    return factory
@@ -0,0 +1,249 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# This module is imported by the launcher before gi, keep its imports cheap.
+# The checks import gi.repository.GLib/Gio on demand, Gtk and Adw never.
+
+import getpass
+import json
+import socket
+import sys
+import threading
+import time
+
+from infocenter import edid, keyvalue, resolver, sysroot, trace
+from infocenter import system_information_provider as provider
+
+FORMAT_VERSION = 1
+FORMATS = ("json", "yaml")
+DUMP_OPTION = "--dump"
+
+
+def _get_monitors() -> list:
+    monitors = []
+    for connector, info in edid.iter_connectors():
+        monitor = {"connector": connector}
+        monitor.update(info._asdict())
+        monitors.append(monitor)
+    return monitors
+
+
+def _get_client() -> dict:
+    return dict(keyvalue.read_env_file(sysroot.path("/etc/machine-info")))
+
+
+def _check_zscaler_service() -> bool:
+    from infocenter import system_check
+
+    return system_check.check_zscaler_service()
+
+
+def _check_proxy() -> dict:
+    from infocenter import pac, system_check
+
+    result = system_check.check_proxy()
+    summary = system_check.summarize_proxy(result)
+    # A 200 answer is not yet a valid PAC file
+    summary["pac_file"] = result.ok and pac.check_syntax(result.body) is None
+    return summary
+
+
+def _check_vpn() -> bool:
+    from infocenter import system_check
+
+    return system_check.check_vpn()
+
+
+# (section, key, getter, timeout in seconds), in output order
+ITEMS = (
+    ("system", "computer_name", socket.gethostname, 1.0),
+    ("system", "fqdn", resolver.get_fqdn, 3.0),
+    ("system", "user_name", getpass.getuser, 1.0),
+    ("system", "os", provider.get_os, 1.0),
+    ("system", "hardware_model", provider.get_hardware_model, 1.0),
+    ("system", "chassis_asset_tag", provider.get_chassis_asset, 1.0),
+    ("system", "bios", provider.get_bios_version, 1.0),
+    ("system", "cpu", provider.get_cpu_model, 1.0),
+    ("system", "cpu_topology", provider.get_cpu_topology, 1.0),
+    ("system", "kernel", provider.get_kernel_version, 1.0),
+    ("system", "monitors", _get_monitors, 2.0),
+    ("system", "graphic_cards", provider.get_graphic_card_list, 2.0),
+    ("client", None, _get_client, 1.0),
+    ("checks", "zscaler_service", _check_zscaler_service, 3.0),
+    ("checks", "proxy", _check_proxy, 6.0),
+    ("checks", "vpn", _check_vpn, 1.0),
+)
+
+
+def is_requested(argv) -> bool:
+    """
+    Returns true if the command line asks for a headless dump.
+    """
+    return any(
+        arg == DUMP_OPTION or arg.startswith(DUMP_OPTION + "=") for arg in argv[1:]
+    )
+
+
+class _Item:
+    """
+    Runs a getter in a daemon thread, so a hanging item can neither block
+    the output of the others nor the exit of the process.
+    """
+
+    def __init__(self, getter):
+        self.value = None
+        self.error = None
+        self._done = threading.Event()
+        threading.Thread(target=self._run, args=(getter,), daemon=True).start()
+
+    def _run(self, getter):
+        try:
+            self.value = getter()
+        except Exception as error:
+            self.error = "{0}: {1}".format(type(error).__name__, error)
+        finally:
+            self._done.set()
+
+    def wait(self, deadline: float) -> bool:
+        return self._done.wait(max(0.0, deadline - time.monotonic()))
+
+
+def collect(items=ITEMS):
+    """
+    Starts all items in parallel and yields (section, key, value, error) in
+    the order of items as soon as an item and all items before it are done.
+    An item that misses its deadline (counted from the start) is reported
+    with value None and error "timeout".
+    """
+    start = time.monotonic()
+    running = [
+        (
+            section,
+            key,
+            _Item(trace.wrap(getter, "dump." + (key or section), "dump")),
+            start + timeout,
+        )
+        for section, key, getter, timeout in items
+    ]
+
+    for section, key, item, deadline in running:
+        if item.wait(deadline):
+            yield section, key, item.value, item.error
+        else:
+            yield section, key, None, "timeout"
+
+
+def _plain(value):
+    # Tuples (e.g. of EdidInfo) become lists, YAML's safe dumper rejects them
+    return json.loads(json.dumps(value))
+
+
+class _JsonWriter:
+    def __init__(self, stream):
+        self._stream = stream
+        self._section = None
+        self._first = True
+
+    def begin(self):
+        self._stream.write('{"version": ' + str(FORMAT_VERSION))
+
+    def item(self, section, key, value):
+        if key is None:
+            self._close_section()
+            self._stream.write(
+                ",\n{0}: {1}".format(json.dumps(section), json.dumps(value))
+            )
+        else:
+            if section != self._section:
+                self._close_section()
+                self._stream.write(",\n" + json.dumps(section) + ": {")
+                self._section = section
+                self._first = True
+            separator = "\n  " if self._first else ",\n  "
+            self._stream.write(
+                "{0}{1}: {2}".format(separator, json.dumps(key), json.dumps(value))
+            )
+            self._first = False
+        self._stream.flush()
+
+    def end(self):
+        self._close_section()
+        self._stream.write("}\n")
+        self._stream.flush()
+
+    def _close_section(self):
+        if self._section is not None:
+            self._stream.write("\n}")
+            self._section = None
+
+
+class _YamlWriter:
+    def __init__(self, stream):
+        import yaml
+
+        self._dump = yaml.safe_dump
+        self._stream = stream
+        self._section = None
+
+    def begin(self):
+        self._stream.write("version: {0}\n".format(FORMAT_VERSION))
+
+    def item(self, section, key, value):
+        if key is None:
+            self._section = None
+            self._write({section: _plain(value)}, "")
+        else:
+            if section != self._section:
+                self._stream.write(section + ":\n")
+                self._section = section
+            self._write({key: _plain(value)}, "  ")
+        self._stream.flush()
+
+    def end(self):
+        self._stream.flush()
+
+    def _write(self, data, indent):
+        text = self._dump(data, allow_unicode=True, sort_keys=False)
+        for line in text.splitlines():
+            self._stream.write(indent + line + "\n")
+
+
+def dump(output_format: str = "json", stream=None, checks: bool = True) -> int:
+    """
+    Writes all system information and check results to stream (stdout) while
+    they are collected. Failed or timed out items are null and listed under
+    "errors" at the end.
+
+    Returns:
+        int: 0 if all items were collected, 1 otherwise
+    """
+    stream = stream or sys.stdout
+    writer = (_YamlWriter if output_format == "yaml" else _JsonWriter)(stream)
+    items = ITEMS if checks else [item for item in ITEMS if item[0] != "checks"]
+
+    errors = {}
+    writer.begin()
+    for section, key, value, error in collect(items):
+        if error is not None:
+            errors[section if key is None else section + "." + key] = error
+        writer.item(section, key, value)
+    writer.item("errors", None, errors)
+    writer.end()
+
+    return 1 if errors else 0
+
+
+def main(argv) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="infocenter", description="Dumps the system information headless."
+    )
+    parser.add_argument(
+        DUMP_OPTION, choices=FORMATS, nargs="?", const="json", default="json"
+    )
+    parser.add_argument(
+        "--no-checks", action="store_true", help="skip the system checks"
+    )
+    args = parser.parse_args(argv[1:])
+
+    return dump(args.dump, checks=not args.no_checks)
@@ -1,15 +1,27 @@
 # SPDX-License-Identifier: GPL-2.0-or-later
 
 import glob
+import os
 import struct
 from collections import namedtuple
+from functools import lru_cache
 from gettext import gettext as _
 from typing import Tuple
 
-_STRUCT_FORMAT = (
+from infocenter import sysroot
+
+DRM_CLASS_DIR = "/sys/class/drm"
+
+BLOCK_SIZE = 128
+EDID_HEADER = b"\x00\xff\xff\xff\xff\xff\xff\x00"
+
+CEA_EXTENSION_TAG = 0x02
+DISPLAYID_EXTENSION_TAG = 0x70
+
+_BASE_BLOCK = struct.Struct(
     "<"  # little-endian
     "8s"  # constant header (8 bytes)
-    "H"  # manufacturer id (2 bytes)
+    "2s"  # manufacturer id, big-endian PNP ID (2 bytes)
     "H"  # product id (2 bytes)
     "I"  # serial number (4 bytes)
     "B"  # manufactoring week (1 byte)
@@ -21,101 +33,320 @@ _STRUCT_FORMAT = (
     "B"  # vertical size in cm (1 byte)
     "B"  # display gamma (1 byte)
     "B"  # supported features (1 byte)
-    "10s"  # color characteristics (10 bytes)
-    "H"  # supported timings (2 bytes)
-    "B"  # reserved timing (1 byte)
-    "16s"  # EDID supported timings (16 bytes)
-    "18s"  # description block 1 (18 bytes)
-    "18s"  # description block 2 (18 bytes)
-    "18s"  # descriptionblock 3 (18 bytes)
-    "18s"  # description block 4 (18 bytes)
+    "10x"  # color characteristics (10 bytes)
+    "3x"  # established and reserved timings (3 bytes)
+    "16x"  # standard timings (16 bytes)
+    "72x"  # descriptor blocks (4 x 18 bytes)
     "B"  # extension flag (1 byte)
-    "B"
-)  # checksum (1 byte)
+    "B"  # checksum (1 byte)
+)
+assert _BASE_BLOCK.size == BLOCK_SIZE
+
+_DESCRIPTOR_OFFSETS = (54, 72, 90, 108)
+_DESCRIPTOR_SIZE = 18
+
+_DESCRIPTOR_SERIAL = 0xFF
+_DESCRIPTOR_RANGE_LIMITS = 0xFD
+_DESCRIPTOR_NAME = 0xFC
 
-_RawEdid = namedtuple(
-    "_RawEdid",
+_DISPLAYID_TIMING_I = 0x03
+_DISPLAYID_TIMING_VII = 0x22
+_DISPLAYID_TIMING_SIZE = 20
+
+EdidInfo = namedtuple(
+    "EdidInfo",
     (
-        "header",
-        "manu_id",
-        "prod_id",
-        "serial_no",
-        "manu_week",
-        "manu_year",
-        "edid_version",
-        "edid_revision",
-        "input_type",
-        "width",
-        "height",
-        "gamma",
-        "features",
-        "color",
-        "timings_supported",
-        "timings_reserved",
-        "timings_edid",
-        "description_1",
-        "description_2",
-        "description_3",
-        "description_4",
-        "extension",
-        "checksum",
+        "manufacturer",  # PNP ID, e.g. "DEL"
+        "product_id",
+        "serial_number",
+        "model",  # display product name descriptor
+        "serial",  # display serial number descriptor
+        "year",
+        "week",
+        "version",  # e.g. "1.4"
+        "native_resolution",  # (width, height) of the preferred timing
+        "refresh_rates",  # sorted distinct refresh rates in Hz
+        "vertical_range",  # (min Hz, max Hz) from the range limits or None
+        "size_mm",  # (width, height) in mm or None
+        "extensions",  # tags of the decoded extension blocks
     ),
 )
 
+Timing = namedtuple("Timing", ("width", "height", "refresh_rate", "size_mm"))
+
+
+class EdidError(ValueError):
+    pass
+
+
+def _checksum_ok(block: memoryview) -> bool:
+    return sum(block) % 256 == 0
+
+
+def _decode_pnp_id(data: bytes) -> str:
+    value = int.from_bytes(data, "big")
+    letters = ((value >> 10) & 0x1F, (value >> 5) & 0x1F, value & 0x1F)
+    if not all(1 <= letter <= 26 for letter in letters):
+        return ""
+    return "".join(chr(letter + 64) for letter in letters)
+
+
+def _decode_text(descriptor: memoryview) -> str:
+    text = bytes(descriptor[5:18]).split(b"\n", 1)[0]
+    return text.decode("cp437", errors="replace").strip()
+
+
+def _decode_detailed_timing(descriptor: memoryview) -> Timing:
+    """
+    Decodes an 18 byte detailed timing descriptor, None for display descriptors.
+    """
+    pixel_clock = descriptor[0] | descriptor[1] << 8
+    if pixel_clock == 0:
+        return None
+
+    width = descriptor[2] | (descriptor[4] & 0xF0) << 4
+    h_blank = descriptor[3] | (descriptor[4] & 0x0F) << 8
+    height = descriptor[5] | (descriptor[7] & 0xF0) << 4
+    v_blank = descriptor[6] | (descriptor[7] & 0x0F) << 8
+    width_mm = descriptor[12] | (descriptor[14] & 0xF0) << 4
+    height_mm = descriptor[13] | (descriptor[14] & 0x0F) << 8
+
+    total = (width + h_blank) * (height + v_blank)
+    refresh_rate = round(pixel_clock * 10000 / total, 2) if total else None
+    size_mm = (width_mm, height_mm) if width_mm and height_mm else None
+
+    return Timing(width, height, refresh_rate, size_mm)
+
+
+def _decode_cea_extension(block: memoryview, timings: list):
+    dtd_offset = block[2]
+    if dtd_offset < 4:
+        return
+
+    for offset in range(dtd_offset, BLOCK_SIZE - _DESCRIPTOR_SIZE, _DESCRIPTOR_SIZE):
+        timing = _decode_detailed_timing(block[offset : offset + _DESCRIPTOR_SIZE])
+        if timing is None:
+            break
+        timings.append(timing)
+
+
+def _decode_displayid_extension(block: memoryview, timings: list):
+    # The section header follows the extension tag: version, length, type, count
+    section_length = block[2]
+    offset = 5
+    end = min(offset + section_length, BLOCK_SIZE - 1)
+
+    while offset + 3 <= end:
+        tag, length = block[offset], block[offset + 2]
+        payload = block[offset + 3 : offset + 3 + length]
+        offset += 3 + length
+
+        if tag == _DISPLAYID_TIMING_I:
+            unit = 10000
+        elif tag == _DISPLAYID_TIMING_VII:
+            unit = 1000
+        else:
+            continue
+
+        for start in range(0, len(payload) - _DISPLAYID_TIMING_SIZE + 1, 20):
+            timing = payload[start : start + _DISPLAYID_TIMING_SIZE]
+            pixel_clock = (timing[0] | timing[1] << 8 | timing[2] << 16) + 1
+            width = (timing[4] | timing[5] << 8) + 1
+            h_blank = (timing[6] | timing[7] << 8) + 1
+            height = (timing[12] | timing[13] << 8) + 1
+            v_blank = (timing[14] | timing[15] << 8) + 1
+            total = (width + h_blank) * (height + v_blank)
+            timings.append(
+                Timing(width, height, round(pixel_clock * unit / total, 2), None)
+            )
+
+
+@lru_cache(maxsize=64)
+def decode_edid(data: bytes) -> EdidInfo:
+    """
+    Decodes an EDID including its CEA-861 and DisplayID extension blocks.
+    Results are memoized by content, identical monitors are decoded once.
+
+    Raises:
+        EdidError: if the base block is truncated, has an invalid header or a
+            checksum mismatch. Broken extension blocks are skipped.
+    """
+    view = memoryview(data)
+    if len(view) < BLOCK_SIZE:
+        raise EdidError("Wrong edid size.")
+
+    base = view[:BLOCK_SIZE]
+    if not _checksum_ok(base):
+        raise EdidError("Checksum mismatch.")
+
+    (
+        header,
+        manufacturer,
+        product_id,
+        serial_number,
+        week,
+        year,
+        version,
+        revision,
+        _input_type,
+        width_cm,
+        height_cm,
+        _gamma,
+        _features,
+        extension_count,
+        _checksum,
+    ) = _BASE_BLOCK.unpack_from(base)
+
+    if header != EDID_HEADER:
+        raise EdidError("Invalid header.")
 
-def parse_edid(edid: bytes) -> Tuple[str, str]:
     model = ""
     serial = ""
+    vertical_range = None
+    timings = []
+
+    for offset in _DESCRIPTOR_OFFSETS:
+        descriptor = base[offset : offset + _DESCRIPTOR_SIZE]
+        timing = _decode_detailed_timing(descriptor)
+        if timing is not None:
+            timings.append(timing)
+            continue
+
+        tag = descriptor[3]
+        if tag == _DESCRIPTOR_NAME and not model:
+            model = _decode_text(descriptor)
+        elif tag == _DESCRIPTOR_SERIAL and not serial:
+            serial = _decode_text(descriptor)
+        elif tag == _DESCRIPTOR_RANGE_LIMITS:
+            # EDID 1.4 offset flags add 255 Hz to the vertical limits
+            minimum = descriptor[5] + (255 if descriptor[4] & 0x01 else 0)
+            maximum = descriptor[6] + (255 if descriptor[4] & 0x02 else 0)
+            vertical_range = (minimum, maximum)
+
+    extensions = []
+    for index in range(1, extension_count + 1):
+        block = view[index * BLOCK_SIZE : (index + 1) * BLOCK_SIZE]
+        if len(block) < BLOCK_SIZE or not _checksum_ok(block):
+            continue
+
+        if block[0] == CEA_EXTENSION_TAG:
+            _decode_cea_extension(block, timings)
+        elif block[0] == DISPLAYID_EXTENSION_TAG:
+            _decode_displayid_extension(block, timings)
+        else:
+            continue
+        extensions.append(block[0])
+
+    preferred = timings[0] if timings else None
+    if preferred is not None and preferred.size_mm:
+        size_mm = preferred.size_mm
+    elif width_cm and height_cm:
+        size_mm = (width_cm * 10, height_cm * 10)
+    else:
+        size_mm = None
 
-    if struct.calcsize(_STRUCT_FORMAT) != 128:
-        raise ValueError("Wrong edid size.")
+    return EdidInfo(
+        manufacturer=_decode_pnp_id(manufacturer),
+        product_id=product_id,
+        serial_number=serial_number,
+        model=model,
+        serial=serial,
+        year=year + 1990 if year else None,
+        week=week if 1 <= week <= 54 else None,
+        version="{0}.{1}".format(version, revision),
+        native_resolution=(preferred.width, preferred.height) if preferred else None,
+        refresh_rates=tuple(
+            sorted({timing.refresh_rate for timing in timings if timing.refresh_rate})
+        ),
+        vertical_range=vertical_range,
+        size_mm=size_mm,
+        extensions=tuple(extensions),
+    )
 
-    if sum(map(int, edid)) % 256 != 0:
-        raise ValueError("Checksum mismatch.")
 
-    unpacked = struct.unpack(_STRUCT_FORMAT, edid)
-    raw_edid = _RawEdid(*unpacked)
+def parse_edid(edid: bytes) -> Tuple[str, str]:
+    """
+    Returns model and serial of an EDID.
+
+    Raises:
+        EdidError: see decode_edid()
+    """
+    info = decode_edid(bytes(edid))
+    return info.model, info.serial
+
+
+def read_connector(path: str) -> EdidInfo:
+    """
+    Reads the EDID of a DRM connector directory. The status is checked first,
+    so disconnected connectors are skipped without reading their EDID. Returns
+    None for connectors without monitor or with an invalid EDID.
+    """
+    try:
+        with open(os.path.join(path, "status")) as file:
+            if file.read().strip() != "connected":
+                return None
+
+        with open(os.path.join(path, "edid"), "rb") as file:
+            data = file.read()
+    except OSError:
+        return None
+
+    try:
+        return decode_edid(data)
+    except EdidError:
+        return None
+
 
-    if raw_edid.header != b"\x00\xff\xff\xff\xff\xff\xff\x00":
-        raise ValueError("Invalid header.")
+def get_connector_path(connector: str) -> str:
+    return os.path.join(sysroot.path(DRM_CLASS_DIR), connector)
 
-    if raw_edid.description_2[3] == 0xFC:
-        model = str(raw_edid.description_2[5:17].decode()).strip()
-    elif raw_edid.description_3[3] == 0xFC:
-        model = str(raw_edid.description_3[5:17].decode()).strip()
-    elif raw_edid.description_4[3] == 0xFC:
-        model = str(raw_edid.description_4[5:17].decode()).strip()
 
-    if raw_edid.description_2[3] == 0xFF:
-        serial = str(raw_edid.description_2[5:17].decode()).strip()
-    elif raw_edid.description_3[3] == 0xFF:
-        serial = str(raw_edid.description_3[5:17].decode()).strip()
-    elif raw_edid.description_4[3] == 0xFF:
-        serial = str(raw_edid.description_4[5:17].decode()).strip()
+def list_connectors(card: str = "card*") -> list:
+    """
+    Returns the sorted connector names of one or all cards, e.g. ["card0-DP-1"].
+    """
+    pattern = os.path.join(sysroot.path(DRM_CLASS_DIR), card + "-*")
+    return sorted(os.path.basename(path) for path in glob.glob(pattern))
 
-    return model, serial
+
+def find_connector(card: str, connector_id: str) -> str:
+    """
+    Returns the name of the connector with the given DRM object id (as sent
+    in hotplug uevents), or None if the kernel does not expose connector_id.
+    """
+    for connector in list_connectors(card):
+        path = os.path.join(get_connector_path(connector), "connector_id")
+        try:
+            with open(path) as file:
+                if file.read().strip() == connector_id:
+                    return connector
+        except OSError:
+            continue
+    return None
+
+
+def iter_connectors():
+    """
+    Yields (connector name, EdidInfo) for every connected monitor with a
+    valid EDID, e.g. ("card0-DP-1", EdidInfo(...)).
+    """
+    for connector in list_connectors():
+        info = read_connector(get_connector_path(connector))
+        if info is not None:
+            yield connector, info
+
+
+def iter_edid_sysfs():
+    """
+    Yields (model, serial) for every monitor as soon as its EDID has been parsed.
+    """
+    for _connector, info in iter_connectors():
+        yield info.model or _("Unknown"), info.serial or _("Unknown")
 
 
 def get_edid_sysfs():
-    monitor_data = []
-
-    for filename in glob.glob("/sys/class/drm/**/edid", recursive=False):
-        with open(filename, "rb") as file:
-            try:
-                data = file.read(128)
-                model, serial = parse_edid(data)
-                if len(model) > 0:
-                    monitor_model = model
-                else:
-                    monitor_model = _("Unknown")
-
-                if len(serial) > 0:
-                    monitor_serial = serial
-                else:
-                    monitor_serial = _("Unknown")
-
-                monitor_data.append((monitor_model, monitor_serial))
-            except struct.error:
-                pass
-
-    return monitor_data
+    return list(iter_edid_sysfs())
+
+
+def clear_caches():
+    decode_edid.cache_clear()
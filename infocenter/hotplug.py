@@ -0,0 +1,89 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+import os
+import re
+
+from gi.repository import GLib
+
+from infocenter import edid
+from infocenter.netlink import UeventMonitor
+
+_CARD = re.compile(r"card\d+$")
+_CONNECTOR = re.compile(r"card\d+-.+$")
+
+
+def get_affected_connectors(properties: dict):
+    """
+    Maps the properties of a DRM uevent to the connectors it concerns.
+
+    Returns:
+        set: connector names, an empty set if the event concerns no connector
+            (e.g. render nodes) or None if every connector has to be re-read
+    """
+    name = os.path.basename(properties.get("DEVPATH", ""))
+
+    # Connectors that come and go themselves, e.g. DisplayPort MST
+    if _CONNECTOR.match(name):
+        return {name}
+
+    if not _CARD.match(name):
+        return None if "DEVPATH" not in properties else set()
+
+    if properties.get("ACTION") != "change":
+        return None
+
+    connector_id = properties.get("CONNECTOR")
+    if connector_id:
+        connector = edid.find_connector(name, connector_id)
+        if connector is not None:
+            return {connector}
+
+    # Older kernels and some drivers only say that something on the card changed
+    return set(edid.list_connectors(name))
+
+
+class DrmHotplugMonitor:
+    """
+    Reports which DRM connectors changed when monitors are plugged in or out.
+
+    Bursts of uevents (a docking station raises one per connector) are
+    coalesced. The callback is invoked as callback(connectors) with a set of
+    connector names, or with None if all connectors have to be re-read.
+    """
+
+    DEBOUNCE_MS = 250
+
+    def __init__(self, callback):
+        self._callback = callback
+        self._monitor = UeventMonitor("drm", self._on_uevent)
+        self._source_id = 0
+        self._connectors = set()
+
+    def start(self):
+        """
+        Raises:
+            OSError: if netlink is not available (e.g. inside some sandboxes)
+        """
+        self._monitor.start()
+
+    def stop(self):
+        self._monitor.stop()
+        if self._source_id:
+            GLib.source_remove(self._source_id)
+            self._source_id = 0
+
+    def _on_uevent(self, properties):
+        connectors = get_affected_connectors(properties)
+        if connectors is None:
+            self._connectors = None
+        elif self._connectors is not None:
+            self._connectors |= connectors
+
+        if self._connectors != set() and not self._source_id:
+            self._source_id = GLib.timeout_add(self.DEBOUNCE_MS, self._on_timeout)
+
+    def _on_timeout(self):
+        self._source_id = 0
+        connectors, self._connectors = self._connectors, set()
+        self._callback(connectors)
+        return GLib.SOURCE_REMOVE
@@ -0,0 +1,214 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+
+# Upper bound for response bodies, a PAC file is a few kilobytes at most
+_MAX_BODY_SIZE = 1024 * 1024
+_MAX_HEADER_SIZE = 64 * 1024
+
+
+@dataclass
+class ProbeResult:
+    """
+    Outcome of a single HTTP probe. Timings are in seconds and None if the
+    corresponding stage was not reached.
+    """
+
+    connected: bool = False
+    connect_latency: float = None
+    time_to_first_byte: float = None
+    status: int = None
+    headers: dict = field(default_factory=dict)
+    body: bytes = b""
+    error: str = None
+
+    @property
+    def body_size(self) -> int:
+        return len(self.body)
+
+    @property
+    def ok(self) -> bool:
+        return self.status == 200 and self.body_size > 0
+
+
+class HttpError(Exception):
+    pass
+
+
+async def probe(
+    ip: str,
+    port: int,
+    path: str = "/",
+    connect_timeout: float = 2.0,
+    read_timeout: float = 5.0,
+    headers: dict = None,
+) -> ProbeResult:
+    """
+    Connects once to ip:port and issues a GET request for path over the same
+    connection.
+
+    Args:
+        ip (str): Address of the HTTP server
+        port (int): Port of the HTTP server
+        path (str, optional): Requested path. Defaults to "/".
+        connect_timeout (float, optional): Defaults to 2 seconds.
+        read_timeout (float, optional): Timeout for the whole response. Defaults
+            to 5 seconds.
+        headers (dict, optional): Additional request headers
+
+    Returns:
+        ProbeResult: Connection and response details. Errors are reported in
+            ProbeResult.error instead of being raised.
+    """
+    result = ProbeResult()
+
+    start = time.monotonic()
+    try:
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(ip, port), connect_timeout
+        )
+    except (OSError, asyncio.TimeoutError) as error:
+        result.error = str(error) or type(error).__name__
+        return result
+
+    result.connected = True
+    result.connect_latency = time.monotonic() - start
+
+    try:
+        sent = time.monotonic()
+        writer.write(build_request(ip, port, path, headers, keep_alive=False))
+        await writer.drain()
+
+        response = await asyncio.wait_for(read_response(reader), read_timeout)
+        result.time_to_first_byte = response.first_byte - sent
+        result.status = response.status
+        result.headers = response.headers
+        result.body = response.body
+    except (
+        OSError,
+        asyncio.TimeoutError,
+        asyncio.IncompleteReadError,
+        asyncio.LimitOverrunError,
+        HttpError,
+    ) as error:
+        result.error = str(error) or type(error).__name__
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+
+    return result
+
+
+def run_probe(*args, **kwargs) -> ProbeResult:
+    """
+    Blocking wrapper around probe() for use in worker threads.
+    """
+    return asyncio.run(probe(*args, **kwargs))
+
+
+def build_request(
+    ip: str, port: int, path: str, headers: dict = None, keep_alive: bool = False
+) -> bytes:
+    lines = [
+        "GET {0} HTTP/1.1".format(path),
+        "Host: {0}:{1}".format(ip, port),
+        "User-Agent: infocenter",
+        "Accept: */*",
+        "Connection: {0}".format("keep-alive" if keep_alive else "close"),
+    ]
+    for key, value in (headers or {}).items():
+        lines.append("{0}: {1}".format(key, value))
+
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+
+@dataclass
+class Response:
+    status: int
+    headers: dict
+    body: bytes
+    first_byte: float
+
+
+async def read_response(reader: asyncio.StreamReader) -> Response:
+    """
+    Reads a single HTTP/1.x response. Header names are lower-cased.
+    """
+    first = await reader.read(1)
+    if not first:
+        raise HttpError("Connection closed without response")
+    first_byte = time.monotonic()
+
+    try:
+        head = first + await reader.readuntil(b"\r\n\r\n")
+    except asyncio.LimitOverrunError as error:
+        raise HttpError("Response header too large") from error
+    except asyncio.IncompleteReadError as error:
+        raise HttpError("Incomplete response header") from error
+
+    if len(head) > _MAX_HEADER_SIZE:
+        raise HttpError("Response header too large")
+
+    status_line, *header_lines = head.decode("latin-1").split("\r\n")
+    try:
+        _version, status, *_reason = status_line.split(" ", 2)
+        status = int(status)
+    except ValueError as error:
+        raise HttpError("Malformed status line") from error
+
+    headers = {}
+    for line in header_lines:
+        if ":" in line:
+            key, value = line.split(":", 1)
+            headers[key.strip().lower()] = value.strip()
+
+    if status in (204, 304) or 100 <= status < 200:
+        body = b""
+    elif "chunked" in headers.get("transfer-encoding", "").lower():
+        body = await _read_chunked(reader)
+    elif "content-length" in headers:
+        try:
+            length = int(headers["content-length"])
+        except ValueError as error:
+            raise HttpError("Malformed Content-Length") from error
+        if length > _MAX_BODY_SIZE:
+            raise HttpError("Response body too large")
+        body = await reader.readexactly(length)
+    else:
+        body = await reader.read(_MAX_BODY_SIZE + 1)
+        while len(body) <= _MAX_BODY_SIZE:
+            data = await reader.read(_MAX_BODY_SIZE + 1 - len(body))
+            if not data:
+                break
+            body += data
+        if len(body) > _MAX_BODY_SIZE:
+            raise HttpError("Response body too large")
+
+    return Response(status, headers, body, first_byte)
+
+
+async def _read_chunked(reader: asyncio.StreamReader) -> bytes:
+    body = bytearray()
+    while True:
+        size_line = await reader.readuntil(b"\r\n")
+        try:
+            size = int(size_line.split(b";", 1)[0].strip(), 16)
+        except ValueError as error:
+            raise HttpError("Malformed chunk size") from error
+
+        if size == 0:
+            # Skip optional trailers
+            while (await reader.readuntil(b"\r\n")) != b"\r\n":
+                pass
+            return bytes(body)
+
+        if len(body) + size > _MAX_BODY_SIZE:
+            raise HttpError("Response body too large")
+
+        body += await reader.readexactly(size)
+        await reader.readexactly(2)
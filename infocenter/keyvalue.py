@@ -0,0 +1,129 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+import os
+import threading
+from types import MappingProxyType
+
+# Memo cache: path -> ((st_mtime_ns, st_ino), value)
+_cache = {}
+_cache_lock = threading.Lock()
+
+_DOUBLE_QUOTE_ESCAPES = '"\\$`'
+
+
+def unquote(value: str) -> str:
+    """
+    Removes shell quoting from a value as specified by os-release(5): single
+    and double quotes, and backslash escapes of shell special characters.
+    """
+    result = []
+    quote = None
+    index = 0
+    length = len(value)
+
+    while index < length:
+        char = value[index]
+        if quote is None:
+            if char in "\"'":
+                quote = char
+            elif char == "\\" and index + 1 < length:
+                index += 1
+                result.append(value[index])
+            else:
+                result.append(char)
+        elif char == quote:
+            quote = None
+        elif (
+            char == "\\"
+            and quote == '"'
+            and index + 1 < length
+            and value[index + 1] in _DOUBLE_QUOTE_ESCAPES
+        ):
+            index += 1
+            result.append(value[index])
+        else:
+            result.append(char)
+        index += 1
+
+    return "".join(result)
+
+
+def parse(text: str) -> dict:
+    """
+    Parses KEY=value lines (os-release, machine-info). Values may contain "=",
+    comments and lines without assignment are ignored.
+    """
+    values = {}
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+
+        key, separator, value = line.partition("=")
+        key = key.strip()
+        if separator and key:
+            values[key] = unquote(value.strip())
+    return values
+
+
+def _cached(path: str, loader):
+    """
+    Returns loader(path), re-running it only if the file's mtime or inode
+    changed since the last call.
+
+    Raises:
+        OSError: if the file cannot be accessed
+    """
+    stat = os.stat(path)
+    key = (stat.st_mtime_ns, stat.st_ino)
+
+    with _cache_lock:
+        entry = _cache.get(path)
+    if entry is not None and entry[0] == key:
+        return entry[1]
+
+    value = loader(path)
+    with _cache_lock:
+        _cache[path] = (key, value)
+    return value
+
+
+def _load_env(path: str):
+    with open(path) as file:
+        return MappingProxyType(parse(file.read()))
+
+
+def _load_text(path: str) -> str:
+    with open(path, errors="replace") as file:
+        return file.read().strip()
+
+
+def read_env_file(path: str):
+    """
+    Returns the parsed KEY=value pairs of a file as read-only mapping, or an
+    empty mapping if the file does not exist or is unreadable.
+    """
+    try:
+        return _cached(path, _load_env)
+    except OSError:
+        return MappingProxyType({})
+
+
+def read_attributes(directory: str, names) -> dict:
+    """
+    Reads a batch of single-value attribute files (e.g. DMI in sysfs). Errors
+    are isolated per attribute: an unreadable attribute (some are root-only)
+    maps to None without affecting the others.
+    """
+    attributes = {}
+    for name in names:
+        try:
+            attributes[name] = _cached(os.path.join(directory, name), _load_text)
+        except OSError:
+            attributes[name] = None
+    return attributes
+
+
+def clear_caches():
+    with _cache_lock:
+        _cache.clear()
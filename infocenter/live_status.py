@@ -0,0 +1,86 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+from gi.repository import Gio, GLib
+
+
+class RecheckScheduler:
+    """
+    Re-runs a check in reaction to network changes instead of polling.
+
+    Bursts of Gio.NetworkMonitor::network-changed signals are debounced into a
+    single run. A failed run is retried with exponential backoff for a limited
+    number of attempts, after that only the next network change triggers a
+    new run. The check is started as run() and must report back via finished().
+    """
+
+    DEBOUNCE_MS = 1000
+    BACKOFF_INITIAL_MS = 2000
+    BACKOFF_MAX_MS = 120000
+    MAX_RETRIES = 6
+
+    def __init__(self, run, network_monitor: Gio.NetworkMonitor = None):
+        self._run = run
+        self._monitor = network_monitor or Gio.NetworkMonitor.get_default()
+        self._handler_id = 0
+        self._source_id = 0
+        self._running = False
+        self._pending = False
+        self._retries = 0
+
+    def start(self):
+        self._handler_id = self._monitor.connect(
+            "network-changed", self._on_network_changed
+        )
+
+    def stop(self):
+        if self._handler_id:
+            self._monitor.disconnect(self._handler_id)
+            self._handler_id = 0
+        self._cancel_timeout()
+
+    def trigger(self):
+        """
+        Schedules a debounced run, e.g. after a related service came up.
+        """
+        self._retries = 0
+        self._schedule(self.DEBOUNCE_MS)
+
+    def run_now(self):
+        self._cancel_timeout()
+
+        if self._running:
+            self._pending = True
+        else:
+            self._running = True
+            self._run()
+
+    def finished(self, success: bool):
+        self._running = False
+
+        if self._pending:
+            # Something changed while the check was running, start over
+            self._pending = False
+            self.trigger()
+        elif success:
+            self._retries = 0
+        elif self._retries < self.MAX_RETRIES:
+            delay = min(self.BACKOFF_INITIAL_MS * 2**self._retries, self.BACKOFF_MAX_MS)
+            self._retries += 1
+            self._schedule(delay)
+
+    def _on_network_changed(self, _monitor, _available):
+        self.trigger()
+
+    def _schedule(self, delay_ms: int):
+        self._cancel_timeout()
+        self._source_id = GLib.timeout_add(delay_ms, self._on_timeout)
+
+    def _cancel_timeout(self):
+        if self._source_id:
+            GLib.source_remove(self._source_id)
+            self._source_id = 0
+
+    def _on_timeout(self):
+        self._source_id = 0
+        self.run_now()
+        return GLib.SOURCE_REMOVE
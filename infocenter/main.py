@@ -1,6 +1,5 @@
 # SPDX-License-Identifier: GPL-2.0-or-later
 
-from pathlib import Path
 import sys
 import gi
 
@@ -10,6 +9,9 @@ gi.require_version("Adw", "1")
 
 from gi.repository import Adw, Gio, Gtk, GLib  # noqa E402
 
+from infocenter import autostart, checks, content, resources, trace  # noqa E402
+from infocenter.content import ContentError  # noqa E402
+from infocenter.service import InfoCache, InfoService  # noqa E402
 from infocenter.window import Window  # noqa E402
 
 
@@ -22,8 +24,22 @@ class Application(Adw.Application):
             flags=Gio.ApplicationFlags.HANDLES_COMMAND_LINE,
         )
         self.autostart = False
+        # Filled by the window, served on D-Bus
+        self.info_cache = InfoCache()
+        self.info_service = InfoService(self.info_cache, self.load_check_registry)
+        # Content bundles per language, enumerated once
+        self.content_index = resources.ResourceIndex(
+            "/de/volkswagen/infocenter/content", ".json"
+        )
         self.create_action("quit", lambda *_: self.quit(), ["<primary>q"])
         self.create_action("about", self.on_about_action)
+
+        # Content language, "" follows the environment
+        language_action = Gio.SimpleAction.new_stateful(
+            "language", GLib.VariantType.new("s"), GLib.Variant("s", "")
+        )
+        language_action.connect("change-state", self.on_language_changed)
+        self.add_action(language_action)
         self.add_main_option(
             "autostart",
             ord("a"),
@@ -33,23 +49,29 @@ class Application(Adw.Application):
             None,
         )
 
+    def do_dbus_register(self, connection, object_path):
+        if not Adw.Application.do_dbus_register(self, connection, object_path):
+            return False
+
+        try:
+            self.info_service.register(connection, object_path)
+        except GLib.Error as error:
+            print("Cannot export the info service: " + error.message)
+        return True
+
+    def do_dbus_unregister(self, connection, object_path):
+        self.info_service.unregister()
+        Adw.Application.do_dbus_unregister(self, connection, object_path)
+
     def do_activate(self):
         """Called when the application is activated.
 
         We raise the application's main window, creating it if
         necessary.
         """
-        info_center_dir = Path.joinpath(Path.home(), ".config/infocenter")
-        info_center_dir.mkdir(parents=True, exist_ok=True)
-
-        if self.autostart:
-            do_not_start_file = Path.joinpath(
-                Path.home(), ".config/infocenter/do_not_start_file"
-            )
-
-            if Path(do_not_start_file).exists():
-                print("do_not_start file present, exit.")
-                return
+        if self.autostart and autostart.is_disabled():
+            print("do_not_start file present, exit.")
+            return
 
         win = self.props.active_window
         if not win:
@@ -57,6 +79,32 @@ class Application(Adw.Application):
 
         win.present()
 
+    def load_content(self, languages) -> dict:
+        """
+        Loads the precompiled content bundle of the first available language
+        of the fallback chain (e.g. de_AT, de, en). Falls back to parsing the
+        loose YAML files for development builds without a bundle.
+        """
+        lang = self.content_index.resolve(languages)
+        if lang is not None:
+            with trace.span("content.load_bundle", "content", lang=lang):
+                return content.load_bundle(self.content_index.lookup(lang).get_data())
+
+        with trace.span("content.load_yaml_dir", "content"):
+            return content.load_yaml_dir(languages)
+
+    def load_check_registry(self) -> checks.CheckRegistry:
+        """
+        Loads the checks of checks.yaml for the info service, which runs them
+        while no window is open.
+        """
+        try:
+            data = self.load_content(resources.get_language_chain()).get("checks")
+            return checks.load_registry(data)
+        except ContentError as error:
+            print("Invalid checks: {0}".format(error))
+            return checks.load_registry([])
+
     def on_about_action(self, widget, _):
         """Invoked when we click "about" in the main menu."""
         builder = Gtk.Builder.new_from_resource(
@@ -65,6 +113,18 @@ class Application(Adw.Application):
         about_dialog = builder.get_object("about_dialog")
         about_dialog.present(self.props.active_window)
 
+    def on_language_changed(self, action, value):
+        action.set_state(value)
+        language = value.get_string()
+        if language:
+            languages = resources.get_language_chain({"LANG": language})
+        else:
+            languages = resources.get_language_chain()
+
+        win = self.props.active_window
+        if win:
+            win.set_languages(languages)
+
     def create_action(self, name, callback, shortcuts=None):
         """Add an application action.
 
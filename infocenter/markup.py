@@ -0,0 +1,142 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+"""
+Renders the plain text of the content files (e.g. disclaimers) as Pango
+markup in a single pass: special characters are escaped, URLs linkified and
+a small subset of formatting is supported:
+
+- paragraphs are separated by blank lines, lines within are joined
+- lines starting with "- ", "* " or "1. " are list items
+- **bold**
+"""
+
+import re
+from functools import lru_cache
+
+_ESCAPES = str.maketrans(
+    {"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#39;"}
+)
+
+# "*" ends a URL, so "**see https://example.com**" closes the bold text
+_INLINE = re.compile(
+    r"(?P<url>(?:https?://|www\.)[^\s<>\"'*]+)"
+    r"|(?P<bold>\*\*)"
+)
+# At most two digits, so "2024. The year" stays a paragraph
+_LIST_ITEM = re.compile(r"(?:[-*•]|(\d{1,2})[.)])\s+(.*)")
+
+# Punctuation ending a sentence is not part of a trailing URL
+_URL_TRAILING = ".,;:!?"
+
+BULLET = "•"
+
+
+def escape(text: str) -> str:
+    return text.translate(_ESCAPES)
+
+
+def _split_url(url: str):
+    """
+    Returns (url, trailing text), e.g. a full stop after the URL or the
+    closing parenthesis of "(see https://example.com)".
+    """
+    end = len(url)
+    while end > 0:
+        char = url[end - 1]
+        if char in _URL_TRAILING:
+            end -= 1
+        elif char == ")" and url.count("(", 0, end) < url.count(")", 0, end):
+            end -= 1
+        else:
+            break
+    return url[:end], url[end:]
+
+
+def _render_inline(text: str) -> str:
+    parts = []
+    position = 0
+    # Index of the open <b> in parts, None outside bold text
+    bold = None
+
+    def close_bold():
+        # Empty spans are dropped, e.g. of a ** at the end of the text
+        if any(parts[bold + 1 :]):
+            parts.append("</b>")
+        else:
+            del parts[bold:]
+
+    for match in _INLINE.finditer(text):
+        parts.append(escape(text[position : match.start()]))
+        position = match.end()
+
+        if match.lastgroup == "bold":
+            if bold is None:
+                bold = len(parts)
+                parts.append("<b>")
+            else:
+                close_bold()
+                bold = None
+            continue
+
+        url, trailing = _split_url(match.group())
+        if not url.startswith("http"):
+            href = "https://" + url
+        else:
+            href = url
+        parts.append('<a href="{0}">{1}</a>'.format(escape(href), escape(url)))
+        parts.append(escape(trailing))
+
+    parts.append(escape(text[position:]))
+    if bold is not None:
+        # An unterminated ** ends with its paragraph
+        close_bold()
+    return "".join(parts)
+
+
+@lru_cache(maxsize=64)
+def render(text: str) -> str:
+    """
+    Returns the Pango markup of a plain text. Results are memoized by
+    content, re-rendering the same text (e.g. on a language switch back) is
+    free.
+    """
+    blocks = []
+    paragraph = []
+    items = []
+
+    def flush_paragraph():
+        if paragraph:
+            blocks.append(_render_inline(" ".join(paragraph)))
+            paragraph.clear()
+
+    def flush_items():
+        if items:
+            blocks.append("\n".join(items))
+            items.clear()
+
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            flush_paragraph()
+            flush_items()
+            continue
+
+        item = _LIST_ITEM.match(line)
+        if item is not None:
+            flush_paragraph()
+            marker = item.group(1) + "." if item.group(1) else BULLET
+            items.append("  {0} {1}".format(marker, _render_inline(item.group(2))))
+        elif items and not paragraph and line[0].islower():
+            # Continuation of a wrapped list item
+            items[-1] += " " + _render_inline(line)
+        else:
+            flush_items()
+            paragraph.append(line)
+
+    flush_paragraph()
+    flush_items()
+    return "\n\n".join(blocks)
+
+
+def clear_caches():
+    render.cache_clear()
@@ -0,0 +1,38 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+"""
+List items of the content sections. The window keeps them in Gio.ListStore
+models, which are rendered by list views and refilled in place on reload.
+"""
+
+from gi.repository import GObject
+
+
+class QuickLinkItem(GObject.Object):
+    __gtype_name__ = "QuickLinkItem"
+
+    title = GObject.Property(type=str, default="")
+    icon = GObject.Property(type=str, default="")
+    uri = GObject.Property(type=str, default="")
+
+
+class DisclaimerItem(GObject.Object):
+    __gtype_name__ = "DisclaimerItem"
+
+    title = GObject.Property(type=str, default="")
+    body = GObject.Property(type=str, default="")
+
+
+class ClientItem(GObject.Object):
+    __gtype_name__ = "ClientItem"
+
+    label = GObject.Property(type=str, default="")
+    value = GObject.Property(type=str, default="")
+
+
+def replace_all(store, items):
+    """
+    Replaces the content of a Gio.ListStore with a single items-changed
+    emission.
+    """
+    store.splice(0, store.get_n_items(), items)
@@ -0,0 +1,254 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+import socket
+import struct
+
+from gi.repository import GLib
+
+# rtnetlink constants, see linux/netlink.h and linux/rtnetlink.h
+NETLINK_ROUTE = 0
+NETLINK_KOBJECT_UEVENT = 15
+UEVENT_GROUP_KERNEL = 0x1
+RTMGRP_LINK = 0x1
+RTM_NEWLINK = 16
+RTM_DELLINK = 17
+RTM_GETLINK = 18
+NLMSG_ERROR = 2
+NLMSG_DONE = 3
+NLM_F_REQUEST = 0x1
+NLM_F_DUMP = 0x300
+IFLA_IFNAME = 3
+
+_NLMSGHDR = struct.Struct("=IHHII")
+_IFINFOMSG = struct.Struct("=BxHiII")
+_RTATTR = struct.Struct("=HH")
+
+_RECV_SIZE = 65536
+
+
+def _align(length: int) -> int:
+    return (length + 3) & ~3
+
+
+def parse_link_messages(data: bytes):
+    """
+    Yields (message type, interface index, interface name or None) for every
+    link message in a netlink datagram. The end of a dump is reported as
+    (NLMSG_DONE, 0, None).
+    """
+    offset = 0
+    while offset + _NLMSGHDR.size <= len(data):
+        length, msg_type, _flags, _seq, _pid = _NLMSGHDR.unpack_from(data, offset)
+        if length < _NLMSGHDR.size or offset + length > len(data):
+            return
+
+        if msg_type in (RTM_NEWLINK, RTM_DELLINK):
+            payload = offset + _NLMSGHDR.size
+            _family, _type, index, _flags, _change = _IFINFOMSG.unpack_from(
+                data, payload
+            )
+
+            name = None
+            attr = payload + _IFINFOMSG.size
+            end = offset + length
+            while attr + _RTATTR.size <= end:
+                attr_len, attr_type = _RTATTR.unpack_from(data, attr)
+                if attr_len < _RTATTR.size:
+                    break
+                if attr_type == IFLA_IFNAME:
+                    value = data[attr + _RTATTR.size : attr + attr_len]
+                    name = value.rstrip(b"\0").decode(errors="replace")
+                    break
+                attr += _align(attr_len)
+
+            yield msg_type, index, name
+        elif msg_type == NLMSG_DONE:
+            yield msg_type, 0, None
+
+        offset += _align(length)
+
+
+def parse_uevent(data: bytes) -> dict:
+    """
+    Parses a kernel uevent ("ACTION@DEVPATH\0KEY=value\0...") into a dict of
+    its properties. Returns None for anything else, e.g. udev's own messages.
+    """
+    header, _, body = data.partition(b"\0")
+    if b"@" not in header:
+        return None
+
+    properties = {}
+    for field in body.split(b"\0"):
+        key, separator, value = field.partition(b"=")
+        if separator:
+            properties[key.decode("ascii", "replace")] = value.decode(
+                "utf-8", "replace"
+            )
+    return properties
+
+
+def _open_socket(protocol: int, groups: int) -> socket.socket:
+    """
+    Raises:
+        OSError: if netlink is not available (e.g. inside some sandboxes)
+    """
+    sock = socket.socket(
+        socket.AF_NETLINK, socket.SOCK_RAW | socket.SOCK_NONBLOCK, protocol
+    )
+    try:
+        sock.bind((0, groups))
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+class LinkMonitor:
+    """
+    Keeps track of the network interface names via rtnetlink. The kernel
+    pushes link add/remove events, so nothing is polled.
+
+    The callback is invoked as callback(names) with the current set of
+    interface names, once after start() and again whenever it changes.
+    """
+
+    def __init__(self, callback):
+        self._callback = callback
+        self._links = {}
+        self._socket = None
+        self._watch_id = 0
+        self._dumping = False
+
+    def start(self):
+        """
+        Raises:
+            OSError: if netlink is not available (e.g. inside some sandboxes)
+        """
+        self._socket = _open_socket(NETLINK_ROUTE, RTMGRP_LINK)
+        try:
+            self._request_dump()
+        except OSError:
+            self._socket.close()
+            self._socket = None
+            raise
+
+        self._watch_id = GLib.io_add_watch(
+            self._socket.fileno(),
+            GLib.PRIORITY_DEFAULT,
+            GLib.IO_IN | GLib.IO_ERR | GLib.IO_HUP,
+            self._on_readable,
+        )
+
+    def stop(self):
+        if self._watch_id:
+            GLib.source_remove(self._watch_id)
+            self._watch_id = 0
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+
+    @property
+    def names(self) -> set:
+        return set(self._links.values())
+
+    def _request_dump(self):
+        payload = _IFINFOMSG.pack(socket.AF_UNSPEC, 0, 0, 0, 0)
+        header = _NLMSGHDR.pack(
+            _NLMSGHDR.size + len(payload),
+            RTM_GETLINK,
+            NLM_F_REQUEST | NLM_F_DUMP,
+            1,
+            0,
+        )
+        self._socket.send(header + payload)
+        self._dumping = True
+
+    def _on_readable(self, _fd, condition):
+        if condition & (GLib.IO_ERR | GLib.IO_HUP):
+            self._watch_id = 0
+            return GLib.SOURCE_REMOVE
+
+        before = self.names
+        while True:
+            try:
+                data = self._socket.recv(_RECV_SIZE)
+            except BlockingIOError:
+                break
+            except OSError:
+                # ENOBUFS: events were lost, start over with a full dump
+                self._links.clear()
+                self._request_dump()
+                break
+
+            for msg_type, index, name in parse_link_messages(data):
+                if msg_type == NLMSG_DONE:
+                    self._dumping = False
+                    # Always report the outcome of a (re-)dump
+                    before = None
+                elif msg_type == RTM_DELLINK:
+                    self._links.pop(index, None)
+                elif name is not None:
+                    self._links[index] = name
+
+        # Wait for the end of a dump instead of reporting partial results
+        names = self.names
+        if not self._dumping and names != before:
+            self._callback(names)
+
+        return GLib.SOURCE_CONTINUE
+
+
+class UeventMonitor:
+    """
+    Receives the kernel uevents of one subsystem (e.g. "drm") without going
+    through udev. The callback is invoked as callback(properties) for every
+    event, see parse_uevent().
+    """
+
+    def __init__(self, subsystem: str, callback):
+        self._subsystem = subsystem
+        self._callback = callback
+        self._socket = None
+        self._watch_id = 0
+
+    def start(self):
+        """
+        Raises:
+            OSError: if netlink is not available (e.g. inside some sandboxes)
+        """
+        self._socket = _open_socket(NETLINK_KOBJECT_UEVENT, UEVENT_GROUP_KERNEL)
+        self._watch_id = GLib.io_add_watch(
+            self._socket.fileno(),
+            GLib.PRIORITY_DEFAULT,
+            GLib.IO_IN | GLib.IO_ERR | GLib.IO_HUP,
+            self._on_readable,
+        )
+
+    def stop(self):
+        if self._watch_id:
+            GLib.source_remove(self._watch_id)
+            self._watch_id = 0
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+
+    def _on_readable(self, _fd, condition):
+        if condition & (GLib.IO_ERR | GLib.IO_HUP):
+            self._watch_id = 0
+            return GLib.SOURCE_REMOVE
+
+        while True:
+            try:
+                data = self._socket.recv(_RECV_SIZE)
+            except BlockingIOError:
+                break
+            except OSError:
+                # ENOBUFS: events were lost, report an event without details
+                self._callback({"SUBSYSTEM": self._subsystem})
+                break
+
+            properties = parse_uevent(data)
+            if properties and properties.get("SUBSYSTEM") == self._subsystem:
+                self._callback(properties)
+
+        return GLib.SOURCE_CONTINUE
@@ -0,0 +1,248 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+"""
+Conditional fetching of PAC files.
+
+The last body and its validators (ETag, Last-Modified, SHA-256) are kept in
+the cache directory. Re-checks send a conditional request over a kept-alive
+connection, so an unchanged PAC file costs a 304 instead of a transfer.
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+
+from infocenter import snapshot
+from infocenter.http_probe import HttpError, build_request, read_response
+
+CACHE_DIR_NAME = "pac"
+
+DEFAULT_TIMEOUT = 5.0
+
+_COMMENTS = re.compile(rb"/\*.*?\*/|//[^\n]*", re.DOTALL)
+_FIND_PROXY = re.compile(
+    rb"\bfunction\s+FindProxyForURL\s*\(|\bFindProxyForURL\s*=\s*function\b"
+)
+
+
+@dataclass
+class PacResult:
+    """
+    Outcome of a PAC fetch. changed_at is the time (seconds since the epoch)
+    the content was first seen with its current hash.
+    """
+
+    ok: bool = False
+    status: int = None
+    size: int = 0
+    changed: bool = False
+    changed_at: float = None
+    not_modified: bool = False
+    reused_connection: bool = False
+    time_to_first_byte: float = None
+    error: str = None
+
+
+def check_syntax(body: bytes) -> str:
+    """
+    Sanity check of a PAC file, not a JavaScript parser.
+
+    Returns:
+        str: the problem found, None if the file looks valid
+    """
+    code = _COMMENTS.sub(b"", body)
+    if not _FIND_PROXY.search(code):
+        return "FindProxyForURL is not defined"
+    if code.count(b"{") != code.count(b"}"):
+        return "Unbalanced braces"
+    return None
+
+
+class PacFetcher:
+    """
+    Fetches one PAC URL. Calls are serialized, the connection and its event
+    loop are kept between them, so any worker thread can re-check.
+    """
+
+    def __init__(self, host: str, port: int, path: str):
+        self.host = host
+        self.port = port
+        self.path = path
+        self._lock = threading.Lock()
+        self._loop = None
+        self._reader = None
+        self._writer = None
+        self._cache = None
+
+        key = hashlib.sha1("{0}:{1}{2}".format(host, port, path).encode())
+        self._cache_path = os.path.join(
+            snapshot.get_cache_dir(), CACHE_DIR_NAME, key.hexdigest() + ".json"
+        )
+
+    def _load_cache(self) -> dict:
+        if self._cache is None:
+            try:
+                with open(self._cache_path, "rb") as file:
+                    cache = json.load(file)
+                cache["body"] = base64.b64decode(cache["body"])
+            except (OSError, ValueError, KeyError, TypeError):
+                cache = {}
+            self._cache = cache
+        return self._cache
+
+    def _store_cache(self, cache: dict):
+        self._cache = cache
+        data = dict(cache, body=base64.b64encode(cache["body"]).decode())
+        snapshot.write_json(self._cache_path, data)
+
+    def fetch(self, timeout: float = DEFAULT_TIMEOUT):
+        """
+        Fetches the PAC file conditionally. Blocking.
+
+        Args:
+            timeout (float, optional): deadline in seconds for the whole
+                fetch, i.e. connect, request and a reconnect if needed
+
+        Returns:
+            PacResult: ok if the file was received (or is unchanged) and
+                passes check_syntax()
+        """
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+            return self._loop.run_until_complete(self._fetch(timeout))
+
+    async def _request(self, headers: dict):
+        """
+        Returns (response, reused). An idle connection closed by the server
+        is replaced once. Unbounded, the caller applies the deadline.
+        """
+        reused = self._writer is not None
+        while True:
+            if self._writer is None:
+                self._reader, self._writer = await asyncio.open_connection(
+                    self.host, self.port
+                )
+            try:
+                self._writer.write(
+                    build_request(
+                        self.host, self.port, self.path, headers, keep_alive=True
+                    )
+                )
+                await self._writer.drain()
+                response = await read_response(self._reader)
+            except (OSError, asyncio.IncompleteReadError, HttpError):
+                await self._close()
+                if not reused:
+                    raise
+                reused = False
+                continue
+
+            if not self._is_reusable(response):
+                await self._close()
+            return response, reused
+
+    @staticmethod
+    def _is_reusable(response) -> bool:
+        headers = response.headers
+        if headers.get("connection", "").lower() == "close":
+            return False
+        # Without a length the body ended with the connection
+        return (
+            response.status in (204, 304)
+            or "content-length" in headers
+            or "chunked" in headers.get("transfer-encoding", "").lower()
+        )
+
+    async def _close(self):
+        writer, self._reader, self._writer = self._writer, None, None
+        if writer is None:
+            return
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+
+    async def _fetch(self, timeout: float) -> PacResult:
+        result = PacResult()
+        cache = self._load_cache()
+
+        headers = {}
+        if cache.get("etag"):
+            headers["If-None-Match"] = cache["etag"]
+        if cache.get("last_modified"):
+            headers["If-Modified-Since"] = cache["last_modified"]
+
+        sent = time.monotonic()
+        try:
+            response, result.reused_connection = await asyncio.wait_for(
+                self._request(headers), timeout
+            )
+        except (
+            OSError,
+            asyncio.TimeoutError,
+            asyncio.IncompleteReadError,
+            asyncio.LimitOverrunError,
+            HttpError,
+        ) as error:
+            await self._close()
+            result.error = str(error) or type(error).__name__
+            return result
+
+        result.status = response.status
+        result.time_to_first_byte = response.first_byte - sent
+        if response.status == 304 and cache:
+            body = cache["body"]
+            result.not_modified = True
+        elif response.status == 200:
+            body = response.body
+        else:
+            result.error = "HTTP {0}".format(response.status)
+            return result
+
+        digest = hashlib.sha256(body).hexdigest()
+        now = time.time()
+        result.changed = bool(cache) and digest != cache.get("sha256")
+        if cache and not result.changed:
+            result.changed_at = cache.get("changed_at") or now
+        else:
+            result.changed_at = now
+        result.size = len(body)
+
+        if not result.not_modified:
+            self._store_cache(
+                {
+                    "etag": response.headers.get("etag"),
+                    "last_modified": response.headers.get("last-modified"),
+                    "sha256": digest,
+                    "changed_at": result.changed_at,
+                    "fetched_at": now,
+                    "body": body,
+                }
+            )
+
+        result.error = check_syntax(body)
+        result.ok = result.error is None and result.size > 0
+        return result
+
+
+_fetchers = {}
+_fetchers_lock = threading.Lock()
+
+
+def get_fetcher(host: str, port: int, path: str) -> PacFetcher:
+    """
+    Returns the shared fetcher of a PAC URL.
+    """
+    with _fetchers_lock:
+        fetcher = _fetchers.get((host, port, path))
+        if fetcher is None:
+            fetcher = _fetchers[(host, port, path)] = PacFetcher(host, port, path)
+    return fetcher
@@ -0,0 +1,203 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+"""
+Display devices from the PCI sysfs tree, named through pci.ids.
+"""
+
+import bisect
+import glob
+import mmap
+import os
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+
+from infocenter import sysroot
+
+PCI_DEVICES_DIR = "/sys/bus/pci/devices"
+PCI_IDS_PATHS = (
+    "/usr/share/hwdata/pci.ids",
+    "/usr/share/misc/pci.ids",
+    "/usr/share/pci.ids",
+)
+
+DISPLAY_CLASS = 0x03
+
+# Anchored on the newline instead of re.MULTILINE, which is several times
+# slower on a file of this size. pci.ids starts with a comment.
+_VENDOR_LINE = re.compile(rb"\n([0-9a-f]{4})  ")
+
+
+@dataclass
+class DisplayDevice:
+    slot: str  # e.g. "0000:03:00.0"
+    vendor_id: int
+    device_id: int
+    vendor: str = None  # from pci.ids
+    device: str = None
+    driver: str = None  # e.g. "amdgpu", None if unbound
+    vram: int = None  # bytes, None unless the driver reports it
+
+    @property
+    def name(self) -> str:
+        vendor = self.vendor or "{0:04x}".format(self.vendor_id)
+        device = self.device or "{0:04x}".format(self.device_id)
+        # Prefer the short name, e.g. "Advanced Micro Devices, Inc. [AMD/ATI]"
+        short = re.search(r"\[(.+)\]$", vendor)
+        return "{0} {1}".format(short.group(1) if short else vendor, device)
+
+
+class PciIds:
+    """
+    Name lookup in a pci.ids file.
+
+    The file is mapped into memory and the offsets of the vendor lines are
+    indexed once. A lookup is a binary search for the vendor followed by a
+    search within its block of device lines, without decoding the file.
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        # The vendor list ends where the device classes ("C xx") start
+        end = self._map.find(b"\nC ")
+        if end < 0:
+            end = len(self._map)
+
+        self._ids = []
+        self._offsets = []
+        for match in _VENDOR_LINE.finditer(self._map, 0, end):
+            self._ids.append(int(match.group(1), 16))
+            self._offsets.append(match.start() + 1)
+        self._offsets.append(end)
+
+        if self._ids != sorted(self._ids):
+            # Hand edited file, keep the index usable for bisect
+            order = sorted(range(len(self._ids)), key=self._ids.__getitem__)
+            ends = self._offsets[1:]
+            self._blocks = [(self._offsets[i], ends[i]) for i in order]
+            self._ids = [self._ids[i] for i in order]
+        else:
+            self._blocks = list(zip(self._offsets, self._offsets[1:]))
+
+    def _find_vendor(self, vendor_id: int):
+        index = bisect.bisect_left(self._ids, vendor_id)
+        if index == len(self._ids) or self._ids[index] != vendor_id:
+            return None
+        return self._blocks[index]
+
+    @staticmethod
+    def _line_name(line: bytes) -> str:
+        return line.split(b"  ", 1)[1].decode("utf-8", "replace").strip()
+
+    def lookup(self, vendor_id: int, device_id: int = None):
+        """
+        Returns (vendor name, device name), None for unknown ids.
+        """
+        block = self._find_vendor(vendor_id)
+        if block is None:
+            return None, None
+
+        start, end = block
+        line_end = self._map.find(b"\n", start, end)
+        vendor = self._line_name(self._map[start : line_end if line_end >= 0 else end])
+        if device_id is None:
+            return vendor, None
+
+        position = self._map.find(
+            "\n\t{0:04x}  ".format(device_id).encode(), start, end
+        )
+        if position < 0:
+            return vendor, None
+        line_end = self._map.find(b"\n", position + 1, end)
+        line = self._map[position + 1 : line_end if line_end >= 0 else end]
+        return vendor, self._line_name(line)
+
+    def close(self):
+        self._map.close()
+
+
+@lru_cache(maxsize=1)
+def get_pci_ids() -> PciIds:
+    """
+    Returns the index of the first installed pci.ids, None if there is none.
+    """
+    for path in PCI_IDS_PATHS:
+        try:
+            return PciIds(sysroot.path(path))
+        except (OSError, ValueError):
+            # ValueError: an empty file cannot be mapped
+            continue
+    return None
+
+
+def _read(path: str) -> str:
+    try:
+        with open(path) as file:
+            return file.read().strip()
+    except OSError:
+        return None
+
+
+def _read_vram(device_dir: str) -> int:
+    """
+    Returns the VRAM size reported by the driver (amdgpu), None otherwise.
+    The size of a memory BAR is no substitute, it depends on resizable BAR.
+    """
+    total = _read(os.path.join(device_dir, "mem_info_vram_total"))
+    if total and total.isdigit():
+        return int(total)
+    return None
+
+
+def read_display_device(device_dir: str) -> DisplayDevice:
+    """
+    Returns the display device of a PCI sysfs directory, None for other
+    device classes.
+    """
+    device_class = _read(os.path.join(device_dir, "class"))
+    try:
+        if device_class is None or int(device_class, 16) >> 16 != DISPLAY_CLASS:
+            return None
+        vendor_id = int(_read(os.path.join(device_dir, "vendor")), 16)
+        device_id = int(_read(os.path.join(device_dir, "device")), 16)
+    except (TypeError, ValueError):
+        return None
+
+    slot = os.path.basename(device_dir)
+    try:
+        driver = os.path.basename(os.readlink(os.path.join(device_dir, "driver")))
+    except OSError:
+        driver = None
+
+    device = DisplayDevice(
+        slot=slot,
+        vendor_id=vendor_id,
+        device_id=device_id,
+        driver=driver,
+        vram=_read_vram(device_dir),
+    )
+
+    pci_ids = get_pci_ids()
+    if pci_ids is not None:
+        device.vendor, device.device = pci_ids.lookup(vendor_id, device_id)
+    return device
+
+
+def iter_display_devices():
+    """
+    Yields the display controllers (VGA, 3D and others) in slot order.
+    """
+    pattern = os.path.join(sysroot.path(PCI_DEVICES_DIR), "*")
+    for device_dir in sorted(glob.glob(pattern)):
+        device = read_display_device(device_dir)
+        if device is not None:
+            yield device
+
+
+def clear_caches():
+    pci_ids = get_pci_ids()
+    if pci_ids is not None:
+        pci_ids.close()
+    get_pci_ids.cache_clear()
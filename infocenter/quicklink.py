@@ -15,8 +15,34 @@ class QuickLink(Gtk.Box):
     button = Gtk.Template.Child()
     image = Gtk.Template.Child()
 
-    def __init__(self, link, title, icon, **kwargs):
+    def __init__(self, link="", title="", icon="", **kwargs):
         super().__init__(**kwargs)
+        self.update(link, title, icon)
+
+    def update(self, link, title, icon):
         self.label.set_label(title)
         self.button.set_uri(link)
         self.image.set_from_icon_name(icon)
+
+
+def _on_setup(_factory, list_item):
+    # Focus goes to the link button, not to the grid cell
+    list_item.set_activatable(False)
+    list_item.set_focusable(False)
+    list_item.set_child(QuickLink())
+
+
+def _on_bind(_factory, list_item):
+    item = list_item.get_item()
+    list_item.get_child().update(item.uri, item.title, item.icon)
+
+
+def create_factory() -> Gtk.ListItemFactory:
+    """
+    Returns a factory rendering models.QuickLinkItem, widgets are only
+    created for the visible items and recycled while scrolling.
+    """
+    factory = Gtk.SignalListItemFactory()
+    factory.connect("setup", _on_setup)
+    factory.connect("bind", _on_bind)
+    return factory
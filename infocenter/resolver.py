@@ -0,0 +1,260 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+"""
+Deadline-bounded resolution of the fully qualified host name.
+
+socket.getfqdn() blocks for the full resolver timeout when the network is
+down or the VPN is half up. get_fqdn() asks systemd-resolved if it is
+running and falls back to getaddrinfo(), both within a deadline. Results,
+including failures, are cached on disk per network configuration, so a
+failing lookup is not repeated on every start.
+"""
+
+import json
+import os
+import socket
+import threading
+import time
+import zlib
+
+from infocenter import snapshot, sysroot
+
+DEFAULT_TIMEOUT = 2.0
+
+CACHE_FILE_NAME = "fqdn.json"
+CACHE_ENTRIES = 8
+POSITIVE_TTL = 24 * 60 * 60
+NEGATIVE_TTL = 5 * 60
+
+# A change of any of these files means another network configuration
+NETWORK_FILES = (
+    "/etc/hosts",
+    "/etc/resolv.conf",
+    "/run/systemd/resolve/resolv.conf",
+    "/proc/net/route",
+    "/proc/net/ipv6_route",
+)
+
+# Columns of the routing tables that identify a route, the others (e.g. the
+# reference and use counters) change with traffic
+ROUTE_COLUMNS = {
+    # Iface, Destination, Gateway, Mask
+    "/proc/net/route": (0, 1, 2, 7),
+    # destination, prefix length, next hop, device
+    "/proc/net/ipv6_route": (0, 1, 4, 9),
+}
+
+RESOLVE1_NAME = "org.freedesktop.resolve1"
+RESOLVE1_PATH = "/org/freedesktop/resolve1"
+RESOLVE1_INTERFACE = "org.freedesktop.resolve1.Manager"
+
+
+class ResolvedUnavailableError(Exception):
+    """
+    systemd-resolved is not running or did not answer in time.
+    """
+
+
+def _get_routes(data: bytes, columns) -> bytes:
+    """
+    Returns the identifying columns of a routing table, one route per line.
+    """
+    routes = []
+    for line in data.splitlines():
+        fields = line.split()
+        if len(fields) > max(columns):
+            routes.append(b" ".join(fields[column] for column in columns))
+    return b"\n".join(routes)
+
+
+def get_network_key(hostname: str) -> str:
+    """
+    Returns a fingerprint of the host name, the resolver configuration and
+    the routing tables, e.g. a VPN coming up changes the routes.
+    """
+    checksum = zlib.crc32(hostname.encode())
+    for path in NETWORK_FILES:
+        try:
+            with open(sysroot.path(path), "rb") as file:
+                data = file.read()
+            if path in ROUTE_COLUMNS:
+                data = _get_routes(data, ROUTE_COLUMNS[path])
+            checksum = zlib.crc32(data, checksum)
+        except OSError:
+            checksum = zlib.crc32(b"-", checksum)
+    return "{0}-{1:08x}".format(hostname, checksum)
+
+
+def get_cache_path() -> str:
+    return os.path.join(snapshot.get_cache_dir(), CACHE_FILE_NAME)
+
+
+def _load_cache() -> dict:
+    try:
+        with open(get_cache_path(), "rb") as file:
+            cache = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def get_cached(key: str):
+    """
+    Returns (found, fqdn) from the cache, fqdn is None for a cached failure.
+    """
+    entry = _load_cache().get(key)
+    if not isinstance(entry, dict):
+        return False, None
+
+    fqdn = entry.get("fqdn")
+    ttl = POSITIVE_TTL if fqdn else NEGATIVE_TTL
+    if time.time() - entry.get("time", 0) > ttl:
+        return False, None
+    return True, fqdn
+
+
+def store(key: str, fqdn: str):
+    cache = _load_cache()
+    cache[key] = {"fqdn": fqdn, "time": time.time()}
+    # Keep the most recent networks only
+    newest = sorted(cache, key=lambda k: cache[k].get("time", 0), reverse=True)
+    snapshot.write_json(get_cache_path(), {k: cache[k] for k in newest[:CACHE_ENTRIES]})
+
+
+def _qualified(names) -> str:
+    return next((name.rstrip(".") for name in names if name and "." in name), None)
+
+
+def resolve_with_resolved(hostname: str, timeout: float) -> str:
+    """
+    Resolves through systemd-resolved, which caches and answers per link.
+
+    Returns:
+        str: the FQDN, or None if it has none
+
+    Raises:
+        ResolvedUnavailableError: if resolved is not running or does not
+            answer in time
+    """
+    # Imported here so the file based providers also work without gi
+    try:
+        from gi.repository import Gio, GLib
+    except ImportError as error:
+        raise ResolvedUnavailableError(str(error)) from error
+
+    deadline = time.monotonic() + timeout
+
+    def call(method, parameters, reply_type):
+        remaining = max(1, int((deadline - time.monotonic()) * 1000))
+        return connection.call_sync(
+            RESOLVE1_NAME,
+            RESOLVE1_PATH,
+            RESOLVE1_INTERFACE,
+            method,
+            parameters,
+            GLib.VariantType.new(reply_type),
+            Gio.DBusCallFlags.NO_AUTO_START,
+            remaining,
+            None,
+        ).unpack()
+
+    try:
+        connection = Gio.bus_get_sync(Gio.BusType.SYSTEM, None)
+        addresses, canonical, _flags = call(
+            "ResolveHostname",
+            GLib.Variant("(isit)", (0, hostname, socket.AF_UNSPEC, 0)),
+            "(a(iiay)st)",
+        )
+        fqdn = _qualified([canonical])
+        # Like getfqdn(): otherwise the names of the host's addresses
+        for ifindex, family, address in addresses:
+            if fqdn is not None:
+                break
+            names, _flags = call(
+                "ResolveAddress",
+                GLib.Variant("(iiayt)", (ifindex, family, bytes(address), 0)),
+                "(a(is)t)",
+            )
+            fqdn = _qualified(name for _ifindex, name in names)
+    except GLib.Error as error:
+        remote_error = Gio.DBusError.get_remote_error(error) or ""
+        if remote_error.startswith(RESOLVE1_NAME + "."):
+            # A definite answer, e.g. no such host
+            return None
+        raise ResolvedUnavailableError(error.message) from error
+    return fqdn
+
+
+def resolve_with_getaddrinfo(hostname: str) -> str:
+    """
+    Returns the canonical name of hostname, if qualified, otherwise the
+    first qualified name of its address. Blocking.
+    """
+    infos = socket.getaddrinfo(hostname, None, flags=socket.AI_CANONNAME)
+    fqdn = _qualified(info[3] for info in infos)
+    if fqdn is not None:
+        return fqdn
+
+    name, aliases, _addresses = socket.gethostbyaddr(infos[0][4][0])
+    return _qualified([name] + aliases)
+
+
+def _call_with_deadline(func, timeout: float, *args):
+    """
+    Runs func in a daemon thread, so a lookup stuck in the C library can
+    neither block the caller beyond timeout nor the exit of the process.
+
+    Raises:
+        TimeoutError: if func did not finish in time
+    """
+    result = {}
+    done = threading.Event()
+
+    def run():
+        try:
+            result["value"] = func(*args)
+        except Exception as error:
+            result["error"] = error
+        finally:
+            done.set()
+
+    threading.Thread(target=run, name="infocenter-resolver", daemon=True).start()
+    if not done.wait(timeout):
+        raise TimeoutError(func.__name__)
+    if "error" in result:
+        raise result["error"]
+    return result["value"]
+
+
+def resolve(hostname: str, timeout: float = DEFAULT_TIMEOUT) -> str:
+    """
+    Resolves the FQDN of hostname uncached within timeout, None on failure.
+    """
+    deadline = time.monotonic() + timeout
+    try:
+        return resolve_with_resolved(hostname, timeout)
+    except ResolvedUnavailableError:
+        pass
+
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        return None
+    try:
+        return _call_with_deadline(resolve_with_getaddrinfo, remaining, hostname)
+    except (OSError, TimeoutError, IndexError):
+        return None
+
+
+def get_fqdn(timeout: float = DEFAULT_TIMEOUT) -> str:
+    """
+    Returns the FQDN of this host, the host name if it has none or it cannot
+    be resolved within timeout.
+    """
+    hostname = socket.gethostname()
+    key = get_network_key(hostname)
+
+    found, fqdn = get_cached(key)
+    if not found:
+        fqdn = resolve(hostname, timeout)
+        store(key, fqdn)
+    return fqdn or hostname
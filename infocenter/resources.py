@@ -0,0 +1,111 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+"""
+Resolution of localized files in infocenter.gresource.
+
+The files below a resource directory are enumerated once, so resolving a
+language is a set lookup instead of a failing Gio.resources_lookup_data()
+per missing translation. Resolved data is memoized.
+"""
+
+import os
+
+DEFAULT_LANGUAGE = "en"
+
+# Precedence of the environment variables as used by gettext
+LOCALE_VARIABLES = ("LC_ALL", "LC_MESSAGES", "LANG")
+
+
+def _expand(locale_name: str) -> list:
+    """
+    Returns the candidates of one locale name, e.g. "de_AT.UTF-8@euro" ->
+    ["de_AT", "de"]. The C and POSIX locales have none.
+    """
+    name = locale_name.partition(".")[0].partition("@")[0]
+    if name in ("", "C", "POSIX"):
+        return []
+
+    language = name.partition("_")[0]
+    return [name, language] if language != name else [name]
+
+
+def get_language_chain(environ=None) -> list:
+    """
+    Returns the languages to try in order, e.g. ["de_AT", "de", "en"] for
+    LANG=de_AT.UTF-8. $LANGUAGE may list several languages separated by
+    colons, it is ignored for the C locale like gettext does.
+    """
+    if environ is None:
+        environ = os.environ
+
+    locale_name = next(
+        (environ[name] for name in LOCALE_VARIABLES if environ.get(name)), ""
+    )
+    names = []
+    if _expand(locale_name):
+        names = environ.get("LANGUAGE", "").split(":")
+    names.append(locale_name)
+
+    chain = []
+    for name in names:
+        for candidate in _expand(name):
+            if candidate not in chain:
+                chain.append(candidate)
+
+    if DEFAULT_LANGUAGE not in chain:
+        chain.append(DEFAULT_LANGUAGE)
+    return chain
+
+
+class ResourceIndex:
+    """
+    The files of one directory in the registered resources, e.g. the content
+    bundles named <lang>.json.
+    """
+
+    def __init__(self, path: str, suffix: str = ""):
+        from gi.repository import Gio, GLib
+
+        self._path = path.rstrip("/")
+        self._suffix = suffix
+        self._data = {}
+
+        try:
+            children = Gio.resources_enumerate_children(
+                self._path, Gio.ResourceLookupFlags.NONE
+            )
+        except GLib.GError:
+            # Development builds without the resource
+            children = []
+        self.names = frozenset(
+            child[: -len(suffix)] if suffix else child
+            for child in children
+            if child.endswith(suffix) and not child.endswith("/")
+        )
+
+    def resolve(self, languages) -> str:
+        """
+        Returns the first of languages with a file, or None.
+        """
+        return next((lang for lang in languages if lang in self.names), None)
+
+    def lookup(self, name: str):
+        """
+        Returns the GBytes of the file name (without suffix), memoized.
+
+        Raises:
+            KeyError: if the file is not in the index
+        """
+        if name not in self.names:
+            raise KeyError(name)
+
+        data = self._data.get(name)
+        if data is None:
+            from gi.repository import Gio
+
+            data = Gio.resources_lookup_data(
+                "{0}/{1}{2}".format(self._path, name, self._suffix),
+                Gio.ResourceLookupFlags.NONE,
+            )
+            self._data[name] = data
+        return data
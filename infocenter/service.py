@@ -0,0 +1,239 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+from gi.repository import Gio, GLib
+
+from infocenter import checks
+
+INTERFACE_NAME = "de.volkswagen.infocenter.Info"
+ERROR_UNKNOWN_PROPERTY = "de.volkswagen.infocenter.Error.UnknownProperty"
+ERROR_UNKNOWN_CHECK = "de.volkswagen.infocenter.Error.UnknownCheck"
+
+# Values are wrapped in variants together with the time they were collected
+# (microseconds since the epoch). A value that could not be collected is an
+# empty array ("av").
+INTERFACE_XML = """
+<node>
+  <interface name="de.volkswagen.infocenter.Info">
+    <method name="GetAll">
+      <arg direction="out" type="a{s(vx)}" name="properties"/>
+    </method>
+    <method name="GetProperty">
+      <arg direction="in" type="s" name="name"/>
+      <arg direction="out" type="v" name="value"/>
+      <arg direction="out" type="x" name="timestamp"/>
+    </method>
+    <method name="RunChecks">
+      <arg direction="in" type="as" name="names"/>
+      <arg direction="out" type="a{s(vx)}" name="results"/>
+    </method>
+    <signal name="PropertiesChanged">
+      <arg type="a{s(vx)}" name="changed"/>
+    </signal>
+  </interface>
+</node>
+"""
+
+
+def to_variant(value) -> GLib.Variant:
+    """
+    Converts plain Python values (as collected for the window or the dump)
+    into a variant. Lists of strings become "as", other lists "av" and
+    dicts "a{sv}".
+    """
+    if value is None:
+        return GLib.Variant("av", [])
+    if isinstance(value, bool):
+        return GLib.Variant("b", value)
+    if isinstance(value, int):
+        return GLib.Variant("x", value)
+    if isinstance(value, float):
+        return GLib.Variant("d", value)
+    if isinstance(value, str):
+        return GLib.Variant("s", value)
+    if isinstance(value, dict):
+        return GLib.Variant(
+            "a{sv}", {str(key): to_variant(item) for key, item in value.items()}
+        )
+    if all(isinstance(item, str) for item in value):
+        return GLib.Variant("as", list(value))
+    return GLib.Variant("av", [to_variant(item) for item in value])
+
+
+class InfoCache:
+    """
+    In-memory cache of the collected system information and check results,
+    e.g. "system.os" or "checks.vpn", each with its collection timestamp.
+
+    Listeners are invoked as listener(name) whenever a value changes.
+    """
+
+    def __init__(self):
+        self._values = {}
+        self._listeners = []
+
+    def set(self, name: str, value):
+        previous = self._values.get(name)
+        self._values[name] = (value, GLib.get_real_time())
+        if previous is None or previous[0] != value:
+            for listener in self._listeners:
+                listener(name)
+
+    def get(self, name: str):
+        """
+        Returns (value, timestamp in microseconds).
+
+        Raises:
+            KeyError: if nothing was collected for name yet
+        """
+        return self._values[name]
+
+    def names(self) -> list:
+        return sorted(self._values)
+
+    def connect(self, listener):
+        self._listeners.append(listener)
+
+    def disconnect(self, listener):
+        self._listeners.remove(listener)
+
+
+class InfoService:
+    """
+    Serves the InfoCache of the running instance on the session bus, so
+    tray applets, support tools and scripts need not collect on their own.
+
+    RunChecks() executes the requested checks in the background and replies
+    once all of them finished or timed out. Identical requests arriving
+    meanwhile are answered by the same execution. The checks are run by
+    check_runner (the checks.CheckScheduler of the window) if set, otherwise
+    by a scheduler of the service over load_registry(), the same checks.yaml.
+    """
+
+    def __init__(self, cache: InfoCache, load_registry):
+        self._cache = cache
+        self._cache.connect(self._on_cache_changed)
+        self._connection = None
+        self._object_path = None
+        self._registration_id = 0
+        self._changed = set()
+        self._idle_id = 0
+        # sorted check names -> invocations waiting for that run
+        self._in_flight = {}
+        self._load_registry = load_registry
+        self._own_runner = None
+        self.check_runner = None
+
+    def register(self, connection: Gio.DBusConnection, object_path: str):
+        """
+        Raises:
+            GLib.Error: if the object cannot be exported
+        """
+        node = Gio.DBusNodeInfo.new_for_xml(INTERFACE_XML)
+        self._registration_id = connection.register_object(
+            object_path,
+            node.lookup_interface(INTERFACE_NAME),
+            self._on_method_call,
+            None,
+            None,
+        )
+        self._connection = connection
+        self._object_path = object_path
+
+    def unregister(self):
+        if self._registration_id:
+            self._connection.unregister_object(self._registration_id)
+            self._registration_id = 0
+        if self._idle_id:
+            GLib.source_remove(self._idle_id)
+            self._idle_id = 0
+        self._connection = None
+
+    def _entries(self, names) -> dict:
+        entries = {}
+        for name in names:
+            value, timestamp = self._cache.get(name)
+            entries[name] = GLib.Variant("(vx)", (to_variant(value), timestamp))
+        return entries
+
+    def _on_method_call(
+        self, _connection, _sender, _path, _interface, method, parameters, invocation
+    ):
+        if method == "GetAll":
+            invocation.return_value(
+                GLib.Variant("(a{s(vx)})", (self._entries(self._cache.names()),))
+            )
+        elif method == "GetProperty":
+            (name,) = parameters.unpack()
+            try:
+                value, timestamp = self._cache.get(name)
+            except KeyError:
+                invocation.return_dbus_error(
+                    ERROR_UNKNOWN_PROPERTY, "Unknown property: " + name
+                )
+                return
+            invocation.return_value(
+                GLib.Variant("(vx)", (to_variant(value), timestamp))
+            )
+        elif method == "RunChecks":
+            (names,) = parameters.unpack()
+            self._run_checks(names or self._get_check_names(), invocation)
+
+    def _get_check_runner(self) -> checks.CheckScheduler:
+        if self.check_runner is not None:
+            return self.check_runner
+        if self._own_runner is None:
+            self._own_runner = checks.CheckScheduler(
+                self._load_registry(), self._on_check_result
+            )
+        return self._own_runner
+
+    def _get_check_names(self) -> list:
+        return list(self._get_check_runner().ids)
+
+    def _on_check_result(self, check_id, result):
+        if result is not None:
+            self._cache.set("checks." + check_id, result.value)
+
+    def _run_checks(self, names, invocation):
+        known = self._get_check_names()
+        unknown = [name for name in names if name not in known]
+        if unknown:
+            invocation.return_dbus_error(
+                ERROR_UNKNOWN_CHECK, "Unknown check: " + ", ".join(unknown)
+            )
+            return
+
+        key = tuple(sorted(set(names)))
+        if key in self._in_flight:
+            self._in_flight[key].append(invocation)
+            return
+
+        self._in_flight[key] = [invocation]
+        self._get_check_runner().run(
+            key, force=True, done=lambda _ok: self._checks_finished(key)
+        )
+
+    def _checks_finished(self, key):
+        entries = self._entries("checks." + name for name in key)
+        reply = GLib.Variant("(a{s(vx)})", (entries,))
+        for invocation in self._in_flight.pop(key):
+            invocation.return_value(reply)
+
+    def _on_cache_changed(self, name):
+        # Changes of one main loop iteration go out as a single signal
+        self._changed.add(name)
+        if not self._idle_id:
+            self._idle_id = GLib.idle_add(self._emit_changed)
+
+    def _emit_changed(self):
+        self._idle_id = 0
+        changed, self._changed = self._changed, set()
+        if self._connection is not None:
+            self._connection.emit_signal(
+                None,
+                self._object_path,
+                INTERFACE_NAME,
+                "PropertiesChanged",
+                GLib.Variant("(a{s(vx)})", (self._entries(changed),)),
+            )
+        return GLib.SOURCE_REMOVE
@@ -0,0 +1,113 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+import json
+import os
+import tempfile
+
+from infocenter import sysroot
+
+FORMAT_VERSION = 2
+SNAPSHOT_FILE_NAME = "system-information.json"
+
+BOOT_ID_PATH = "/proc/sys/kernel/random/boot_id"
+
+# A change of any of these files invalidates the snapshot
+DEPENDENCIES = (
+    "/etc/hostname",
+    "/etc/os-release",
+    "/etc/machine-info",
+    "/sys/devices/virtual/dmi/id/bios_version",
+)
+
+
+def get_cache_dir() -> str:
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(cache_home, "infocenter")
+
+
+def get_snapshot_path() -> str:
+    return os.path.join(get_cache_dir(), SNAPSHOT_FILE_NAME)
+
+
+def get_cache_key() -> dict:
+    """
+    Returns the boot id plus the mtimes of DEPENDENCIES. A snapshot is only
+    valid for the exact same key.
+    """
+    try:
+        with open(sysroot.path(BOOT_ID_PATH)) as file:
+            boot_id = file.read().strip()
+    except OSError:
+        boot_id = None
+
+    mtimes = {}
+    for path in DEPENDENCIES:
+        try:
+            mtimes[path] = os.stat(sysroot.path(path)).st_mtime_ns
+        except OSError:
+            mtimes[path] = None
+
+    return {"boot_id": boot_id, "mtimes": mtimes}
+
+
+def load(key: dict = None) -> dict:
+    """
+    Returns the values of the cached snapshot, or None if there is no valid
+    snapshot for the current cache key.
+    """
+    try:
+        with open(get_snapshot_path(), "rb") as file:
+            snapshot = json.load(file)
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(snapshot, dict) or snapshot.get("version") != FORMAT_VERSION:
+        return None
+
+    if key is None:
+        key = get_cache_key()
+    if key["boot_id"] is None or snapshot.get("key") != key:
+        return None
+
+    values = snapshot.get("values")
+    return values if isinstance(values, dict) else None
+
+
+def save(values: dict, key: dict = None):
+    """
+    Writes the snapshot atomically: a crash mid-write leaves either the old
+    or the new snapshot behind, never a corrupt one.
+    """
+    if key is None:
+        key = get_cache_key()
+
+    snapshot = {"version": FORMAT_VERSION, "key": key, "values": values}
+    write_json(get_snapshot_path(), snapshot)
+
+
+def write_json(path: str, data):
+    """
+    Writes data as JSON file atomically, errors are ignored.
+    """
+    directory = os.path.dirname(path)
+    try:
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(
+            dir=directory, prefix="." + os.path.basename(path) + "-"
+        )
+    except OSError:
+        return
+
+    try:
+        with os.fdopen(fd, "w") as file:
+            json.dump(data, file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, path)
+    except (OSError, TypeError, ValueError):
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
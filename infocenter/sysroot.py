@@ -0,0 +1,26 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# Root directory for all /proc, /sys and /etc lookups of the providers, so they
+# can run against fixture trees. Set INFOCENTER_SYSROOT or call set_root().
+
+import os
+
+_root = os.environ.get("INFOCENTER_SYSROOT", "/")
+
+
+def get_root() -> str:
+    return _root
+
+
+def set_root(root: str):
+    global _root
+    _root = root or "/"
+
+
+def path(absolute_path: str) -> str:
+    """
+    Maps an absolute system path below the configured root.
+    """
+    if _root == "/":
+        return absolute_path
+    return os.path.join(_root, absolute_path.lstrip("/"))
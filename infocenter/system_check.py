@@ -1,45 +1,133 @@
 # SPDX-License-Identifier: GPL-2.0-or-later
 
-import os
 import socket
-import requests
 
+from gi.repository import GLib
 
-def check_local_proxy_port(port: int = 9000, ip: str = "127.0.0.1") -> bool:
+from infocenter import diagnostics, pac, systemd
+from infocenter.http_probe import ProbeResult, run_probe
+
+PAC_PATH = "/localproxy"
+
+
+def check_local_proxy_port(
+    port: int = 9000, ip: str = "127.0.0.1", timeout: float = None
+) -> bool:
     """
     Checks if local proxy port is available.
 
     Args:
         port (int, optional): Defaults to 9000.
         ip (str, optional): Defaults to "127.0.0.1".
+        timeout (float, optional): Connect timeout in seconds. Defaults to None.
 
     Returns:
         bool: Returns the result of the proxy port check
     """
-    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    return sock.connect_ex((ip, port)) == 0
+    try:
+        with socket.create_connection((ip, port), timeout=timeout):
+            return True
+    except OSError:
+        return False
 
 
-def check_pac_file(port: int = 9000, ip: str = "127.0.0.1") -> bool:
+def check_proxy(
+    port: int = 9000,
+    ip: str = "127.0.0.1",
+    connect_timeout: float = 2.0,
+    read_timeout: float = 3.0,
+) -> ProbeResult:
+    """
+    Connects once to the local proxy and fetches the pac file over that very
+    connection, so port and pac file are checked with a single probe.
+
+    Args:
+        port (int, optional): Defaults to 9000.
+        ip (str, optional): Defaults to "127.0.0.1".
+        connect_timeout (float, optional): Defaults to 2 seconds.
+        read_timeout (float, optional): Defaults to 3 seconds.
+
+    Returns:
+        ProbeResult: connected is the result of the port check, ok the result
+            of the pac file check. Also carries connect latency, time to first
+            byte and body size.
+    """
+    return run_probe(
+        ip,
+        port,
+        PAC_PATH,
+        connect_timeout=connect_timeout,
+        read_timeout=read_timeout,
+    )
+
+
+def summarize_proxy(result: ProbeResult) -> dict:
+    """
+    Returns the plain values of a check_proxy() result, timings in ms.
+    """
+
+    def milliseconds(seconds):
+        return None if seconds is None else round(seconds * 1000, 1)
+
+    return {
+        "port": result.connected,
+        "pac_file": result.ok,
+        "connect_ms": milliseconds(result.connect_latency),
+        "time_to_first_byte_ms": milliseconds(result.time_to_first_byte),
+        "pac_file_size": result.body_size,
+    }
+
+
+def run_diagnostics(
+    uris,
+    port: int = 9000,
+    ip: str = "127.0.0.1",
+    rounds: int = diagnostics.DEFAULT_ROUNDS,
+    concurrency: int = diagnostics.DEFAULT_CONCURRENCY,
+) -> diagnostics.Report:
+    """
+    Diagnostics mode of the proxy checks: measures DNS resolution, connect to
+    the local proxy, time to first byte of the pac file and CONNECT through
+    the proxy to the hosts of uris, repeatedly.
+
+    Args:
+        uris (list): e.g. the quicklinks, at most diagnostics.MAX_HOSTS hosts
+            are probed
+        rounds (int, optional): capped at diagnostics.MAX_ROUNDS
+        concurrency (int, optional): capped at diagnostics.MAX_CONCURRENCY
+
+    Returns:
+        diagnostics.Report: a latency histogram per stage
+    """
+    return diagnostics.run(
+        diagnostics.get_hosts(uris),
+        proxy_ip=ip,
+        proxy_port=port,
+        pac_path=PAC_PATH,
+        rounds=rounds,
+        concurrency=concurrency,
+    )
+
+
+def check_pac_file(
+    port: int = 9000, ip: str = "127.0.0.1", timeout: float = None
+) -> bool:
     """
     Checks for proper pac file. This test will always fail if local proxy port check fails.
 
     Args:
         port (int, optional): Defaults to 9000.
         ip (str, optional): Defaults to "127.0.0.1".
+        timeout (float, optional): Deadline of the fetch in seconds.
+            Defaults to pac.DEFAULT_TIMEOUT.
 
     Returns:
-        bool: Returns the test result
+        bool: Returns the test result. The pac file is fetched conditionally
+            and must define FindProxyForURL, see pac.PacFetcher.
     """
-    if check_local_proxy_port():
-        try:
-            response = requests.get(
-                "http://{IP}:{PORT}/localproxy".format(IP=ip, PORT=port)
-            ).content
-            return True if response else False
-        except Exception:
-            return False
-    return False
+    if timeout is None:
+        timeout = pac.DEFAULT_TIMEOUT
+    return pac.get_fetcher(ip, port, PAC_PATH).fetch(timeout).ok
 
 
 def check_zscaler_service(service: str = "zsaservice") -> bool:
@@ -52,23 +140,58 @@ def check_zscaler_service(service: str = "zsaservice") -> bool:
     Returns:
         bool: Returns true if Zscaler service is running
     """
+    return check_services([service])[service]
+
+
+def check_services(services) -> dict:
+    """
+    Checks with systemd which of the given services are running. All services
+    are looked up with a single D-Bus call.
+
+    Args:
+        services (list): service or unit names
+
+    Returns:
+        dict: Maps every service to true if it is running
+    """
     try:
-        ret = os.system("systemctl is-active " + service + "  > /dev/null")
-        return ret == 0
-    except FileNotFoundError:
-        return False
+        states = systemd.get_unit_states(services)
+    except GLib.Error:
+        return {service: False for service in services}
+
+    return {service: state == "active" for service, state in states.items()}
+
+
+VPN_INTERFACES = ("gpd0", "vpn0", "tun0")
 
 
-def check_vpn() -> bool:
+def check_vpn(names=None) -> bool:
     """
     Checks the presence of virtual network interfaces by their names (gpd0, vpn0, tun0)
 
+    Args:
+        names (set, optional): Known interface names, e.g. from a
+            netlink.LinkMonitor. Defaults to querying the kernel.
+
     Returns:
         bool: Returns true if virtual network interfaces are present
     """
-    try:
-        interfaces = socket.if_nameindex()
-        names = [i[1] for i in interfaces]
-        return any(i in names for i in ("gpd0", "vpn0", "tun0"))
-    except ValueError:
-        return False
+    return bool(find_interfaces(VPN_INTERFACES, names))
+
+
+def find_interfaces(interfaces, names=None) -> list:
+    """
+    Returns which of the given network interfaces are present.
+
+    Args:
+        interfaces (list): interface names to look for
+        names (set, optional): Known interface names, e.g. from a
+            netlink.LinkMonitor. Defaults to querying the kernel.
+    """
+    if names is None:
+        try:
+            names = [i[1] for i in socket.if_nameindex()]
+        except (ValueError, OSError):
+            return []
+
+    return [i for i in interfaces if i in names]
@@ -1,70 +1,80 @@
 # SPDX-License-Identifier: GPL-2.0-or-later
 
-import os
-from infocenter.edid import get_edid_sysfs
-from gi.repository import Gio
+from gettext import gettext as _
+from gettext import ngettext
 
+from infocenter import cpuinfo, keyvalue, pci, sysroot
+from infocenter.edid import (
+    get_connector_path,
+    get_edid_sysfs,
+    iter_connectors,
+    list_connectors,
+    read_connector,
+)
 
-def get_os() -> str:
-    info = {}
+DMI_DIR = "/sys/devices/virtual/dmi/id"
+DMI_ATTRIBUTES = ("product_name", "chassis_asset_tag", "bios_version")
+OS_RELEASE_PATHS = ("/etc/os-release", "/usr/lib/os-release")
 
-    with open("/etc/os-release") as os_release:
-        for line in os_release:
-            try:
-                key, value = line.rstrip().split("=")
+# Deadline of the switcheroo-control fallback, it is not activated on demand
+SWITCHEROO_TIMEOUT_MS = 1000
 
-                info[key] = value.replace('"', "")
-            except ValueError:
-                pass
 
-    if "PRETTY_NAME" in info:
-        return info["PRETTY_NAME"]
+def get_os() -> str:
+    for path in OS_RELEASE_PATHS:
+        info = keyvalue.read_env_file(sysroot.path(path))
+        if info:
+            return info.get("PRETTY_NAME") or "Unknown"
     return "Unknown"
 
 
+def get_dmi_info() -> dict:
+    """
+    Reads all DMI attributes in one batch. Unreadable attributes are None.
+    """
+    return keyvalue.read_attributes(sysroot.path(DMI_DIR), DMI_ATTRIBUTES)
+
+
 def get_hardware_model() -> str:
-    hardware_model = "Unknown"
-    with open("/sys/devices/virtual/dmi/id/product_name") as file:
-        hardware_model = file.read().strip()
-    return hardware_model
+    return get_dmi_info()["product_name"] or "Unknown"
 
 
 def get_chassis_asset() -> str:
-    asset_tag = "Unknown"
-    with open("/sys/devices/virtual/dmi/id/chassis_asset_tag") as file:
-        asset_tag = file.read().strip()
-    return asset_tag
+    return get_dmi_info()["chassis_asset_tag"] or "Unknown"
 
 
 def get_bios_version() -> str:
-    bios_version = "Unknown"
-    with open("/sys/devices/virtual/dmi/id/bios_version") as file:
-        bios_version = file.read().strip()
-    return bios_version
+    return get_dmi_info()["bios_version"] or "Unknown"
 
 
 def get_cpu_model() -> str:
-    info = {}
-
-    with open("/proc/cpuinfo") as proc_cpuinfo:
-        data = proc_cpuinfo.read().split("\n")
-
-        for line in data:
-            try:
-                key, value = line.rstrip().split(":")
-
-                info[key.strip()] = value.replace('"', "").strip()
-            except ValueError:
-                pass
-
-    if "model name" in info:
-        return info["model name"]
-    return "Unknown"
+    return cpuinfo.get_model_name() or "Unknown"
+
+
+def get_cpu_topology() -> str:
+    topology = cpuinfo.get_topology()
+    if not topology.threads:
+        return "Unknown"
+
+    summary = ", ".join(
+        (
+            ngettext("{0} socket", "{0} sockets", topology.sockets).format(
+                topology.sockets
+            ),
+            ngettext("{0} core", "{0} cores", topology.cores).format(topology.cores),
+            ngettext("{0} thread", "{0} threads", topology.threads).format(
+                topology.threads
+            ),
+        )
+    )
+    if len(topology.models) > 1:
+        summary += " (" + " + ".join(topology.models) + ")"
+    return summary
 
 
 def get_kernel_version() -> str:
     kernel_version = "Unknown"
-    with open("/proc/version") as file:
+    with open(sysroot.path("/proc/version")) as file:
         kernel_version = file.read().strip()
 
     return kernel_version
@@ -75,35 +85,90 @@ def get_monitor_list() -> list:
     return monitor_data
 
 
-def get_language_short_code() -> str:
-    lang = str(os.getenv("LANG"))
-
-    if len(lang) > 2:
-        return lang[:2]
-
-    return "en"
-
-
-def get_graphic_card_list() -> list:
-    con = Gio.bus_get_sync(Gio.BusType.SYSTEM, None)
-
-    control_proxy = Gio.DBusProxy.new_sync(
-        con,
-        Gio.DBusProxyFlags.NONE,
-        None,
-        "net.hadess.SwitcherooControl",
-        "/net/hadess/SwitcherooControl",
-        "net.hadess.SwitcherooControl",
-        None,
-    )
-
-    if control_proxy is None:
+def iter_monitors():
+    """
+    Yields (connector, model) for every connected monitor, e.g.
+    ("card0-DP-1", "DELL U2720Q").
+    """
+    for connector, info in iter_connectors():
+        yield connector, info.model or _("Unknown")
+
+
+def read_monitors(connectors=None) -> dict:
+    """
+    Re-reads single connectors after a hotplug event.
+
+    Args:
+        connectors (set): connector names, None for all existing connectors
+
+    Returns:
+        dict: connector -> model, or None if no monitor is connected (anymore)
+    """
+    if connectors is None:
+        connectors = list_connectors()
+
+    monitors = {}
+    for connector in connectors:
+        info = read_connector(get_connector_path(connector))
+        monitors[connector] = None if info is None else info.model or _("Unknown")
+    return monitors
+
+
+def _format_size(size: int) -> str:
+    for unit in ("bytes", "KiB", "MiB", "GiB"):
+        if size < 1024 or unit == "GiB":
+            break
+        size /= 1024
+    return "{0:.{1}f} {2}".format(size, 0 if size == int(size) else 1, unit)
+
+
+def format_display_device(device: pci.DisplayDevice) -> str:
+    """
+    Returns e.g. "AMD/ATI Navi 23 [Radeon RX 6600/6600 XT/6600M] (amdgpu, 8 GiB)".
+    """
+    details = []
+    if device.driver:
+        details.append(device.driver)
+    if device.vram:
+        details.append(_format_size(device.vram))
+    if not details:
+        return device.name
+    return "{0} ({1})".format(device.name, ", ".join(details))
+
+
+def get_switcheroo_gpus() -> list:
+    """
+    Returns the GPU names known to switcheroo-control, or an empty list if the
+    service is not running or does not answer within its deadline.
+    """
+    # Imported here so the file based providers also work without gi
+    from gi.repository import Gio, GLib
+
+    try:
+        connection = Gio.bus_get_sync(Gio.BusType.SYSTEM, None)
+        reply = connection.call_sync(
+            "net.hadess.SwitcherooControl",
+            "/net/hadess/SwitcherooControl",
+            "org.freedesktop.DBus.Properties",
+            "Get",
+            GLib.Variant("(ss)", ("net.hadess.SwitcherooControl", "GPUs")),
+            GLib.VariantType.new("(v)"),
+            Gio.DBusCallFlags.NO_AUTO_START,
+            SWITCHEROO_TIMEOUT_MS,
+            None,
+        )
+    except GLib.Error:
         return []
 
-    gpus = control_proxy.get_cached_property("GPUs")
-    graphics_data = []
+    gpus = reply.unpack()[0] or []
+    return [gpu["Name"] for gpu in gpus if gpu.get("Name")]
 
-    for gpu in gpus:
-        graphics_data.append(gpu["Name"])
 
-    return graphics_data
+def get_graphic_card_list() -> list:
+    """
+    Returns the graphics cards with driver and VRAM, read from the PCI sysfs
+    tree. switcheroo-control is only asked if sysfs has no display devices,
+    e.g. in a container.
+    """
+    cards = [format_display_device(device) for device in pci.iter_display_devices()]
+    return cards or get_switcheroo_gpus()
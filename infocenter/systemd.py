@@ -0,0 +1,200 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+from gi.repository import Gio, GLib
+
+SYSTEMD_BUS_NAME = "org.freedesktop.systemd1"
+SYSTEMD_OBJECT_PATH = "/org/freedesktop/systemd1"
+MANAGER_INTERFACE = "org.freedesktop.systemd1.Manager"
+UNIT_INTERFACE = "org.freedesktop.systemd1.Unit"
+PROPERTIES_INTERFACE = "org.freedesktop.DBus.Properties"
+
+# D-Bus call timeout in milliseconds
+CALL_TIMEOUT = 2000
+
+
+def unit_name(service: str) -> str:
+    """
+    Returns the full unit name, plain service names get a .service suffix.
+    """
+    if "." in service:
+        return service
+    return service + ".service"
+
+
+def get_unit_states(units, connection: Gio.DBusConnection = None) -> dict:
+    """
+    Looks up the active state of any number of units in one D-Bus round trip.
+
+    Args:
+        units (list): unit or plain service names
+        connection (Gio.DBusConnection, optional): Defaults to the system bus.
+
+    Returns:
+        dict: Maps every requested name to its ActiveState ("active",
+            "inactive", "failed", ...). Units unknown to systemd are "inactive".
+    """
+    names = {unit_name(unit): unit for unit in units}
+    states = {unit: "inactive" for unit in units}
+    if not names:
+        return states
+
+    if connection is None:
+        connection = Gio.bus_get_sync(Gio.BusType.SYSTEM, None)
+
+    reply = connection.call_sync(
+        SYSTEMD_BUS_NAME,
+        SYSTEMD_OBJECT_PATH,
+        MANAGER_INTERFACE,
+        "ListUnitsByNames",
+        GLib.Variant("(as)", (list(names),)),
+        GLib.VariantType("(a(ssssssouso))"),
+        Gio.DBusCallFlags.NONE,
+        CALL_TIMEOUT,
+        None,
+    )
+
+    for name, _desc, load_state, active_state, *_rest in reply.unpack()[0]:
+        if name in names and load_state != "not-found":
+            states[names[name]] = active_state
+
+    return states
+
+
+class UnitWatcher:
+    """
+    Follows the ActiveState of a set of units via PropertiesChanged signals.
+
+    All D-Bus calls are asynchronous, the callback is invoked as
+    callback(unit, active_state) in the main context of the thread that
+    called start(): once with the current state and again on every change.
+    """
+
+    def __init__(self, units, callback):
+        self._units = list(units)
+        self._callback = callback
+        self._connection = None
+        self._subscription_id = 0
+        self._paths = {}
+        self._cancellable = Gio.Cancellable()
+
+    def start(self):
+        Gio.bus_get(Gio.BusType.SYSTEM, self._cancellable, self._on_bus_get)
+
+    def stop(self):
+        self._cancellable.cancel()
+
+        if self._connection is None:
+            return
+
+        if self._subscription_id:
+            self._connection.signal_unsubscribe(self._subscription_id)
+            self._subscription_id = 0
+
+        self._connection.call(
+            SYSTEMD_BUS_NAME,
+            SYSTEMD_OBJECT_PATH,
+            MANAGER_INTERFACE,
+            "Unsubscribe",
+            None,
+            None,
+            Gio.DBusCallFlags.NONE,
+            CALL_TIMEOUT,
+            None,
+            None,
+        )
+        self._connection = None
+
+    def _on_bus_get(self, _source, result):
+        try:
+            self._connection = Gio.bus_get_finish(result)
+        except GLib.Error:
+            return
+
+        self._subscription_id = self._connection.signal_subscribe(
+            SYSTEMD_BUS_NAME,
+            PROPERTIES_INTERFACE,
+            "PropertiesChanged",
+            None,
+            UNIT_INTERFACE,
+            Gio.DBusSignalFlags.NONE,
+            self._on_properties_changed,
+        )
+
+        # systemd only emits unit signals while at least one client subscribed
+        self._call_manager("Subscribe", None)
+        self._call_manager(
+            "ListUnitsByNames",
+            GLib.Variant("(as)", ([unit_name(unit) for unit in self._units],)),
+            self._on_units_listed,
+        )
+
+    def _call_manager(self, method, parameters, callback=None):
+        self._connection.call(
+            SYSTEMD_BUS_NAME,
+            SYSTEMD_OBJECT_PATH,
+            MANAGER_INTERFACE,
+            method,
+            parameters,
+            None,
+            Gio.DBusCallFlags.NONE,
+            CALL_TIMEOUT,
+            self._cancellable,
+            callback,
+        )
+
+    def _on_units_listed(self, connection, result):
+        try:
+            reply = connection.call_finish(result)
+        except GLib.Error:
+            return
+
+        names = {unit_name(unit): unit for unit in self._units}
+        for (
+            name,
+            _desc,
+            load_state,
+            active_state,
+            _sub,
+            _fol,
+            path,
+            *_rest,
+        ) in reply.unpack()[0]:
+            if name not in names:
+                continue
+
+            self._paths[path] = names[name]
+            if load_state == "not-found":
+                active_state = "inactive"
+            self._callback(names[name], active_state)
+
+    def _on_properties_changed(
+        self, connection, _sender, path, _interface, _signal, parameters
+    ):
+        unit = self._paths.get(path)
+        if unit is None:
+            return
+
+        _interface_name, changed, invalidated = parameters.unpack()
+        if "ActiveState" in changed:
+            self._callback(unit, changed["ActiveState"])
+        elif "ActiveState" in invalidated:
+            connection.call(
+                SYSTEMD_BUS_NAME,
+                path,
+                PROPERTIES_INTERFACE,
+                "Get",
+                GLib.Variant("(ss)", (UNIT_INTERFACE, "ActiveState")),
+                GLib.VariantType("(v)"),
+                Gio.DBusCallFlags.NONE,
+                CALL_TIMEOUT,
+                self._cancellable,
+                self._on_active_state,
+                unit,
+            )
+
+    def _on_active_state(self, connection, result, unit):
+        try:
+            reply = connection.call_finish(result)
+        except GLib.Error:
+            return
+        self._callback(unit, reply.unpack()[0])
@@ -0,0 +1,223 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# This module is imported by the launcher before gi, keep its imports cheap.
+
+"""
+Optional tracing of startup phases, providers, checks and content loading.
+
+Enabled with INFOCENTER_TRACE=FILE (or =1 for a file in the cache directory)
+or with --profile[=FILE]. The spans are written as Chrome trace-event JSON
+(load it in chrome://tracing or https://ui.perfetto.dev) and summarized on
+stderr at exit. Disabled, span() returns a shared no-op context manager.
+"""
+
+import atexit
+import functools
+import json
+import os
+import sys
+import threading
+import time
+
+ENV_VAR = "INFOCENTER_TRACE"
+PROFILE_OPTION = "--profile"
+
+# None while tracing is disabled
+_events = None
+_threads = {}
+_path = None
+_start_ns = 0
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("name", "category", "args", "start")
+
+    def __init__(self, name, category, args):
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        end = time.perf_counter_ns()
+        thread = threading.current_thread()
+        _threads[thread.ident] = thread.name
+        event = {
+            "name": self.name,
+            "cat": self.category,
+            "ph": "X",
+            "ts": (self.start - _start_ns) / 1000,
+            "dur": (end - self.start) / 1000,
+            "pid": os.getpid(),
+            "tid": thread.ident,
+        }
+        if self.args:
+            event["args"] = self.args
+        _events.append(event)
+        return False
+
+
+def is_enabled() -> bool:
+    return _events is not None
+
+
+def span(name: str, category: str = "infocenter", **args):
+    """
+    Returns a context manager that records the time spent within as one span.
+    """
+    if _events is None:
+        return _NULL_SPAN
+    return _Span(name, category, args)
+
+
+def wrap(func, name: str, category: str = "infocenter"):
+    """
+    Returns func with every call recorded as span, or func itself if tracing
+    is disabled.
+    """
+    if _events is None:
+        return func
+
+    @functools.wraps(func)
+    def traced(*args, **kwargs):
+        with _Span(name, category, None):
+            return func(*args, **kwargs)
+
+    return traced
+
+
+def wrap_iter(func, name: str, category: str = "infocenter"):
+    """
+    Like wrap() for generator functions, the span covers the whole iteration.
+    """
+    if _events is None:
+        return func
+
+    @functools.wraps(func)
+    def traced(*args, **kwargs):
+        with _Span(name, category, None):
+            yield from func(*args, **kwargs)
+
+    return traced
+
+
+def get_default_path() -> str:
+    from infocenter import snapshot
+
+    return os.path.join(snapshot.get_cache_dir(), "trace-{0}.json".format(os.getpid()))
+
+
+def enable(path: str = None):
+    """
+    Starts recording. The trace is written to path and summarized at exit.
+    """
+    global _events, _path, _start_ns
+
+    if _events is not None:
+        return
+    _events = []
+    _path = path or get_default_path()
+    _start_ns = time.perf_counter_ns()
+    atexit.register(_finish)
+
+
+def setup(argv) -> list:
+    """
+    Enables tracing if requested by environment or command line.
+
+    Returns:
+        list: argv without the --profile option, which GApplication would
+            reject
+    """
+    remaining = []
+    path = None
+    requested = False
+    for arg in argv:
+        if arg == PROFILE_OPTION or arg.startswith(PROFILE_OPTION + "="):
+            requested = True
+            path = arg.partition("=")[2] or None
+        else:
+            remaining.append(arg)
+
+    value = os.environ.get(ENV_VAR)
+    if value and value != "0":
+        requested = True
+        path = path or (None if value == "1" else value)
+
+    if requested:
+        enable(path)
+    return remaining
+
+
+def get_trace() -> dict:
+    events = list(_events or [])
+    for tid, name in list(_threads.items()):
+        events.append(
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": os.getpid(),
+                "tid": tid,
+                "args": {"name": name},
+            }
+        )
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def get_summary() -> list:
+    """
+    Returns (name, count, total ms, max ms) per span name, slowest first.
+    """
+    totals = {}
+    for event in list(_events or []):
+        count, total, maximum = totals.get(event["name"], (0, 0.0, 0.0))
+        duration = event["dur"] / 1000
+        totals[event["name"]] = (count + 1, total + duration, max(maximum, duration))
+
+    rows = [(name,) + values for name, values in totals.items()]
+    return sorted(rows, key=lambda row: row[2], reverse=True)
+
+
+def print_summary(stream=None):
+    stream = stream or sys.stderr
+    stream.write(
+        "{0:<48} {1:>6} {2:>10} {3:>10}\n".format("span", "count", "total ms", "max ms")
+    )
+    for name, count, total, maximum in get_summary():
+        stream.write(
+            "{0:<48} {1:>6} {2:>10.2f} {3:>10.2f}\n".format(
+                name[:48], count, total, maximum
+            )
+        )
+
+
+def write(path: str):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as file:
+        json.dump(get_trace(), file)
+
+
+def _finish():
+    try:
+        write(_path)
+    except OSError as error:
+        sys.stderr.write("Cannot write trace: {0}\n".format(error))
+    else:
+        sys.stderr.write("Trace written to {0}\n".format(_path))
+    print_summary()
@@ -2,9 +2,10 @@
 
 import getpass
 import gi
+import json
 import socket
 
-import yaml
+from functools import partial
 
 from gettext import gettext as _
 
@@ -14,23 +15,44 @@ gi.require_version("Adw", "1")
 from gi.repository import Adw, Gio, GLib, Gtk  # noqa E402
 
 from infocenter.action_row import ActionRow  # noqa E402
-from infocenter.disclaimer import Disclaimer  # noqa E402
-from infocenter.quicklink import QuickLink  # noqa E402
+from infocenter import disclaimer, quicklink  # noqa E402
+from infocenter.models import (  # noqa E402
+    ClientItem,
+    DisclaimerItem,
+    QuickLinkItem,
+    replace_all,
+)
+from infocenter import autostart, checks, diagnostics  # noqa E402
+from infocenter import keyvalue, snapshot  # noqa E402
+from infocenter import resolver, resources, sysroot, trace  # noqa E402
 from infocenter import system_check, system_information_provider  # noqa E402
-
-from pathlib import Path  # noqa E402
+from infocenter.content import ContentError  # noqa E402
+from infocenter.hotplug import DrmHotplugMonitor  # noqa E402
+from infocenter.live_status import RecheckScheduler  # noqa E402
+from infocenter.netlink import LinkMonitor  # noqa E402
+from infocenter.systemd import UnitWatcher  # noqa E402
+from infocenter.worker import get_executor, run_async, stream_async  # noqa E402
 
 
 @Gtk.Template(resource_path="/de/volkswagen/infocenter/gtk/window.ui")
 class Window(Adw.ApplicationWindow):
     __gtype_name__ = "Window"
 
-    LANG_PREFIX = system_information_provider.get_language_short_code()
-    BASE_YAML = "/de/volkswagen/infocenter/yaml"
-    RELATIVE_AUTOSTART_FILE_PATH = ".config/infocenter/do_not_start_file"
+    # Stack page -> methods building its content, run when first shown
+    PAGES = {
+        "support": (
+            "add_quicklinks",
+            "add_ehd",
+            "add_system_information",
+            "add_client_information",
+        ),
+        "system_checks": ("add_tests",),
+        "disclaimer": ("add_disclaimer",),
+    }
 
     stack = Gtk.Template.Child()
-    flowbox = Gtk.Template.Child()
+    quicklinks_group = Gtk.Template.Child()
+    quicklinks_grid_view = Gtk.Template.Child()
 
     ehd_preferences_group = Gtk.Template.Child()
 
@@ -50,37 +72,40 @@ class Window(Adw.ApplicationWindow):
     chassis_asset_tag_action_row = Gtk.Template.Child()
     bios_action_row = Gtk.Template.Child()
     cpu_action_row = Gtk.Template.Child()
+    cpu_topology_action_row = Gtk.Template.Child()
     kernel_action_row = Gtk.Template.Child()
 
     # Client Information
     client_preferences_group = Gtk.Template.Child()
 
     # Disclaimer
-    disclaimer_text_box = Gtk.Template.Child()
+    disclaimer_list_view = Gtk.Template.Child()
     autostart_checkbutton = Gtk.Template.Child()
 
     # Checks
-    zscaler_service_label = Gtk.Template.Child()
-    proxy_port_label = Gtk.Template.Child()
-    pac_file_label = Gtk.Template.Child()
-    vpn_label = Gtk.Template.Child()
+    checks_page = Gtk.Template.Child()
 
     def add_quicklinks(self):
         """
-        Displays the configured quick actions in top flowbox.
+        Displays the configured quick actions in the top grid.
         Configured in: /yaml/quicklinks.yaml
         """
-        resource = self.get_language_resource("quicklinks.yaml")
-        if not resource:
-            return
- 
-        quicklinks_yml = yaml.safe_load(resource.get_data())
+        quicklinks_yml = self._content.get("quicklinks")
         if not quicklinks_yml:
             self.quicklinks_group.set_visible(False)
+            replace_all(self._quicklinks, [])
             return
- 
-        for entry in quicklinks_yml:
-            self.flowbox.append(QuickLink(entry["uri"], entry["title"], entry["icon"]))
+
+        self.quicklinks_group.set_visible(True)
+        replace_all(
+            self._quicklinks,
+            [
+                QuickLinkItem(
+                    title=entry["title"], icon=entry["icon"], uri=entry["uri"]
+                )
+                for entry in quicklinks_yml
+            ],
+        )
 
     def add_ehd(self):
         """
@@ -88,12 +113,10 @@ class Window(Adw.ApplicationWindow):
         Configured in: /yaml/support.yaml
         """
 
-        resource = self.get_language_resource("support.yaml")
-        if not resource:
+        quicklinks_yml = self._content.get("support")
+        if not quicklinks_yml:
             return
 
-        quicklinks_yml = yaml.safe_load(resource.get_data())
-
         self.ehd_preferences_group.set_title(quicklinks_yml["title"])
 
         self.mail_action_row.set_subtitle(quicklinks_yml["mail"])
@@ -110,106 +133,528 @@ class Window(Adw.ApplicationWindow):
             - os
             - hardware model
             - bios version
-            - cpu model
+            - cpu model and topology
             - kernel version
-            - List of attached monitors (not working at the moment)
-        """
+            - List of attached monitors and graphic cards
+
+        The snapshot of the last launch is rendered right away, if it is still
+        valid. Every value is then re-collected in the background and only
+        changed values are updated. Without a snapshot the rows show a
+        placeholder until their value arrives.
 
-        self.computer_name_action_row.set_subtitle(socket.gethostname().upper())  # noqa: E501
-        self.fqdn_action_row.set_subtitle(socket.getfqdn().upper())  # noqa: E501
-        self.user_name_action_row.set_subtitle(getpass.getuser().upper())  # noqa: E501
-        self.os_action_row.set_subtitle(system_information_provider.get_os())  # noqa: E501
-        self.hardware_model_action_row.set_subtitle(
-            system_information_provider.get_hardware_model()
-        )  # noqa: E501
-        self.chassis_asset_tag_action_row.set_subtitle(
-            system_information_provider.get_chassis_asset()
-        )  # noqa: E501
-        self.bios_action_row.set_subtitle(
-            system_information_provider.get_bios_version()
-        )  # noqa: E501
-        self.cpu_action_row.set_subtitle(system_information_provider.get_cpu_model())  # noqa: E501
-        self.kernel_action_row.set_subtitle(
-            system_information_provider.get_kernel_version()
-        )  # noqa: E501
-
-        for index, monitor in enumerate(system_information_provider.get_monitor_list()):
-            self.system_information_preferences_group.add(
-                ActionRow("Monitor " + str(index), monitor[0])
+        Monitor rows belong to their DRM connector and follow hotplug events.
+        """
+        provider = system_information_provider
+        rows = {
+            "computer_name": (
+                self.computer_name_action_row,
+                lambda: socket.gethostname().upper(),
+            ),
+            "fqdn": (self.fqdn_action_row, lambda: resolver.get_fqdn().upper()),
+            "user_name": (
+                self.user_name_action_row,
+                lambda: getpass.getuser().upper(),
+            ),
+            "os": (self.os_action_row, provider.get_os),
+            "hardware_model": (
+                self.hardware_model_action_row,
+                provider.get_hardware_model,
+            ),
+            "chassis_asset_tag": (
+                self.chassis_asset_tag_action_row,
+                provider.get_chassis_asset,
+            ),
+            "bios": (self.bios_action_row, provider.get_bios_version),
+            "cpu": (self.cpu_action_row, provider.get_cpu_model),
+            "cpu_topology": (self.cpu_topology_action_row, provider.get_cpu_topology),
+            "kernel": (self.kernel_action_row, provider.get_kernel_version),
+        }
+        # key: (row title, getter, deadline in seconds)
+        lists = {
+            "graphic_cards": ("Graphic Card ", provider.get_graphic_card_list, 2.0),
+        }
+
+        self._snapshot_key = snapshot.get_cache_key()
+        self._snapshot = snapshot.load(self._snapshot_key) or {}
+        self._system_information = {}
+        # One extra for the monitors
+        self._system_information_pending = len(rows) + len(lists) + 1
+
+        # The FQDN lookup may take until its deadline, show the host name meanwhile
+        placeholders = {"fqdn": socket.gethostname().upper()}
+        for key, (row, getter) in rows.items():
+            row.set_subtitle(
+                self._snapshot.get(key) or placeholders.get(key) or _("Loading…")
+            )
+            run_async(
+                trace.wrap(getter, "provider." + key, "provider"),
+                partial(self.on_system_information, key, row),
             )
 
-        for index, card in enumerate(
-            system_information_provider.get_graphic_card_list()
-        ):
-            self.system_information_preferences_group.add(
-                ActionRow("Graphic Card " + str(index), card)
+        self._list_rows = {}
+        for key, (title, getter, timeout) in lists.items():
+            self._list_rows[key] = []
+            self._system_information[key] = []
+            for value in self._snapshot.get(key, []):
+                self._add_list_row(key, title, value)
+
+            stream_async(
+                trace.wrap(getter, "provider." + key, "provider"),
+                partial(self.on_list_item_found, key, title),
+                done_callback=partial(self.on_list_done, key),
+                timeout=timeout,
             )
 
+        self._monitor_rows = {}
+        self._hotplug_monitor = None
+        self._system_information["monitors"] = []
+        for connector, model in self._snapshot.get("monitors", []):
+            self._set_monitor_row(connector, model)
+
+        stream_async(
+            trace.wrap_iter(provider.iter_monitors, "provider.monitors", "provider"),
+            self.on_monitor_found,
+            done_callback=self.on_monitors_done,
+        )
+
+    def on_system_information(self, key, row, value, error):
+        if error:
+            value = _("Unknown")
+        else:
+            self._system_information[key] = value
+            self._info.set("system." + key, value)
+
+        if row.get_subtitle() != value:
+            row.set_subtitle(value)
+        self._system_information_collected()
+
+    def on_list_item_found(self, key, title, value):
+        items = self._system_information[key]
+        rows = self._list_rows[key]
+        index = len(items)
+        items.append(value)
+
+        if index < len(rows):
+            if rows[index].get_subtitle() != value:
+                rows[index].set_subtitle(value)
+        else:
+            self._add_list_row(key, title, value)
+
+    def on_list_done(self, key, error):
+        rows = self._list_rows[key]
+        if error:
+            # Keep what the snapshot knew instead of a partial list
+            self._system_information[key] = self._snapshot.get(key, [])
+        else:
+            while len(rows) > len(self._system_information[key]):
+                self.system_information_preferences_group.remove(rows.pop())
+            self._info.set("system." + key, self._system_information[key])
+
+        self._system_information_collected()
+
+    def _add_list_row(self, key, title, value):
+        rows = self._list_rows[key]
+        row = ActionRow(title + str(len(rows)), value)
+        rows.append(row)
+        self.system_information_preferences_group.add(row)
+
+    def on_monitor_found(self, monitor):
+        connector, model = monitor
+        self._system_information["monitors"].append([connector, model])
+        self._set_monitor_row(connector, model)
+
+    def on_monitors_done(self, error):
+        monitors = self._system_information["monitors"]
+        if error:
+            self._system_information["monitors"] = self._snapshot.get("monitors", [])
+        else:
+            found = {connector for connector, _model in monitors}
+            for connector in set(self._monitor_rows) - found:
+                self._set_monitor_row(connector, None)
+            self._info.set("system.monitors", monitors)
+
+        self._system_information_collected()
+
+        # Started after the initial scan, so its results cannot overtake ours
+        self._hotplug_monitor = DrmHotplugMonitor(self.on_drm_hotplug)
+        try:
+            self._hotplug_monitor.start()
+        except OSError:
+            self._hotplug_monitor = None
+
+    def on_drm_hotplug(self, connectors):
+        run_async(
+            partial(system_information_provider.read_monitors, connectors),
+            partial(self.on_monitors_changed, connectors is None),
+        )
+
+    def on_monitors_changed(self, complete, monitors, error):
+        if error:
+            return
+
+        if complete:
+            for connector in set(self._monitor_rows) - set(monitors):
+                self._set_monitor_row(connector, None)
+        for connector, model in monitors.items():
+            self._set_monitor_row(connector, model)
+
+        self._system_information["monitors"] = [
+            [connector, row.get_subtitle()]
+            for connector, row in sorted(self._monitor_rows.items())
+        ]
+        self._info.set("system.monitors", self._system_information["monitors"])
+
+    def _set_monitor_row(self, connector, model):
+        """
+        Adds, updates or removes (model None) the row of a single connector.
+        """
+        row = self._monitor_rows.get(connector)
+        if model is None:
+            if row is not None:
+                self.system_information_preferences_group.remove(row)
+                del self._monitor_rows[connector]
+        elif row is None:
+            # "card0-DP-1" -> "Monitor DP-1"
+            row = ActionRow("Monitor " + connector.partition("-")[2], model)
+            self._monitor_rows[connector] = row
+            self.system_information_preferences_group.add(row)
+        elif row.get_subtitle() != model:
+            row.set_subtitle(model)
+
+    def _system_information_collected(self):
+        self._system_information_pending -= 1
+        if self._system_information_pending == 0:
+            if self._system_information != self._snapshot:
+                get_executor().submit(
+                    snapshot.save, self._system_information, self._snapshot_key
+                )
+
     def add_client_information(self):
         """
         Adds Client Information and provides an overview over the business client.
         Configured in: /yaml/client.yaml
         """
 
-        resource = self.get_language_resource("client.yaml")
-        if not resource:
-            return
-
-        client_yml = yaml.safe_load(resource.get_data())
+        client_yml = self._content.get("client")
         if not client_yml:
+            replace_all(self._client_rows, [])
             return
 
         self.client_preferences_group.set_title(client_yml["title"])
-
-        for entry in client_yml["client"]:
-            self.client_preferences_group.add(
-                ActionRow(
-                    entry["label"],
-                    self._machine_info.get(entry["value"]) or "(not set)",
+        replace_all(
+            self._client_rows,
+            [
+                ClientItem(
+                    label=entry["label"],
+                    value=self._machine_info.get(entry["value"]) or "(not set)",
                 )
-            )
+                for entry in client_yml["client"]
+            ],
+        )
 
     def add_disclaimer(self):
         """
         Adds disclaimer and legal guidelines.
         Configured in: /yaml/disclaimer.yaml
         """
-        resource = self.get_language_resource("disclaimer.yaml")
-        if not resource:
-            return
-
-        disclaimer_yml = yaml.safe_load(resource.get_data())
-        for entry in disclaimer_yml:
-            self.disclaimer_text_box.append(
-                Disclaimer(
-                    GLib.markup_escape_text(entry["title"]),
-                    GLib.markup_escape_text(entry["body"]),
-                )
-            )
-
-        do_not_start_file = Path.joinpath(
-            Path.home(), self.RELATIVE_AUTOSTART_FILE_PATH
+        disclaimer_yml = self._content.get("disclaimer") or []
+        replace_all(
+            self._disclaimers,
+            [
+                DisclaimerItem(title=entry["title"], body=entry["body"])
+                for entry in disclaimer_yml
+            ],
         )
 
-        if not do_not_start_file.is_file():
-            self.stack.set_visible_child_name("disclaimer")
+        if not autostart.is_disabled():
             self.autostart_checkbutton.set_visible(True)
 
+    def _create_models(self):
+        """
+        Creates the models of the content sections and their views. Only the
+        visible quicklinks and disclaimers are realized, the add_* methods
+        just refill the models.
+        """
+        self._quicklinks = Gio.ListStore(item_type=QuickLinkItem)
+        self.quicklinks_grid_view.set_model(Gtk.NoSelection(model=self._quicklinks))
+        self.quicklinks_grid_view.set_factory(quicklink.create_factory())
+
+        self._disclaimers = Gio.ListStore(item_type=DisclaimerItem)
+        self.disclaimer_list_view.set_model(Gtk.NoSelection(model=self._disclaimers))
+        self.disclaimer_list_view.set_factory(disclaimer.create_factory())
+
+        # The few client rows keep the boxed list look of the other groups
+        self._client_rows = Gio.ListStore(item_type=ClientItem)
+        client_list_box = Gtk.ListBox(selection_mode=Gtk.SelectionMode.NONE)
+        client_list_box.add_css_class("boxed-list")
+        client_list_box.bind_model(
+            self._client_rows, lambda item: ActionRow(item.label, item.value)
+        )
+        self.client_preferences_group.add(client_list_box)
+
     def add_tests(self):
         """
-        Calls system checks and displays the result in the corresponding test entry
+        Generates the rows of the Checks page from the check registry
+        (checks.yaml) and runs all checks in the background. Every label shows
+        a pending state until the result of its check arrives or its timeout
+        expires.
+
+        Afterwards the checks are kept current by events instead of polling:
+        interface checks follow interface add/remove events, unit checks
+        follow systemd and network checks re-run on network changes.
         """
-        proxy = system_check.check_local_proxy_port()
-        self.set_test_value(self.proxy_port_label, proxy)
+        try:
+            registry = checks.load_registry(self._content.get("checks"))
+        except ContentError as error:
+            print("Invalid checks: {0}".format(error))
+            registry = checks.load_registry([])
+
+        self._check_registry = registry
+        self._check_groups = []
+        self._check_rows = {}
+        self._check_labels = {}
+        for group in registry.groups:
+            preferences_group = Adw.PreferencesGroup(
+                title=group.title, description=group.description
+            )
+            for definition in group.checks:
+                row = Adw.ActionRow(
+                    title=definition.title, subtitle=definition.subtitle
+                )
+                label = Gtk.Label()
+                row.add_suffix(label)
+                preferences_group.add(row)
+                self._check_rows[definition.id] = row
+                self._check_labels[definition.id] = label
+            self.checks_page.add(preferences_group)
+            self._check_groups.append(preferences_group)
+
+        rerun_button = Gtk.Button(label=_("Re-run checks"), halign=Gtk.Align.CENTER)
+        rerun_button.add_css_class("pill")
+        rerun_button.connect("clicked", self.on_rerun_checks)
+        actions_group = Adw.PreferencesGroup()
+        actions_group.add(rerun_button)
+        self.checks_page.add(actions_group)
+
+        self.add_diagnostics()
+
+        self._check_scheduler = checks.CheckScheduler(registry, self.on_check_result)
+        self._check_scheduler.run()
+        # D-Bus clients run checks through the same scheduler
+        self.get_application().info_service.check_runner = self._check_scheduler
+
+        self._link_monitor = LinkMonitor(self.on_links_changed)
+        try:
+            self._link_monitor.start()
+        except OSError:
+            self._link_monitor = None
+
+        self._network_scheduler = RecheckScheduler(self.run_network_checks)
+        self._network_scheduler.start()
+
+        units = {
+            registry.get(check_id).params["unit"]: check_id
+            for check_id in registry.of_kind("systemd_unit")
+        }
+        self._unit_checks = units
+        self._unit_states = {}
+        self._unit_watcher = UnitWatcher(list(units), self.on_unit_state_changed)
+        self._unit_watcher.start()
+
+    def update_check_titles(self):
+        """
+        Retitles the rows of the Checks page after a language switch. The
+        checks themselves keep running, a translation with different checks
+        is only picked up on the next start.
+        """
+        try:
+            registry = checks.load_registry(self._content.get("checks"))
+        except ContentError as error:
+            print("Invalid checks: {0}".format(error))
+            return
+        if set(registry.ids) != set(self._check_registry.ids):
+            return
+
+        for group, preferences_group in zip(registry.groups, self._check_groups):
+            preferences_group.set_title(group.title)
+            preferences_group.set_description(group.description)
+        for check_id, row in self._check_rows.items():
+            definition = registry.get(check_id)
+            row.set_title(definition.title)
+            row.set_subtitle(definition.subtitle)
+
+    def add_diagnostics(self):
+        """
+        Adds the network diagnostics to the Checks page. They probe the proxy
+        and the quicklink sites repeatedly, so they only run on request.
+        """
+        titles = {
+            "dns": _("DNS Resolution"),
+            "proxy_connect": _("Proxy Connect"),
+            "pac_first_byte": _("PAC-File First Byte"),
+            "proxy_tunnel": _("Connect through Proxy"),
+        }
+        group = Adw.PreferencesGroup(
+            title=_("Network Diagnostics"),
+            description=_("Where the time goes between this machine and the sites"),
+        )
+        self._diagnostics_rows = {}
+        for stage in diagnostics.STAGES:
+            row = Adw.ActionRow(title=titles[stage], subtitle=_("Not measured"))
+            group.add(row)
+            self._diagnostics_rows[stage] = row
+
+        self._diagnostics_button = Gtk.Button(
+            icon_name="media-playback-start-symbolic",
+            tooltip_text=_("Run diagnostics"),
+        )
+        self._diagnostics_button.connect("clicked", self.on_run_diagnostics)
+        self._export_button = Gtk.Button(
+            icon_name="document-save-symbolic",
+            tooltip_text=_("Export…"),
+            sensitive=False,
+        )
+        self._export_button.connect("clicked", self.on_export_diagnostics)
+        buttons = Gtk.Box(spacing=6, valign=Gtk.Align.CENTER)
+        for button in (self._diagnostics_button, self._export_button):
+            button.add_css_class("flat")
+            buttons.append(button)
+        group.set_header_suffix(buttons)
+
+        self._diagnostics_report = None
+        self.checks_page.add(group)
+
+    def on_run_diagnostics(self, button):
+        button.set_sensitive(False)
+        for row in self._diagnostics_rows.values():
+            row.set_subtitle(_("Measuring…"))
+            row.set_tooltip_text(None)
+
+        # The proxy as configured for the PAC-File check
+        params = {"host": "127.0.0.1", "port": 9000}
+        pac_checks = self._check_registry.of_kind("pac_file")
+        if pac_checks:
+            params = self._check_registry.get(pac_checks[0]).params
+
+        uris = [entry["uri"] for entry in self._content.get("quicklinks") or []]
+        run_async(
+            trace.wrap(system_check.run_diagnostics, "diagnostics", "check"),
+            self.on_diagnostics_done,
+            uris,
+            params["port"],
+            params["host"],
+        )
+
+    def on_diagnostics_done(self, report, error):
+        self._diagnostics_button.set_sensitive(True)
+        if error:
+            for row in self._diagnostics_rows.values():
+                row.set_subtitle(_("Failed"))
+                row.set_tooltip_text(str(error))
+            return
+
+        for stage, row in self._diagnostics_rows.items():
+            histogram = report.histograms[stage]
+            if histogram.count:
+                percentiles = _("p50 {0:.1f} ms · p95 {1:.1f} ms · p99 {2:.1f} ms")
+                subtitle = percentiles.format(
+                    histogram.percentile(50),
+                    histogram.percentile(95),
+                    histogram.percentile(99),
+                )
+                if histogram.failures:
+                    subtitle += " · " + _("{0} failed").format(histogram.failures)
+            elif histogram.failures:
+                subtitle = _("Failed")
+            else:
+                subtitle = _("Not measured")
+            row.set_subtitle(subtitle)
+            row.set_tooltip_text(report.errors.get(stage))
+
+        self._diagnostics_report = report.to_dict()
+        self._info.set("diagnostics", self._diagnostics_report)
+        self._export_button.set_sensitive(True)
+
+    def on_export_diagnostics(self, _button):
+        dialog = Gtk.FileDialog(initial_name="infocenter-diagnostics.json")
+        dialog.save(self, None, self.on_export_file_chosen)
+
+    def on_export_file_chosen(self, dialog, result):
+        try:
+            file = dialog.save_finish(result)
+            file.replace_contents(
+                json.dumps(self._diagnostics_report, indent=2).encode(),
+                None,
+                False,
+                Gio.FileCreateFlags.REPLACE_DESTINATION,
+                None,
+            )
+        except GLib.Error as error:
+            if not error.matches(Gtk.dialog_error_quark(), Gtk.DialogError.DISMISSED):
+                print("Cannot export diagnostics: " + error.message)
+
+    def on_rerun_checks(self, _button):
+        # Only checks whose results are older than their ttl are executed
+        self._check_scheduler.run()
+
+    def run_network_checks(self):
+        self._check_scheduler.run(
+            self._check_registry.of_kind(*checks.NETWORK_KINDS),
+            force=True,
+            done=self._network_scheduler.finished,
+        )
+
+    def on_links_changed(self, names):
+        for check_id in self._check_registry.of_kind("interface_present"):
+            interfaces = self._check_registry.get(check_id).params["interfaces"]
+            found = system_check.find_interfaces(interfaces, names)
+            detail = ", ".join(found) or None
+            self._check_scheduler.report(check_id, bool(found), detail)
+
+    def on_unit_state_changed(self, unit, active_state):
+        check_id = self._unit_checks.get(unit)
+        if check_id is not None:
+            self._check_scheduler.report(check_id, active_state == "active")
+
+        previous = self._unit_states.get(unit)
+        self._unit_states[unit] = active_state
+        if active_state == "active" and previous not in (None, "active"):
+            # The local proxy is provided by Zscaler
+            self._network_scheduler.trigger()
+
+    def on_check_result(self, check_id, result):
+        label = self._check_labels[check_id]
+        if result is None:
+            self.set_test_pending(label)
+            return
+
+        if result.status == checks.TIMEOUT:
+            self.set_test_timeout(label)
+        elif result.status == checks.SKIPPED:
+            self.set_test_skipped(label)
+        else:
+            self.set_test_value(label, result.ok)
+        label.set_tooltip_text(result.detail)
+        # e.g. the latency or whether the PAC-File changed
+        self._check_rows[check_id].set_subtitle(
+            result.detail or self._check_registry.get(check_id).subtitle
+        )
+        self._info.set("checks." + check_id, result.value)
 
-        pac = system_check.check_pac_file()
-        self.set_test_value(self.pac_file_label, pac)
+    def set_test_pending(self, label):
+        self._clear_test_state(label)
+        label.set_label(_("Checking…"))
+        label.add_css_class("dim-label")
 
-        zscaler = system_check.check_zscaler_service()
-        self.set_test_value(self.zscaler_service_label, zscaler)
+    def set_test_skipped(self, label):
+        self._clear_test_state(label)
+        label.set_label(_("Skipped"))
+        label.add_css_class("dim-label")
 
-        vpn = system_check.check_vpn()
-        self.set_test_value(self.vpn_label, vpn)
+    def set_test_timeout(self, label):
+        self._clear_test_state(label)
+        label.set_label(_("Timed out"))
+        label.add_css_class("warning")
 
     def set_test_value(self, label, value):
         """
@@ -217,6 +662,7 @@ class Window(Adw.ApplicationWindow):
             label (Adw.Label): Adwaita widget, whose text and CSS class is set
             value (bool): Test-Value, which will be interpreted as successful or failed
         """
+        self._clear_test_state(label)
         if value:
             label.set_label(_("Success"))
             label.add_css_class("success")
@@ -224,60 +670,121 @@ class Window(Adw.ApplicationWindow):
             label.set_label(_("Failed"))
             label.add_css_class("error")
 
+    def _clear_test_state(self, label):
+        for css_class in ("dim-label", "success", "warning", "error"):
+            label.remove_css_class(css_class)
+
     def _load_machine_info(self):
-        try:
-            with open("/etc/machine-info") as machine_info:
-                for line in machine_info:
-                    try:
-                        key, value = line.rstrip().split("=")
-
-                        self._machine_info[key] = value.replace('"', "")
-                    except ValueError:
-                        pass
-        except FileNotFoundError:
-            pass
-
-    def get_language_resource(self, file_name: str) -> Gio.Resource:
+        self._machine_info = keyvalue.read_env_file(sysroot.path("/etc/machine-info"))
+
+    def load_content(self) -> dict:
+        return self.get_application().load_content(self._languages)
+
+    def set_languages(self, languages):
+        """
+        Switches the content to another language fallback chain at runtime.
+        The models are refilled in place.
         """
-        Returns Gio loaded resources from yaml filename.
-        Will fallback to english if language is not available.
+        if languages == self._languages:
+            return
 
-        Args:
-            file_name (str): yaml filename
+        self._languages = languages
+        self._content = self.load_content()
+        # Pages not built yet pick up the new content when first shown
+        if "support" in self._built_pages:
+            self.add_quicklinks()
+            self.add_ehd()
+            self.add_client_information()
+        if "disclaimer" in self._built_pages:
+            self.add_disclaimer()
+        if "system_checks" in self._built_pages:
+            self.update_check_titles()
+
+    def build_page(self, name):
+        """
+        Builds the content of a stack page and starts its providers and
+        checks, once.
         """
+        if name not in self.PAGES or name in self._built_pages:
+            return
 
-        file_path = "{0}/{1}/{2}".format(self.BASE_YAML, self.LANG_PREFIX, file_name)
-        fallback_path = "{0}/en/{1}".format(self.BASE_YAML, file_name)
-        try:
-            return Gio.resources_lookup_data(
-                file_path,
-                Gio.ResourceLookupFlags.NONE,
-            )
-        except GLib.GError:
-            return Gio.resources_lookup_data(
-                fallback_path,
-                Gio.ResourceLookupFlags.NONE,
-            )
+        self._built_pages.add(name)
+        with trace.span("Window.build_page " + name, "startup"):
+            for method in self.PAGES[name]:
+                with trace.span("Window." + method, "startup"):
+                    getattr(self, method)()
+
+    def on_visible_page_changed(self, stack, _pspec):
+        self.build_page(stack.get_visible_child_name())
+
+    def _prefetch_page(self):
+        for name in self.PAGES:
+            if name not in self._built_pages:
+                self.build_page(name)
+                return GLib.SOURCE_CONTINUE
+
+        self._prefetch_source = 0
+        return GLib.SOURCE_REMOVE
 
     @Gtk.Template.Callback()
     def on_autostart_checkbutton(self, widget):
-        do_not_start_file = Path.joinpath(
-            Path.home(), Window.RELATIVE_AUTOSTART_FILE_PATH
-        )
-
-        do_not_start_file.touch()
-        if do_not_start_file.is_file():
+        autostart.disable()
+        if autostart.is_disabled():
             widget.set_visible(False)
 
     def __init__(self, **kwargs):
-        super().__init__(**kwargs)
+        with trace.span("Window.init_template", "startup"):
+            super().__init__(**kwargs)
+
+        # Shared with the D-Bus service of the application
+        self._info = self.get_application().info_cache
+
+        with trace.span("Window._create_models", "startup"):
+            self._create_models()
+        with trace.span("Window._load_machine_info", "startup"):
+            self._load_machine_info()
+        self._languages = resources.get_language_chain()
+        with trace.span("Window.load_content", "startup"):
+            self._content = self.load_content()
+
+        # Set by the lazily built pages
+        self._hotplug_monitor = None
+        self._link_monitor = None
+        self._network_scheduler = None
+        self._unit_watcher = None
+        self._check_scheduler = None
+
+        if not autostart.is_disabled():
+            self.stack.set_visible_child_name("disclaimer")
 
-        self._machine_info = {}
-        self._load_machine_info()
+        # Only the visible page is built before the first frame
+        self._built_pages = set()
+        self.build_page(self.stack.get_visible_child_name())
+        self.stack.connect("notify::visible-child-name", self.on_visible_page_changed)
+
+        # The other pages are built one per idle after the first frame, unless
+        # autostarted, where usually only the disclaimer is read
+        self._prefetch_source = 0
+        if not self.get_application().autostart:
+            self._prefetch_source = GLib.idle_add(
+                self._prefetch_page, priority=GLib.PRIORITY_LOW
+            )
 
-        self.add_quicklinks()
-        self.add_ehd()
-        self.add_system_information()
-        self.add_client_information()
-        self.add_disclaimer()
-        self.add_tests()
+        self.connect("destroy", self.on_destroy)
+
+    def on_destroy(self, _widget):
+        if self._prefetch_source:
+            GLib.source_remove(self._prefetch_source)
+            self._prefetch_source = 0
+        for monitor in (
+            self._hotplug_monitor,
+            self._unit_watcher,
+            self._network_scheduler,
+            self._link_monitor,
+        ):
+            if monitor is not None:
+                monitor.stop()
+        # RunChecks falls back to the scheduler of the service
+        info_service = self.get_application().info_service
+        if info_service.check_runner is self._check_scheduler:
+            info_service.check_runner = None
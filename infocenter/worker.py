@@ -0,0 +1,129 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from gi.repository import GLib
+
+_MAX_WORKERS = 8
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """
+    Returns the shared worker pool used for blocking background work.
+    """
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=_MAX_WORKERS, thread_name_prefix="infocenter-worker"
+            )
+    return _executor
+
+
+def _get_name(func) -> str:
+    # functools.partial objects have no __name__
+    return getattr(func, "__name__", None) or repr(func)
+
+
+def run_async(func, callback, *args, timeout: float = None):
+    """
+    Runs func(*args) on the worker pool and reports back on the GLib main loop.
+
+    The callback is invoked exactly once as callback(result, error). If the
+    deadline expires first, error is a TimeoutError and a late result is dropped.
+
+    Args:
+        func (callable): blocking function to run in the background
+        callback (callable): receives (result, error) in the main thread
+        timeout (float, optional): deadline in seconds. Defaults to no deadline.
+    """
+    state = {"done": False, "timeout_id": 0}
+
+    def deliver(result, error):
+        if state["done"]:
+            return GLib.SOURCE_REMOVE
+
+        state["done"] = True
+        if state["timeout_id"]:
+            GLib.source_remove(state["timeout_id"])
+            state["timeout_id"] = 0
+
+        callback(result, error)
+        return GLib.SOURCE_REMOVE
+
+    def on_deadline():
+        state["timeout_id"] = 0
+        deliver(None, TimeoutError(_get_name(func)))
+        return GLib.SOURCE_REMOVE
+
+    def on_done(future):
+        error = future.exception()
+        result = None if error else future.result()
+        GLib.idle_add(deliver, result, error)
+
+    if timeout is not None:
+        state["timeout_id"] = GLib.timeout_add(int(timeout * 1000), on_deadline)
+
+    future = get_executor().submit(func, *args)
+    future.add_done_callback(on_done)
+    return future
+
+
+def stream_async(func, item_callback, *args, done_callback=None, timeout=None):
+    """
+    Iterates func(*args) on the worker pool and reports every item on the GLib
+    main loop as soon as it is produced.
+
+    Args:
+        func (callable): blocking function returning an iterable
+        item_callback (callable): receives each item in the main thread
+        done_callback (callable, optional): receives the error or None once
+            the iteration has finished
+        timeout (float, optional): deadline in seconds. If it expires first,
+            done_callback receives a TimeoutError and later items are dropped.
+    """
+    state = {"done": False, "timeout_id": 0}
+
+    def deliver_item(item):
+        if not state["done"]:
+            item_callback(item)
+        return GLib.SOURCE_REMOVE
+
+    def deliver_done(error):
+        if state["done"]:
+            return GLib.SOURCE_REMOVE
+
+        state["done"] = True
+        if state["timeout_id"]:
+            GLib.source_remove(state["timeout_id"])
+            state["timeout_id"] = 0
+
+        if done_callback:
+            done_callback(error)
+        return GLib.SOURCE_REMOVE
+
+    def on_deadline():
+        state["timeout_id"] = 0
+        deliver_done(TimeoutError(_get_name(func)))
+        return GLib.SOURCE_REMOVE
+
+    def produce():
+        for item in func(*args):
+            if state["done"]:
+                break
+            GLib.idle_add(deliver_item, item)
+
+    def on_done(future):
+        GLib.idle_add(deliver_done, future.exception())
+
+    if timeout is not None:
+        state["timeout_id"] = GLib.timeout_add(int(timeout * 1000), on_deadline)
+
+    future = get_executor().submit(produce)
+    future.add_done_callback(on_done)
+    return future
@@ -0,0 +1,79 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+import pytest
+
+from infocenter import check_registry
+from infocenter.check_registry import load_registry
+from infocenter.content import ContentError
+
+
+def _group(*entries):
+    return [{"title": "Group", "checks": list(entries)}]
+
+
+def _check(check_id, **kwargs):
+    entry = {"id": check_id, "title": check_id.title(), "kind": "systemd_unit"}
+    entry.setdefault("unit", check_id)
+    entry.update(kwargs)
+    return entry
+
+
+def test_registry_orders_dependencies():
+    registry = load_registry(
+        _group(
+            _check("pac", depends_on=["port"]),
+            _check("port", depends_on=["service"]),
+            _check("service"),
+            _check("vpn"),
+        )
+    )
+
+    assert registry.ids == ["service", "port", "pac", "vpn"]
+    assert registry.with_dependencies(["pac"]) == ["service", "port", "pac"]
+    assert registry.dependents({"service"}) == {"port", "pac"}
+    assert registry.of_kind("systemd_unit") == registry.ids
+
+
+def test_registry_translates_texts(monkeypatch):
+    monkeypatch.setattr(check_registry, "_", str.upper)
+    data = _group(_check("service", subtitle="Check it"))
+    data[0]["description"] = "Group description"
+
+    registry = load_registry(data)
+
+    assert (registry.groups[0].title, registry.groups[0].description) == (
+        "GROUP",
+        "GROUP DESCRIPTION",
+    )
+    definition = registry.get("service")
+    assert (definition.title, definition.subtitle) == ("SERVICE", "CHECK IT")
+    # Missing texts stay empty instead of becoming the catalog header
+    assert load_registry(_group(_check("vpn"))).get("vpn").subtitle == ""
+
+
+def test_registry_applies_kind_defaults():
+    registry = load_registry(
+        _group({"id": "port", "title": "Port", "kind": "tcp_port", "port": 9000})
+    )
+
+    definition = registry.get("port")
+    assert definition.params == {"host": "127.0.0.1", "port": 9000}
+    assert definition.timeout == check_registry.DEFAULT_TIMEOUT
+    assert definition.depends_on == ()
+
+
+@pytest.mark.parametrize(
+    "entries",
+    [
+        [_check("a", kind="ping")],
+        [{"id": "a", "title": "A", "kind": "tcp_port"}],
+        [{"id": "a", "title": "A", "kind": "tcp_port", "port": "9000"}],
+        [_check("a", timeout=-1)],
+        [_check("a"), _check("a")],
+        [_check("a", depends_on=["b"])],
+        [_check("a", depends_on=["b"]), _check("b", depends_on=["a"])],
+    ],
+)
+def test_registry_rejects_invalid_checks(entries):
+    with pytest.raises(ContentError):
+        load_registry(_group(*entries))
@@ -0,0 +1,119 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+import time
+
+import pytest
+
+GLib = pytest.importorskip("gi.repository.GLib")
+
+from infocenter import checks  # noqa E402
+
+
+def _group(*entries):
+    return [{"title": "Group", "checks": list(entries)}]
+
+
+def _check(check_id, **kwargs):
+    entry = {"id": check_id, "title": check_id.title(), "kind": "systemd_unit"}
+    entry.setdefault("unit", check_id)
+    entry.update(kwargs)
+    return entry
+
+
+def _run_scheduler(registry, check_services, monkeypatch, timeout=5.0):
+    """
+    Runs all checks with check_services(units) answering the unit lookups
+    and returns the final results by id.
+    """
+    monkeypatch.setattr(checks.system_check, "check_services", check_services)
+    results = {}
+    finished = []
+    scheduler = checks.CheckScheduler(
+        registry, lambda check_id, result: results.__setitem__(check_id, result)
+    )
+    scheduler.run(done=finished.append)
+
+    context = GLib.MainContext.default()
+    deadline = time.monotonic() + timeout
+    while not finished and time.monotonic() < deadline:
+        context.iteration(False)
+        time.sleep(0.01)
+
+    assert finished
+    return results
+
+
+def test_scheduler_runs_dependencies_first(monkeypatch):
+    started = []
+
+    def check_services(units):
+        started.extend(units)
+        return dict.fromkeys(units, True)
+
+    registry = checks.load_registry(
+        _group(_check("port", depends_on=["service"]), _check("service"))
+    )
+    results = _run_scheduler(registry, check_services, monkeypatch)
+
+    assert started == ["service", "port"]
+    assert results["service"].status == checks.SUCCESS
+    assert results["port"].status == checks.SUCCESS
+
+
+def test_scheduler_skips_dependents_of_failures(monkeypatch):
+    started = []
+
+    def check_services(units):
+        started.extend(units)
+        return {unit: unit != "service" for unit in units}
+
+    registry = checks.load_registry(
+        _group(
+            _check("service"),
+            _check("port", depends_on=["service"]),
+            _check("pac", depends_on=["port"]),
+        )
+    )
+    results = _run_scheduler(registry, check_services, monkeypatch)
+
+    assert started == ["service"]
+    assert results["service"].status == checks.FAILED
+    assert results["port"].status == checks.SKIPPED
+    assert results["port"].detail.endswith("Service")
+    assert results["pac"].status == checks.SKIPPED
+
+
+def test_scheduler_times_out(monkeypatch):
+    def check_services(units):
+        time.sleep(1)
+        return dict.fromkeys(units, True)
+
+    registry = checks.load_registry(
+        _group(_check("service", timeout=0.1), _check("port", depends_on=["service"]))
+    )
+    results = _run_scheduler(registry, check_services, monkeypatch)
+
+    assert results["service"].status == checks.TIMEOUT
+    assert results["port"].status == checks.SKIPPED
+
+
+def test_scheduler_looks_up_ready_units_together(monkeypatch):
+    calls = []
+
+    def check_services(units):
+        calls.append(list(units))
+        return {unit: unit != "vpn" for unit in units}
+
+    registry = checks.load_registry(
+        _group(
+            _check("service"),
+            _check("vpn"),
+            _check("port", depends_on=["service"]),
+        )
+    )
+    results = _run_scheduler(registry, check_services, monkeypatch)
+
+    assert calls == [["service", "vpn"], ["port"]]
+    assert results["service"].status == checks.SUCCESS
+    assert results["vpn"].status == checks.FAILED
+    assert results["port"].status == checks.SUCCESS
@@ -0,0 +1,38 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+import pytest
+
+from infocenter import content
+
+
+def test_sections_fall_back_per_file(tmp_path):
+    for lang, section in (("en", "checks"), ("en", "support"), ("de", "checks")):
+        (tmp_path / lang).mkdir(exist_ok=True)
+        (tmp_path / lang / (section + ".yaml")).touch()
+
+    paths = content.get_section_paths(["de_AT", "de", "en"], tmp_path)
+
+    assert paths == [tmp_path / "de" / "checks.yaml", tmp_path / "en" / "support.yaml"]
+
+
+def test_invalid_checks_fail_the_build(tmp_path, capsys):
+    pytest.importorskip("yaml")
+    path = tmp_path / "checks.yaml"
+    path.write_text(
+        "- title: Group\n"
+        "  checks:\n"
+        "    - id: port\n"
+        "      title: Port\n"
+        "      kind: tcp_port\n"
+        "      depends_on: [service]\n"
+    )
+
+    assert content.main(["--output", str(tmp_path / "en.json"), str(path)]) == 1
+    assert "checks[0].checks[0]: missing 'port'" in capsys.readouterr().err
+
+
+def test_shipped_checks_compile(tmp_path):
+    pytest.importorskip("yaml")
+    paths = sorted(str(path) for path in (content.YAML_DIR / "en").glob("*.yaml"))
+
+    assert content.main(["--output", str(tmp_path / "en.json")] + paths) == 0
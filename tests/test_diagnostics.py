@@ -0,0 +1,73 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+import pytest
+
+from infocenter import diagnostics
+
+
+def _histogram(*values):
+    histogram = diagnostics.Histogram()
+    for value in values:
+        histogram.add(value)
+    return histogram
+
+
+def test_empty_histogram():
+    histogram = diagnostics.Histogram()
+    histogram.add_failure()
+
+    assert histogram.percentile(50) is None
+    assert histogram.to_dict()["mean_ms"] is None
+    assert histogram.to_dict()["failures"] == 1
+
+
+def test_percentiles_interpolate_within_buckets():
+    histogram = _histogram(0.5, 1.5, 3, 3, 7)
+
+    assert histogram.counts[:5] == [1, 1, 2, 1, 0]
+    # Bounded by the observed minimum and maximum
+    assert histogram.percentile(0) == 0.5
+    assert histogram.percentile(100) == 7
+    # Rank 2.5 is a quarter into the (2, 5] bucket
+    assert histogram.percentile(50) == pytest.approx(2.75)
+
+
+def test_percentiles_of_the_unbounded_bucket():
+    histogram = _histogram(6000, 8000)
+
+    assert histogram.counts[-1] == 2
+    assert histogram.percentile(50) == pytest.approx(7000)
+    assert histogram.percentile(99) == pytest.approx(7980)
+
+
+def test_percentiles_are_monotonic():
+    histogram = _histogram(*(value * 0.37 for value in range(1, 500)))
+
+    percentiles = [histogram.percentile(percent) for percent in range(101)]
+
+    assert percentiles == sorted(percentiles)
+    assert histogram.minimum <= percentiles[0] and percentiles[-1] <= histogram.maximum
+
+
+def test_to_dict():
+    data = _histogram(1.234, 4.5).to_dict()
+
+    assert data["count"] == 2
+    assert (data["min_ms"], data["max_ms"], data["mean_ms"]) == (1.23, 4.5, 2.87)
+    assert data["buckets_ms"] == list(diagnostics.BUCKETS)
+    assert sum(data["bucket_counts"]) == 2
+
+
+def test_get_hosts():
+    uris = [
+        "https://intranet.example.com/a",
+        "https://intranet.example.com/b",
+        "http://wiki.example.com:8080/",
+        "mailto:support@example.com",
+        "https://bad.example.com:99999/",
+    ]
+
+    assert diagnostics.get_hosts(uris) == [
+        ("intranet.example.com", 443),
+        ("wiki.example.com", 8080),
+    ]
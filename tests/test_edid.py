@@ -0,0 +1,98 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+import struct
+
+import pytest
+
+from benchmarks.fixtures import make_edid
+from infocenter import edid
+
+
+def _with_checksum(block: bytearray) -> bytes:
+    block[127] = (256 - sum(block[:127]) % 256) % 256
+    return bytes(block)
+
+
+def _displayid_block(width, height, pixel_clock_khz, h_blank=160, v_blank=45):
+    """
+    Returns a DisplayID extension block with one type VII timing.
+    """
+    timing = bytearray(20)
+    timing[0:3] = (pixel_clock_khz - 1).to_bytes(3, "little")
+    timing[4:8] = struct.pack("<HH", width - 1, h_blank - 1)
+    timing[12:16] = struct.pack("<HH", height - 1, v_blank - 1)
+
+    section = bytes((0x22, 0x02, len(timing))) + timing
+    block = bytearray(128)
+    block[0:5] = bytes((edid.DISPLAYID_EXTENSION_TAG, 0x20, len(section), 0, 0))
+    block[5 : 5 + len(section)] = section
+    return _with_checksum(block)
+
+
+def _with_extension(data: bytes, block: bytes) -> bytes:
+    base = bytearray(data[:128])
+    base[126] = 1
+    return _with_checksum(base) + block
+
+
+def test_decode_base_block():
+    info = edid.decode_edid(make_edid("DELL U2720Q", "ABC123"))
+
+    assert info.manufacturer == "DEL"
+    assert info.product_id == 0xA0B1
+    assert (info.model, info.serial) == ("DELL U2720Q", "ABC123")
+    assert (info.year, info.week, info.version) == (2023, 12, "1.4")
+    assert info.native_resolution == (2560, 1440)
+    assert info.refresh_rates == (59.79,)
+    assert info.vertical_range == (48, 75)
+    assert info.size_mm == (597, 336)
+    assert info.extensions == ()
+
+
+def test_decode_empty_cea_extension():
+    info = edid.decode_edid(make_edid("Model", "Serial", extensions=1))
+
+    assert info.extensions == (edid.CEA_EXTENSION_TAG,)
+    assert info.native_resolution == (2560, 1440)
+
+
+def test_decode_displayid_extension():
+    data = _with_extension(
+        make_edid("Model", "Serial"), _displayid_block(3840, 2160, 1_058_400)
+    )
+    info = edid.decode_edid(data)
+
+    assert info.extensions == (edid.DISPLAYID_EXTENSION_TAG,)
+    assert info.native_resolution == (2560, 1440)
+    assert info.refresh_rates == (59.79, 120.0)
+
+
+def test_broken_extension_is_skipped():
+    block = bytearray(_displayid_block(3840, 2160, 1_058_400))
+    block[127] ^= 0xFF
+    info = edid.decode_edid(_with_extension(make_edid("Model", "Serial"), block))
+
+    assert info.extensions == ()
+    assert info.refresh_rates == (59.79,)
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        make_edid("Model", "Serial")[:100],
+        make_edid("Model", "Serial")[:127] + b"\x00",
+        _with_checksum(bytearray(128)),
+    ],
+)
+def test_invalid_base_block(data):
+    with pytest.raises(edid.EdidError):
+        edid.decode_edid(data)
+
+
+def test_read_connector(tmp_path):
+    (tmp_path / "status").write_text("connected\n")
+    (tmp_path / "edid").write_bytes(make_edid("Model", "Serial"))
+    assert edid.read_connector(str(tmp_path)).model == "Model"
+
+    (tmp_path / "status").write_text("disconnected\n")
+    assert edid.read_connector(str(tmp_path)) is None
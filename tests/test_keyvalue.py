@@ -0,0 +1,79 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+import os
+
+import pytest
+
+from infocenter import keyvalue
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    yield
+    keyvalue.clear_caches()
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("plain", "plain"),
+        ('"Fedora Linux 41"', "Fedora Linux 41"),
+        ("'single $quoted'", "single $quoted"),
+        (r'"a \"b\" \$c \x"', r'a "b" $c \x'),
+        (r"un\ quoted", "un quoted"),
+        ("\"a\"b'c'", "abc"),
+    ],
+)
+def test_unquote(value, expected):
+    assert keyvalue.unquote(value) == expected
+
+
+def test_parse():
+    text = (
+        "# comment\n"
+        "NAME=Fedora\n"
+        '  PRETTY_NAME = "Fedora Linux"  \n'
+        "URL=https://example.com/?a=b\n"
+        "no assignment\n"
+        "=value\n"
+    )
+
+    assert keyvalue.parse(text) == {
+        "NAME": "Fedora",
+        "PRETTY_NAME": "Fedora Linux",
+        "URL": "https://example.com/?a=b",
+    }
+
+
+def test_read_env_file_rereads_changed_files(tmp_path):
+    path = tmp_path / "machine-info"
+    path.write_text("PRETTY_HOSTNAME=one\n")
+    assert keyvalue.read_env_file(str(path))["PRETTY_HOSTNAME"] == "one"
+
+    path.write_text("PRETTY_HOSTNAME=two\n")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    values = keyvalue.read_env_file(str(path))
+
+    assert values["PRETTY_HOSTNAME"] == "two"
+    with pytest.raises(TypeError):
+        values["PRETTY_HOSTNAME"] = "three"
+
+
+def test_read_env_file_missing(tmp_path):
+    assert dict(keyvalue.read_env_file(str(tmp_path / "missing"))) == {}
+
+
+def test_read_attributes_isolates_errors(tmp_path):
+    (tmp_path / "product_name").write_text("Workstation\n")
+    (tmp_path / "bios_version").mkdir()
+
+    attributes = keyvalue.read_attributes(
+        str(tmp_path), ("product_name", "bios_version", "missing")
+    )
+
+    assert attributes == {
+        "product_name": "Workstation",
+        "bios_version": None,
+        "missing": None,
+    }
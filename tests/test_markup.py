@@ -0,0 +1,48 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+import pytest
+
+from infocenter import markup
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("a < b & 'c'", "a &lt; b &amp; &#39;c&#39;"),
+        ("**bold** text", "<b>bold</b> text"),
+        ("**open", "<b>open</b>"),
+        ("**a\n\nb**", "<b>a</b>\n\nb"),
+        ("a **** b", "a  b"),
+        (
+            "see https://example.com.",
+            'see <a href="https://example.com">https://example.com</a>.',
+        ),
+        (
+            "(see www.example.com/a_(b))",
+            '(see <a href="https://www.example.com/a_(b)">www.example.com/a_(b)</a>)',
+        ),
+        (
+            "**see https://x.com**",
+            '<b>see <a href="https://x.com">https://x.com</a></b>',
+        ),
+        (
+            "https://x.com/?a=1&b=2",
+            '<a href="https://x.com/?a=1&amp;b=2">https://x.com/?a=1&amp;b=2</a>',
+        ),
+    ],
+)
+def test_render_inline(text, expected):
+    assert markup.render(text) == expected
+
+
+def test_render_paragraphs_and_lists():
+    text = "First line\ncontinued.\n\n- one\n  wrapped\n* two\n\n1. first\n2) second\n"
+
+    assert markup.render(text) == (
+        "First line continued.\n\n  • one wrapped\n  • two\n\n  1. first\n  2. second"
+    )
+
+
+def test_render_keeps_years_in_paragraphs():
+    assert markup.render("2024. The year") == "2024. The year"
+    assert markup.render("10. tenth") == "  10. tenth"
@@ -0,0 +1,69 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+import struct
+
+import pytest
+
+pytest.importorskip("gi")
+
+from infocenter import netlink  # noqa E402
+
+
+def _message(msg_type, payload=b""):
+    length = 16 + len(payload)
+    padding = b"\0" * ((4 - length % 4) % 4)
+    return struct.pack("=IHHII", length, msg_type, 0, 1, 0) + payload + padding
+
+
+def _link(msg_type, index, name=None, attributes=b""):
+    payload = struct.pack("=BxHiII", 0, 1, index, 0, 0) + attributes
+    if name is not None:
+        value = name.encode() + b"\0"
+        attribute = struct.pack("=HH", 4 + len(value), netlink.IFLA_IFNAME) + value
+        payload += attribute + b"\0" * ((4 - len(attribute) % 4) % 4)
+    return _message(msg_type, payload)
+
+
+def test_parse_link_messages():
+    # An attribute before the name, e.g. IFLA_MTU
+    mtu = struct.pack("=HHI", 8, 4, 1500)
+    data = (
+        _link(netlink.RTM_NEWLINK, 1, "lo")
+        + _link(netlink.RTM_NEWLINK, 7, "tun0", attributes=mtu)
+        + _message(99)
+        + _link(netlink.RTM_DELLINK, 7)
+        + _message(netlink.NLMSG_DONE, struct.pack("=i", 0))
+    )
+
+    assert list(netlink.parse_link_messages(data)) == [
+        (netlink.RTM_NEWLINK, 1, "lo"),
+        (netlink.RTM_NEWLINK, 7, "tun0"),
+        (netlink.RTM_DELLINK, 7, None),
+        (netlink.NLMSG_DONE, 0, None),
+    ]
+
+
+def test_parse_link_messages_stops_at_truncation():
+    data = _link(netlink.RTM_NEWLINK, 1, "lo") + _link(netlink.RTM_NEWLINK, 2, "eth0")
+
+    messages = list(netlink.parse_link_messages(data[:-8]))
+
+    assert messages == [(netlink.RTM_NEWLINK, 1, "lo")]
+
+
+def test_parse_uevent():
+    data = (
+        b"change@/devices/pci0000:00/0000:00:02.0/drm/card1\0"
+        b"ACTION=change\0DEVPATH=/devices/pci0000:00/0000:00:02.0/drm/card1\0"
+        b"SUBSYSTEM=drm\0HOTPLUG=1\0SEQNUM=4711\0"
+    )
+
+    properties = netlink.parse_uevent(data)
+
+    assert properties["SUBSYSTEM"] == "drm"
+    assert properties["HOTPLUG"] == "1"
+    assert len(properties) == 5
+
+
+def test_parse_uevent_ignores_udev_messages():
+    assert netlink.parse_uevent(b"libudev\0\xfe\xed\xca\xfe") is None
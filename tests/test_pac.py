@@ -0,0 +1,119 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+import socket
+import threading
+import time
+
+import pytest
+
+from infocenter import pac
+
+PAC_BODY = b'function FindProxyForURL(url, host) { return "DIRECT"; }'
+
+
+class Server:
+    """
+    Answers each request with the next of responses. None keeps the
+    connection silent, b"" closes it.
+    """
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = []
+        self._socket = socket.create_server(("127.0.0.1", 0))
+        self.port = self._socket.getsockname()[1]
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def _serve(self):
+        while True:
+            try:
+                connection, _address = self._socket.accept()
+            except OSError:
+                return
+            threading.Thread(
+                target=self._handle, args=(connection,), daemon=True
+            ).start()
+
+    def _handle(self, connection):
+        with connection:
+            while self.responses:
+                request = connection.recv(4096)
+                if not request:
+                    return
+                self.requests.append(request)
+                response = self.responses.pop(0)
+                if response is None:
+                    time.sleep(5)
+                if not response:
+                    return
+                connection.sendall(response)
+
+    def close(self):
+        self._socket.close()
+
+
+def _response(status, body=b"", headers=()):
+    lines = ["HTTP/1.1 {0}".format(status), "Content-Length: {0}".format(len(body))]
+    lines += list(headers)
+    return ("\r\n".join(lines) + "\r\n\r\n").encode() + body
+
+
+@pytest.fixture(autouse=True)
+def cache_home(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+
+
+def test_check_syntax():
+    assert pac.check_syntax(PAC_BODY) is None
+    assert pac.check_syntax(b"// function FindProxyForURL(url, host) {}")
+    assert pac.check_syntax(b"function FindProxyForURL(url, host) {")
+
+
+def test_fetch_revalidates_over_the_same_connection():
+    server = Server(
+        [
+            _response("200 OK", PAC_BODY, ['ETag: "1"']),
+            _response("304 Not Modified", headers=['ETag: "1"']),
+        ]
+    )
+    fetcher = pac.PacFetcher("127.0.0.1", server.port, "/localproxy")
+    try:
+        first = fetcher.fetch(1.0)
+        second = fetcher.fetch(1.0)
+    finally:
+        server.close()
+
+    assert first.ok and first.size == len(PAC_BODY) and not first.changed
+    assert second.ok and second.not_modified and second.reused_connection
+    assert second.changed_at == first.changed_at
+    assert b'If-None-Match: "1"' in server.requests[1]
+
+
+def test_fetch_keeps_one_deadline():
+    server = Server([None])
+    fetcher = pac.PacFetcher("127.0.0.1", server.port, "/localproxy")
+    start = time.monotonic()
+    try:
+        result = fetcher.fetch(0.3)
+    finally:
+        server.close()
+
+    assert not result.ok
+    assert result.error
+    assert time.monotonic() - start < 1.0
+
+
+def test_fetch_retry_shares_the_deadline():
+    # The kept connection is closed, the new one does not answer
+    server = Server([_response("200 OK", PAC_BODY), b"", None])
+    fetcher = pac.PacFetcher("127.0.0.1", server.port, "/localproxy")
+    try:
+        assert fetcher.fetch(1.0).ok
+        start = time.monotonic()
+        result = fetcher.fetch(0.5)
+    finally:
+        server.close()
+
+    assert not result.ok
+    assert len(server.requests) == 3
+    assert time.monotonic() - start < 0.8
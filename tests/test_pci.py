@@ -0,0 +1,106 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+import pytest
+
+from benchmarks import fixtures
+from infocenter import pci, sysroot
+
+PCI_IDS = """\
+# pci.ids
+#
+0e11  Compaq Computer Corporation
+\t0001  PCI to EISA Bridge
+1002  Advanced Micro Devices, Inc. [AMD/ATI]
+\t73ff  Navi 23 [Radeon RX 6600/6600 XT/6600M]
+\t\t1002 0e36  Radeon RX 6600
+10de  NVIDIA Corporation
+\t2684  AD102 [GeForce RTX 4090]
+
+# List of known device classes
+C 03  Display controller
+\t00  VGA compatible controller
+"""
+
+
+@pytest.fixture
+def pci_ids(tmp_path):
+    def load(text):
+        path = tmp_path / "pci.ids"
+        path.write_text(text)
+        pci_ids = pci.PciIds(str(path))
+        loaded.append(pci_ids)
+        return pci_ids
+
+    loaded = []
+    yield load
+    for pci_ids in loaded:
+        pci_ids.close()
+
+
+def test_lookup(pci_ids):
+    ids = pci_ids(PCI_IDS)
+
+    assert ids.lookup(0x1002, 0x73FF) == (
+        "Advanced Micro Devices, Inc. [AMD/ATI]",
+        "Navi 23 [Radeon RX 6600/6600 XT/6600M]",
+    )
+    assert ids.lookup(0x10DE) == ("NVIDIA Corporation", None)
+    assert ids.lookup(0x10DE, 0x0001) == ("NVIDIA Corporation", None)
+    assert ids.lookup(0x1234, 0x0001) == (None, None)
+
+
+def test_lookup_stays_within_the_vendor(pci_ids):
+    ids = pci_ids(PCI_IDS)
+
+    # 0001 only exists below the previous vendor
+    assert ids.lookup(0x1002, 0x0001)[1] is None
+    # The class list is not a vendor
+    assert ids.lookup(0x0003) == (None, None)
+
+
+def test_lookup_unsorted_file(pci_ids):
+    ids = pci_ids(
+        "# pci.ids\n"
+        "10de  NVIDIA Corporation\n"
+        "\t2684  AD102\n"
+        "0e11  Compaq Computer Corporation\n"
+        "\t0001  PCI to EISA Bridge\n"
+    )
+
+    assert ids.lookup(0x10DE, 0x2684) == ("NVIDIA Corporation", "AD102")
+    assert ids.lookup(0x0E11, 0x0001) == (
+        "Compaq Computer Corporation",
+        "PCI to EISA Bridge",
+    )
+
+
+@pytest.fixture
+def root(tmp_path):
+    fixtures.write_pci(tmp_path)
+    sysroot.set_root(str(tmp_path))
+    pci.clear_caches()
+    yield tmp_path
+    pci.clear_caches()
+    sysroot.set_root("/")
+
+
+def test_iter_display_devices(root):
+    devices = {device.slot: device for device in pci.iter_display_devices()}
+
+    assert sorted(devices) == [
+        "0000:00:02.0",
+        "0000:01:00.0",
+        "0000:03:00.0",
+        "0000:04:00.0",
+    ]
+
+    amd = devices["0000:03:00.0"]
+    assert amd.name == "AMD/ATI Navi 23 [Radeon RX 6600/6600 XT/6600M]"
+    assert (amd.driver, amd.vram) == ("amdgpu", 8 << 30)
+
+    # Only the driver knows the VRAM, not the size of a (resizable) BAR
+    assert devices["0000:00:02.0"].vram is None
+    assert devices["0000:01:00.0"].vram is None
+
+    unknown = devices["0000:04:00.0"]
+    assert (unknown.name, unknown.driver) == ("1234 1111", None)
@@ -0,0 +1,46 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+import pytest
+
+from infocenter import resolver, sysroot
+
+ROUTE = (
+    "Iface\tDestination\tGateway \tFlags\tRefCnt\tUse\tMetric\tMask\t\t"
+    "MTU\tWindow\tIRTT\n"
+    "eth0\t00000000\t0100A8C0\t0003\t0\t{0}\t100\t00000000\t0\t0\t0\n"
+)
+IPV6_ROUTE = (
+    "fe800000000000000000000000000000 40 00000000000000000000000000000000 00 "
+    "00000000000000000000000000000000 00000100 {0:08x} {0:08x} 00000001 eth0\n"
+)
+
+
+@pytest.fixture
+def root(tmp_path):
+    (tmp_path / "proc" / "net").mkdir(parents=True)
+    sysroot.set_root(str(tmp_path))
+    yield tmp_path
+    sysroot.set_root("/")
+
+
+def _write_routes(root, gateway="0100A8C0", use=0):
+    route = ROUTE.format(use).replace("0100A8C0", gateway)
+    (root / "proc" / "net" / "route").write_text(route)
+    (root / "proc" / "net" / "ipv6_route").write_text(IPV6_ROUTE.format(use))
+
+
+def test_network_key_ignores_route_counters(root):
+    _write_routes(root, use=1)
+    key = resolver.get_network_key("host")
+
+    _write_routes(root, use=4711)
+    assert resolver.get_network_key("host") == key
+
+
+def test_network_key_changes_with_routes(root):
+    _write_routes(root)
+    key = resolver.get_network_key("host")
+
+    _write_routes(root, gateway="0200A8C0")
+    assert resolver.get_network_key("host") != key
+    assert resolver.get_network_key("other") != key
@@ -0,0 +1,21 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+import pytest
+
+from infocenter import cpuinfo
+from infocenter import system_information_provider as provider
+
+
+@pytest.mark.parametrize(
+    "topology, expected",
+    [
+        ((1, 1, 1, ()), "1 socket, 1 core, 1 thread"),
+        ((2, 16, 32, ("A",)), "2 sockets, 16 cores, 32 threads"),
+        ((1, 6, 8, ("P", "E")), "1 socket, 6 cores, 8 threads (P + E)"),
+        ((1, 0, 0, ()), "Unknown"),
+    ],
+)
+def test_cpu_topology(monkeypatch, topology, expected):
+    monkeypatch.setattr(cpuinfo, "get_topology", lambda: cpuinfo.CpuTopology(*topology))
+
+    assert provider.get_cpu_topology() == expected
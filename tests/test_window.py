@@ -0,0 +1,42 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+
+pytest.importorskip("gi")
+window = pytest.importorskip("infocenter.window")
+
+
+def _checks_page():
+    return SimpleNamespace(
+        _unit_checks={"zsaservice": "zscaler_service"},
+        _unit_states={},
+        _check_scheduler=mock.Mock(),
+        _network_scheduler=mock.Mock(),
+    )
+
+
+def test_unit_becoming_active_reruns_network_checks():
+    page = _checks_page()
+
+    window.Window.on_unit_state_changed(page, "zsaservice", "inactive")
+    page._network_scheduler.trigger.assert_not_called()
+
+    window.Window.on_unit_state_changed(page, "zsaservice", "active")
+    page._network_scheduler.trigger.assert_called_once_with()
+    page._check_scheduler.report.assert_called_with("zscaler_service", True)
+
+    # Still active, e.g. a signal for another property change
+    window.Window.on_unit_state_changed(page, "zsaservice", "active")
+    page._network_scheduler.trigger.assert_called_once_with()
+
+
+def test_initial_unit_state_does_not_rerun_network_checks():
+    page = _checks_page()
+
+    # The network checks already run after the page was built
+    window.Window.on_unit_state_changed(page, "zsaservice", "active")
+
+    page._network_scheduler.trigger.assert_not_called()
@@ -0,0 +1,51 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+import time
+from functools import partial
+
+import pytest
+
+GLib = pytest.importorskip("gi.repository.GLib")
+
+from infocenter.worker import run_async, stream_async  # noqa E402
+
+
+def _run_loop(results, timeout=5.0):
+    context = GLib.MainContext.default()
+    deadline = time.monotonic() + timeout
+    while not results and time.monotonic() < deadline:
+        context.iteration(False)
+        time.sleep(0.01)
+
+
+def test_run_async_partial_past_deadline():
+    results = []
+    run_async(
+        partial(time.sleep, 1),
+        lambda result, error: results.append((result, error)),
+        timeout=0.1,
+    )
+    _run_loop(results)
+
+    result, error = results[0]
+    assert result is None
+    assert isinstance(error, TimeoutError)
+
+
+def test_stream_async_partial_past_deadline():
+    def produce(delay):
+        time.sleep(delay)
+        yield 1
+
+    items = []
+    errors = []
+    stream_async(
+        partial(produce, 1),
+        items.append,
+        done_callback=errors.append,
+        timeout=0.1,
+    )
+    _run_loop(errors)
+
+    assert items == []
+    assert isinstance(errors[0], TimeoutError)